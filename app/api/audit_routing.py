@@ -0,0 +1,174 @@
+"""
+Routage des lectures de logs d'audit vers les partitions concernées.
+
+La table chaude est toujours lue ; le catalogue ne donne que les partitions
+dont le mois recoupe `created_after` / `created_before`. Chaque partition
+reçoit ses filtres, son keyset et sa limite, puis un UNION ALL fusionne les
+branches (chacune servie par son index created_at, id). Les archives froides
+ne sont lues que sur demande (`include_archived`) et fusionnées en Python.
+
+Chaque lecture se fait en deux temps : la base (`list_in_db`, `get_in_db`),
+puis les archives (`merge_archives`, `get_archived`), sans session : la pile
+async exécute la seconde étape dans le threadpool (décompression, moteur
+sqlite synchrone), hors de la boucle d'événements.
+"""
+
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import Row, Select, Table, select, union_all
+from sqlalchemy.orm import Session
+
+from app.api.filters import AuditLogFilters
+from app.api.pagination import PageParams, apply_keyset, page_of
+from app.db.audit_partitions import open_archive, partition_table
+from app.db.models import AuditLog, AuditLogPartition
+from app.schemas.audit_log import AuditLogRead
+
+# colonnes dans l'ordre des champs du schéma (sérialisation directe des tuples)
+FIELDS = list(AuditLogRead.model_fields)
+
+# clé keyset : toujours sélectionnée, même hors de `?fields=`
+KEY_FIELDS = ["created_at", "id"]
+
+# partition archivée : (nom, chemin de l'archive compressée)
+Archive = tuple[str, str]
+
+
+def _partitions(db: Session, filters: AuditLogFilters) -> list[AuditLogPartition]:
+    stmt = select(AuditLogPartition)
+    if filters.created_after is not None:
+        stmt = stmt.where(AuditLogPartition.period_end > filters.created_after)
+    if filters.created_before is not None:
+        stmt = stmt.where(AuditLogPartition.period_start < filters.created_before)
+    return list(db.scalars(stmt))
+
+
+def _columns(table: Table, fields: Sequence[str] = FIELDS) -> list:
+    return [table.c[f] for f in fields]
+
+
+def _with_keys(fields: Sequence[str]) -> list[str]:
+    return [*fields, *(k for k in KEY_FIELDS if k not in fields)]
+
+
+def _page_stmt(
+    table: Table, filters: AuditLogFilters, page: PageParams, fields: Sequence[str] = FIELDS
+) -> Select:
+    stmt = select(*_columns(table, fields)).where(*filters.clauses(table))
+    return apply_keyset(stmt, page, (table.c.created_at, table.c.id), descending=True)
+
+
+def list_in_db(
+    db: Session,
+    filters: AuditLogFilters,
+    page: PageParams,
+    include_archived: bool = False,
+    fields: Sequence[str] = FIELDS,
+) -> tuple[list[Row], list[Archive]]:
+    """Page lue en base (table chaude + partitions), et les archives à fusionner."""
+    fields = _with_keys(fields)
+    partitions = _partitions(db, filters)
+    tables = [AuditLog.__table__] + [
+        partition_table(p.name) for p in partitions if p.archive_path is None
+    ]
+    if len(tables) == 1:
+        stmt = _page_stmt(tables[0], filters, page, fields)
+    else:
+        merged = union_all(
+            *(select(_page_stmt(t, filters, page, fields).subquery()) for t in tables)
+        ).subquery()
+        stmt = (
+            select(merged)
+            .order_by(merged.c.created_at.desc(), merged.c.id.desc())
+            .limit(page.limit + 1)
+        )
+    rows: list[Row] = list(db.execute(stmt))
+    archives = [
+        (p.name, p.archive_path)
+        for p in partitions
+        if include_archived and p.archive_path is not None
+    ]
+    return rows, archives
+
+
+def merge_archives(
+    rows: list[Row],
+    archives: list[Archive],
+    filters: AuditLogFilters,
+    page: PageParams,
+    fields: Sequence[str] = FIELDS,
+) -> dict[str, Any]:
+    fields = _with_keys(fields)
+    for name, archive_path in archives:
+        with open_archive(archive_path).connect() as conn:
+            rows += conn.execute(_page_stmt(partition_table(name), filters, page, fields))
+    if archives:
+        rows = sorted(rows, key=lambda r: (r.created_at, r.id), reverse=True)[: page.limit + 1]
+    return page_of(rows, page, AuditLogFilters.keys)
+
+
+def list_routed(
+    db: Session,
+    filters: AuditLogFilters,
+    page: PageParams,
+    include_archived: bool = False,
+    fields: Sequence[str] = FIELDS,
+) -> dict[str, Any]:
+    rows, archives = list_in_db(db, filters, page, include_archived, fields)
+    return merge_archives(rows, archives, filters, page, fields)
+
+
+def get_in_db(
+    db: Session, audit_log_id: int, fields: Sequence[str] = FIELDS
+) -> tuple[Row | None, list[Archive]]:
+    """Ligne lue en base ; à défaut, les archives dont la plage d'ids la contient."""
+    hot = AuditLog.__table__
+    row = db.execute(select(*_columns(hot, fields)).where(hot.c.id == audit_log_id)).first()
+    if row is not None:
+        return row, []
+    candidates = db.scalars(
+        select(AuditLogPartition).where(
+            AuditLogPartition.min_id <= audit_log_id, AuditLogPartition.max_id >= audit_log_id
+        )
+    )
+    archives = []
+    for partition in candidates:
+        if partition.archive_path is not None:
+            archives.append((partition.name, partition.archive_path))
+            continue
+        table = partition_table(partition.name)
+        row = db.execute(select(*_columns(table, fields)).where(table.c.id == audit_log_id)).first()
+        if row is not None:
+            return row, []
+    return None, archives
+
+
+def get_archived(
+    archives: list[Archive], audit_log_id: int, fields: Sequence[str] = FIELDS
+) -> Row | None:
+    for name, archive_path in archives:
+        table = partition_table(name)
+        stmt = select(*_columns(table, fields)).where(table.c.id == audit_log_id)
+        with open_archive(archive_path).connect() as conn:
+            row = conn.execute(stmt).first()
+        if row is not None:
+            return row
+    return None
+
+
+def get_routed(db: Session, audit_log_id: int, fields: Sequence[str] = FIELDS) -> Row | None:
+    row, archives = get_in_db(db, audit_log_id, fields)
+    return row if row is not None else get_archived(archives, audit_log_id, fields)
+
+
+def export_stmt(db: Session, filters: AuditLogFilters, fields: list[str] = FIELDS) -> Select:
+    """Table chaude + partitions en base (pas les archives), du plus récent au plus ancien."""
+    tables = [AuditLog.__table__] + [
+        partition_table(p.name) for p in _partitions(db, filters) if p.archive_path is None
+    ]
+    branches = [select(*_columns(t, fields)).where(*filters.clauses(t)) for t in tables]
+    merged = union_all(*branches).subquery()
+    return select(*(merged.c[f] for f in fields)).order_by(
+        merged.c.created_at.desc(), merged.c.id.desc()
+    )
@@ -1,53 +1,132 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 from typing import Annotated
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.api.principal import Principal, load_principal, load_principal_async
+from app.core.config import settings
 from app.core.security import decode_token
+from app.db.audit_buffer import AuditLogBuffer, audit_buffer
+from app.db.audit_trail import set_actor
+from app.db.change_feed import ChangeFeed, change_feed
 from app.db.enums import UserRole
-from app.db.models import User
-from app.db.session import SessionLocal
+from app.db.session import (
+    AsyncReadSessionLocal,
+    AsyncSessionLocal,
+    ReadSessionLocal,
+    SessionLocal,
+)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
-def get_db() -> Generator[Session, None, None]:
-    db = SessionLocal()
+# méthodes sans effet de bord : servies par le moteur en lecture seule
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def db_route(request: Request) -> str:
+    """Moteur de la requête (read / write), exposé dans l'en-tête X-DB-Route."""
+    route = "read" if settings.DB_READ_ROUTING and request.method in READ_METHODS else "write"
+    request.state.db_route = route
+    return route
+
+
+def get_read_db(request: Request) -> Generator[Session, None, None]:
+    """Session sur le moteur `query_only` (pool séparé), quelle que soit la méthode."""
+    request.state.db_route = "read"
+    db = ReadSessionLocal()
     try:
         yield db
     finally:
         db.close()
 
 
-def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)], db: Session = Depends(get_db)
-) -> User:
-    creds_exc = HTTPException(
+def get_db(request: Request) -> Generator[Session, None, None]:
+    """Session d'écriture ; les GET sont routés automatiquement vers le moteur de lecture."""
+    db = (ReadSessionLocal if db_route(request) == "read" else SessionLocal)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    factory = AsyncReadSessionLocal if db_route(request) == "read" else AsyncSessionLocal
+    async with factory() as db:
+        yield db
+
+
+def get_audit_buffer() -> AuditLogBuffer | None:
+    """File d'ingestion des logs d'audit, ou None si le mode différé est désactivé."""
+    return audit_buffer if settings.AUDIT_BUFFER_ENABLED else None
+
+
+def get_change_feed() -> ChangeFeed:
+    """Diffusion des changements du worker (GET /api/v1/changes/stream)."""
+    return change_feed
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Invalid credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _token_subject(token: str) -> str:
     try:
         payload = decode_token(token)
         sub: str | None = payload.get("sub")
         if not sub:
-            raise creds_exc
+            raise _credentials_exception()
     except Exception as err:
-        raise creds_exc from err
-    user = db.query(User).filter(User.email == sub).first()
-    if not user or not user.is_active:
-        raise creds_exc
+        raise _credentials_exception() from err
+    return sub
+
+
+def get_current_user(
+    token: Annotated[str, Depends(oauth2_scheme)], db: Session = Depends(get_db)
+) -> Principal:
+    principal = load_principal(db, _token_subject(token))
+    if not principal or not principal.is_active:
+        raise _credentials_exception()
+    set_actor(db, principal.id)
+    return principal
+
+
+async def get_current_user_async(
+    token: Annotated[str, Depends(oauth2_scheme)], db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    principal = await load_principal_async(db, _token_subject(token))
+    if not principal or not principal.is_active:
+        raise _credentials_exception()
+    set_actor(db.sync_session, principal.id)
+    return principal
+
+
+def _check_role(user: Principal, allowed: set[UserRole]) -> Principal:
+    if user.role not in allowed:
+        raise HTTPException(status_code=403, detail="Forbidden")
     return user
 
 
 def require_roles(*roles: UserRole):
     allowed = set(roles)
 
-    def dep(user: Annotated[User, Depends(get_current_user)]) -> User:
-        if user.role not in allowed:
-            raise HTTPException(status_code=403, detail="Forbidden")
-        return user
+    def dep(user: Annotated[Principal, Depends(get_current_user)]) -> Principal:
+        return _check_role(user, allowed)
+
+    return dep
+
+
+def require_roles_async(*roles: UserRole):
+    allowed = set(roles)
+
+    async def dep(user: Annotated[Principal, Depends(get_current_user_async)]) -> Principal:
+        return _check_role(user, allowed)
 
     return dep
@@ -0,0 +1,69 @@
+"""
+ETag fort et GET conditionnel (`If-None-Match` -> 304).
+
+La version d'une ressource est son couple (id, updated_at) ; celle d'une page
+de liste, la suite de ces couples. Quand le client envoie `If-None-Match`, le
+handler ne lit d'abord que ces colonnes (recherche par clé primaire ou
+index) : si rien n'a changé, la réponse 304 part sans hydrater ni sérialiser.
+
+Avec `?include=`, la réponse dépend aussi des objets liés (dont la version
+n'est pas suivie) : l'ETag est alors l'empreinte du corps et la 304 ne fait
+économiser que le transfert.
+"""
+
+from collections.abc import Iterable
+from datetime import datetime
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response
+
+NOT_MODIFIED = {304: {"description": "Not modified (If-None-Match)"}}
+
+
+def make_etag(kind: str, versions: Iterable[tuple[int, datetime]]) -> str:
+    digest = hashlib.blake2b(kind.encode(), digest_size=16)
+    for id_, updated_at in versions:
+        digest.update(f"|{id_}:{updated_at.isoformat()}".encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def rows_etag(kind: str, rows: Iterable[Any]) -> str:
+    return make_etag(kind, ((row.id, row.updated_at) for row in rows))
+
+
+def is_conditional(request: Request) -> bool:
+    return "if-none-match" in request.headers
+
+
+def matches(request: Request, etag: str, exists: bool = True) -> bool:
+    """Comparaison faible (RFC 9110) : `W/` ignoré, `*` accepte toute ressource existante."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in tags or ("*" in tags and exists)
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+def unchanged(request: Request, kind: str, versions: Iterable[Any]) -> Response | None:
+    """304 si les versions lues correspondent à l'ETag du client, sinon None."""
+    versions = list(versions)
+    etag = rows_etag(kind, versions)
+    return not_modified(etag) if matches(request, etag, exists=bool(versions)) else None
+
+
+def body_etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def tagged(request: Request, response: Response, etag: str | None = None) -> Response:
+    """Pose l'ETag (par défaut l'empreinte du corps) ; 304 si le client l'a déjà."""
+    etag = etag or body_etag(response.body)
+    if matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    return response
@@ -0,0 +1,69 @@
+"""
+Chemin de lecture rapide des listes : tuples Core -> octets JSON.
+
+Le chemin standard hydrate des objets ORM (identity map), les recopie en
+modèles Pydantic (`from_attributes`) puis encode le tout. Ici la requête ne
+sélectionne que les colonnes du schéma de lecture, dans l'ordre de ses
+champs ; chaque ligne devient un dict par `zip` avec les noms de champs
+(calculés une fois par schéma) et orjson encode la page d'un coup. Le JSON
+produit est celui de `Page[schema]` (mêmes clés, enums en valeur, datetimes
+ISO 8601). Avec `?fields=`, seuls les champs demandés sont écrits ; avec
+`?include=`, les objets liés sont ajoutés à chaque ligne.
+"""
+
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from fastapi import Response
+import orjson
+from pydantic import BaseModel
+
+from app.api.export import columns_for
+
+
+class PageSerializer:
+    def __init__(self, schema: type[BaseModel]):
+        self.schema = schema
+        self.fields = tuple(schema.model_fields)
+
+    def columns(self, model: type) -> list[Any]:
+        """Colonnes à sélectionner ; on peut en ajouter après (ex. updated_at pour l'ETag)."""
+        return columns_for(model, self.schema)
+
+    def dumps(
+        self,
+        items: Sequence[Sequence[Any]],
+        next_cursor: str | None,
+        fields: Sequence[str] | None = None,
+        embedded: Sequence[Mapping[str, Any]] | None = None,
+    ) -> bytes:
+        fields = fields or self.fields
+        # zip s'arrête aux champs du schéma : les colonnes en plus sont ignorées
+        rows = [dict(zip(fields, row, strict=False)) for row in items]
+        if embedded is not None:
+            for row, related in zip(rows, embedded, strict=True):
+                row.update(related)
+        return orjson.dumps({"items": rows, "next_cursor": next_cursor})
+
+    def response(
+        self,
+        page: Mapping[str, Any],
+        headers: Mapping[str, str] | None = None,
+        fields: Sequence[str] | None = None,
+        embedded: Sequence[Mapping[str, Any]] | None = None,
+    ) -> Response:
+        """`page` est le dict de `page_of` ; la réponse contourne `response_model`."""
+        body = self.dumps(**page, fields=fields, embedded=embedded)
+        return Response(body, media_type="application/json", headers=headers)
+
+    def item(
+        self,
+        row: Sequence[Any],
+        headers: Mapping[str, str] | None = None,
+        fields: Sequence[str] | None = None,
+        embedded: Mapping[str, Any] | None = None,
+    ) -> Response:
+        """Une seule ressource (GET /{id}) lue en tuple Core."""
+        item = dict(zip(fields or self.fields, row, strict=False))
+        body = orjson.dumps(item | dict(embedded or {}))
+        return Response(body, media_type="application/json", headers=headers)
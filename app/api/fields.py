@@ -0,0 +1,74 @@
+"""
+Champs partiels (`?fields=id,title,status`) sur les lectures.
+
+La liste demandée est validée contre le schéma de lecture puis poussée dans
+le SELECT : les colonnes non demandées (ex. `description`) ne sont ni lues
+ni sérialisées. Les colonnes nécessaires au curseur et à l'ETag sont ajoutées
+après les champs demandés ; `PageSerializer` les ignore (zip sur les noms).
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+from fastapi import Query
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel
+
+
+class FieldSet:
+    def __init__(self, names: tuple[str, ...], partial: bool = False):
+        self.names = names
+        self.partial = partial
+
+    def columns(self, model: type, *extra: Any) -> list[Any]:
+        """Colonnes demandées (ordre du schéma) puis `extra` absentes de la liste."""
+        columns = [getattr(model, name) for name in self.names]
+        seen = set(self.names)
+        for column in extra:
+            if column.key not in seen:
+                seen.add(column.key)
+                columns.append(column)
+        return columns
+
+    def variant(self, kind: str) -> str:
+        """Type d'ETag : une représentation partielle a son propre ETag."""
+        return f"{kind};fields={','.join(self.names)}" if self.partial else kind
+
+
+def comma_separated(raw: str, allowed: tuple[str, ...], param: str) -> tuple[str, ...]:
+    """`a,b` -> noms connus dans l'ordre de `allowed` ; inconnu ou vide -> 422."""
+    requested = {name.strip() for name in raw.split(",")} - {""}
+    unknown = sorted(requested.difference(allowed))
+    if unknown or not requested:
+        raise RequestValidationError(
+            [
+                {
+                    "type": "value_error",
+                    "loc": ("query", param),
+                    "msg": f"Unknown {param}: {', '.join(unknown)}" if unknown else f"No {param}",
+                    "input": raw,
+                    "ctx": {"allowed": list(allowed)},
+                }
+            ]
+        )
+    return tuple(name for name in allowed if name in requested)
+
+
+def sparse_fields(schema: type[BaseModel]) -> Callable[..., FieldSet]:
+    """Dépendance `?fields=` pour `schema` ; un champ inconnu donne une 422."""
+    allowed = tuple(schema.model_fields)
+    full = FieldSet(allowed)
+
+    def dependency(
+        fields: str | None = Query(
+            None, description=f"Champs à renvoyer, séparés par des virgules : {', '.join(allowed)}"
+        ),
+    ) -> FieldSet:
+        if fields is None:
+            return full
+        requested = comma_separated(fields, allowed, "fields")
+        if len(requested) == len(allowed):
+            return full
+        return FieldSet(requested, partial=True)
+
+    return dependency
@@ -0,0 +1,138 @@
+"""
+Filtres et tris exposés en query params sur les endpoints de liste.
+
+Chaque classe est une dépendance FastAPI (`Depends()`), réutilisable par la
+liste et par l'export d'une même ressource.
+"""
+
+from datetime import datetime
+from typing import Any, Literal
+
+from fastapi import Query
+from sqlalchemy import ColumnElement, FromClause, Select, case
+from sqlalchemy.orm import Query as OrmQuery
+
+from app.db.enums import TicketPriority, TicketStatus
+from app.db.models import AuditLog, Ticket
+
+# les filtres s'appliquent aussi bien à un Query ORM qu'à un select() Core
+Filterable = OrmQuery | Select
+
+# ordre métier des priorités (low < med < high), pas l'ordre alphabétique
+PRIORITY_RANK = {TicketPriority.low: 0, TicketPriority.med: 1, TicketPriority.high: 2}
+priority_rank = case(PRIORITY_RANK, value=Ticket.priority)
+
+TicketSortField = Literal["id", "created_at", "updated_at", "priority"]
+
+
+class TicketFilters:
+    def __init__(
+        self,
+        project_id: int | None = None,
+        assignee_id: int | None = None,
+        status: list[TicketStatus] | None = Query(None),
+        priority: list[TicketPriority] | None = Query(None),
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        updated_after: datetime | None = None,
+        updated_before: datetime | None = None,
+        sort: TicketSortField = "id",
+        order: Literal["asc", "desc"] = "asc",
+    ):
+        self.project_id = project_id
+        self.assignee_id = assignee_id
+        self.status = status
+        self.priority = priority
+        self.created_after = created_after
+        self.created_before = created_before
+        self.updated_after = updated_after
+        self.updated_before = updated_before
+        self.sort = sort
+        self.descending = order == "desc"
+
+    def apply[Q: Filterable](self, query: Q) -> Q:
+        if self.project_id is not None:
+            query = query.filter(Ticket.project_id == self.project_id)
+        if self.assignee_id is not None:
+            query = query.filter(Ticket.assignee_id == self.assignee_id)
+        if self.status:
+            query = query.filter(Ticket.status.in_(self.status))
+        if self.priority:
+            query = query.filter(Ticket.priority.in_(self.priority))
+        if self.created_after is not None:
+            query = query.filter(Ticket.created_at >= self.created_after)
+        if self.created_before is not None:
+            query = query.filter(Ticket.created_at < self.created_before)
+        if self.updated_after is not None:
+            query = query.filter(Ticket.updated_at >= self.updated_after)
+        if self.updated_before is not None:
+            query = query.filter(Ticket.updated_at < self.updated_before)
+        return query
+
+    @property
+    def keys(self) -> tuple[Any, ...]:
+        """Clé de tri keyset ; `id` départage toujours les ex aequo."""
+        if self.sort == "priority":
+            return (priority_rank, Ticket.id)
+        if self.sort == "id":
+            return (Ticket.id,)
+        return (getattr(Ticket, self.sort), Ticket.id)
+
+    @property
+    def key_columns(self) -> tuple[Any, ...]:
+        """Colonnes que `key_of` lit sur une ligne (à sélectionner en plus des champs)."""
+        if self.sort == "priority":
+            return (Ticket.priority, Ticket.id)
+        return self.keys
+
+    def key_of(self, ticket: Ticket) -> tuple[Any, ...]:
+        if self.sort == "priority":
+            return (PRIORITY_RANK[ticket.priority], ticket.id)
+        if self.sort == "id":
+            return (ticket.id,)
+        return (getattr(ticket, self.sort), ticket.id)
+
+
+class AuditLogFilters:
+    def __init__(
+        self,
+        action: str | None = None,
+        table_name: str | None = None,
+        record_id: int | None = None,
+        user_id: int | None = None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+    ):
+        self.action = action
+        self.table_name = table_name
+        self.record_id = record_id
+        self.user_id = user_id
+        self.created_after = created_after
+        self.created_before = created_before
+
+    def clauses(self, table: FromClause = AuditLog.__table__) -> list[ColumnElement[bool]]:
+        """Conditions sur `table` : la table chaude ou n'importe quelle partition."""
+        columns = table.c
+        clauses = []
+        if self.action is not None:
+            clauses.append(columns.action == self.action)
+        if self.table_name is not None:
+            clauses.append(columns.table_name == self.table_name)
+        if self.record_id is not None:
+            clauses.append(columns.record_id == self.record_id)
+        if self.user_id is not None:
+            clauses.append(columns.user_id == self.user_id)
+        if self.created_after is not None:
+            clauses.append(columns.created_at >= self.created_after)
+        if self.created_before is not None:
+            clauses.append(columns.created_at < self.created_before)
+        return clauses
+
+    def apply[Q: Filterable](self, query: Q) -> Q:
+        for clause in self.clauses():
+            query = query.filter(clause)
+        return query
+
+    # les logs se lisent du plus récent au plus ancien
+    keys = (AuditLog.created_at, AuditLog.id)
+    descending = True
@@ -0,0 +1,102 @@
+"""
+Relations embarquées à la demande (`?include=assignee,project`).
+
+Chaque relation demandée coûte une requête de plus pour toute la page, comme
+`selectinload` : les clés sont collectées sur les lignes de la page puis lues
+en un `WHERE id IN (...)`. Les colonnes de jointure viennent des relations
+du modèle (`Ticket.assignee`, `Project.owner`…) et la page reste en tuples
+Core : aucune hydratation ORM, aucune requête par ligne.
+"""
+
+from collections.abc import Callable, Collection, Sequence
+from typing import Any
+
+from fastapi import Query
+from pydantic import BaseModel
+from sqlalchemy import Column, func, select
+from sqlalchemy.orm import InstrumentedAttribute, Session
+
+from app.api.export import columns_for
+from app.api.fields import comma_separated
+
+
+class Related:
+    """Relation many-to-one : l'objet lié, sérialisé selon `schema`."""
+
+    def __init__(self, relationship: InstrumentedAttribute, schema: type[BaseModel]):
+        [(local, remote)] = relationship.property.local_remote_pairs
+        self.column: Column = local
+        self.remote: Column = remote
+        self.target = relationship.property.mapper.class_
+        self.schema = schema
+        self.fields = tuple(schema.model_fields)
+
+    def load(self, db: Session, keys: Collection[Any]) -> dict[Any, Any]:
+        stmt = select(self.remote, *columns_for(self.target, self.schema))
+        rows = db.execute(stmt.where(self.remote.in_(keys)))
+        return {row[0]: dict(zip(self.fields, row[1:], strict=True)) for row in rows}
+
+
+class Count:
+    """Relation one-to-many : seulement le nombre d'objets liés (un GROUP BY)."""
+
+    def __init__(self, relationship: InstrumentedAttribute):
+        [(local, remote)] = relationship.property.local_remote_pairs
+        self.column: Column = local
+        self.remote: Column = remote
+
+    def load(self, db: Session, keys: Collection[Any]) -> dict[Any, Any]:
+        stmt = select(self.remote, func.count()).where(self.remote.in_(keys))
+        counts = dict(db.execute(stmt.group_by(self.remote)).all())
+        return {key: counts.get(key, 0) for key in keys}
+
+
+Include = Related | Count
+
+
+class IncludeSet:
+    def __init__(self, includes: dict[str, Include]):
+        self.includes = includes
+
+    def __bool__(self) -> bool:
+        return bool(self.includes)
+
+    @property
+    def columns(self) -> list[Column]:
+        """Colonnes de jointure à sélectionner avec la page."""
+        return [include.column for include in self.includes.values()]
+
+    def embed(self, db: Session, rows: Sequence[Any]) -> list[dict[str, Any]] | None:
+        """Objets liés de chaque ligne (même ordre que `rows`), une requête par relation."""
+        if not self.includes:
+            return None
+        loaded = {}
+        for name, include in self.includes.items():
+            keys = {getattr(row, include.column.key) for row in rows} - {None}
+            loaded[name] = include.load(db, keys) if keys else {}
+        return [
+            {
+                name: loaded[name].get(getattr(row, include.column.key))
+                for name, include in self.includes.items()
+            }
+            for row in rows
+        ]
+
+
+def includes(**available: Include) -> Callable[..., IncludeSet]:
+    """Dépendance `?include=` ; une relation inconnue donne une 422."""
+    allowed = tuple(available)
+    none = IncludeSet({})
+
+    def dependency(
+        include: str | None = Query(
+            None,
+            description=f"Relations à embarquer, séparées par des virgules : {', '.join(allowed)}",
+        ),
+    ) -> IncludeSet:
+        if include is None:
+            return none
+        names = comma_separated(include, allowed, "include")
+        return IncludeSet({name: available[name] for name in names})
+
+    return dependency
@@ -0,0 +1,58 @@
+"""
+Routeurs chargés au premier appel.
+
+`LazyRouter` tient la place d'un routeur dans `app.routes` : il répond à tout
+chemin sous son préfixe, importe alors le module du routeur, l'inclut dans
+l'application, se retire et relance le routage. Le démarrage n'importe ni
+les routeurs, ni leurs schémas, ni leurs dépendances (JWT, exports…) ; le
+coût est payé une fois par préfixe, par la première requête. `load_routers`
+force le chargement (génération OpenAPI, préchauffage).
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+from fastapi import APIRouter, FastAPI
+from starlette.routing import BaseRoute, Match, NoMatchFound
+from starlette.types import Receive, Scope, Send
+
+
+class LazyRouter(BaseRoute):
+    def __init__(self, app: FastAPI, prefix: str, load: Callable[[], APIRouter], **include: Any):
+        self.app = app
+        self.prefix = prefix
+        self._load = load
+        self.include = include
+        self.loaded = False
+
+    def load(self) -> None:
+        # pas d'await entre le test et l'inclusion : atomique dans la boucle
+        if self.loaded:
+            return
+        self.loaded = True
+        self.app.router.routes.remove(self)
+        self.app.include_router(self._load(), prefix=self.prefix, **self.include)
+
+    def matches(self, scope: Scope) -> tuple[Match, Scope]:
+        if scope["type"] in ("http", "websocket"):
+            path = scope["path"].removeprefix(scope.get("root_path", ""))
+            # `:bulk` et consorts : actions collées au préfixe
+            if path == self.prefix or path.startswith((self.prefix + "/", self.prefix + ":")):
+                return Match.FULL, {}
+        return Match.NONE, {}
+
+    def url_path_for(self, name: str, /, **path_params: Any):
+        self.load()
+        try:
+            return self.app.router.url_path_for(name, **path_params)
+        except NoMatchFound:
+            raise NoMatchFound(name, path_params) from None
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.load()
+        await self.app.router(scope, receive, send)
+
+
+def load_routers(app: FastAPI) -> None:
+    for route in [route for route in app.router.routes if isinstance(route, LazyRouter)]:
+        route.load()
@@ -0,0 +1,174 @@
+"""
+Middlewares ASGI purs (sans BaseHTTPMiddleware : pas de tâche ni de file
+supplémentaires par requête, le streaming des exports reste intact).
+"""
+
+import time
+
+from anyio import CapacityLimiter
+from anyio.to_thread import current_default_thread_limiter
+from fastapi.routing import iter_route_contexts
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import COUNT_BUCKETS, LATENCY_BUCKETS, SIZE_BUCKETS, registry
+from app.db import profiler
+from app.db.metrics import RequestDB, request_db
+
+
+class DBRouteHeader:
+    """Ajoute `X-DB-Route: read|write` : le moteur choisi par `get_db`."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_route(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                route = scope.get("state", {}).get("db_route")
+                if route is not None:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-db-route", route.encode()))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_route)
+
+
+class SQLProfiler:
+    """
+    Profil SQL par requête quand `DB_PROFILE` est actif : `X-DB-Query-Count`,
+    `X-DB-Time` (ms) et `X-DB-N-Plus-One` en en-têtes, journal des requêtes
+    lentes et des N+1 une fois la réponse envoyée (exports en flux compris).
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.DB_PROFILE:
+            await self.app(scope, receive, send)
+            return
+
+        # partagé avec MetricsMiddleware s'il est installé
+        db = request_db.get()
+        token = None
+        if db is None:
+            db = RequestDB()
+            token = request_db.set(db)
+        db.statements = []
+
+        async def send_with_profile(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-query-count", str(db.queries).encode()))
+                headers.append((b"x-db-time", f"{db.seconds * 1000:.3f}".encode()))
+                repeated = profiler.repeated(db, settings.DB_N_PLUS_ONE_THRESHOLD)
+                if repeated:
+                    headers.append((b"x-db-n-plus-one", str(len(repeated)).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            if token is not None:
+                request_db.reset(token)
+            entry = profiler.report(scope["method"], scope["path"], db)
+            if entry is not None:
+                profiler.log(entry)
+
+
+registry.counter("opshub_http_requests_total", "HTTP requests by route and status")
+registry.histogram("opshub_http_request_duration_seconds", "HTTP request latency", LATENCY_BUCKETS)
+registry.histogram("opshub_http_response_size_bytes", "HTTP response body size", SIZE_BUCKETS)
+registry.gauge("opshub_http_requests_in_flight", "HTTP requests being served")
+registry.histogram("opshub_http_db_queries", "SQL statements per HTTP request", COUNT_BUCKETS)
+registry.histogram("opshub_http_db_seconds", "SQL time per HTTP request", LATENCY_BUCKETS)
+registry.counter(
+    "opshub_threadpool_saturated_total", "Requests that arrived with every worker thread busy"
+)
+registry.gauge("opshub_threadpool_busy", "Worker threads in use (sync handlers, dependencies)")
+registry.gauge("opshub_threadpool_size", "Worker thread limit")
+
+# limiteur anyio du threadpool, capturé à la première requête (boucle active)
+_limiter: CapacityLimiter | None = None
+
+
+@registry.collector
+def _threadpool():
+    if _limiter is not None:
+        yield "opshub_threadpool_busy", (), _limiter.borrowed_tokens
+        yield "opshub_threadpool_size", (), _limiter.total_tokens
+
+
+class MetricsMiddleware:
+    """
+    Latence, taille, statut et requêtes SQL par route. Le label `route` est le
+    gabarit (`/api/v1/tickets/{ticket_id}`), jamais le chemin brut : la
+    cardinalité reste bornée ; les chemins inconnus sont regroupés.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._templates: dict[int, str] = {}
+
+    def _route_template(self, scope: Scope) -> str:
+        route = scope.get("route")
+        if route is None:
+            return "unmatched"
+        # `route.path` est relatif au routeur inclus (`/{ticket_id}`) : le
+        # gabarit complet vient des contextes de route de l'application
+        template = self._templates.get(id(route))
+        if template is None:
+            # route inconnue : table (re)construite, routeurs inclus depuis compris
+            self._templates = {
+                id(context.original_route): context.path_format
+                for context in iter_route_contexts(scope["app"].routes)
+            }
+            template = self._templates.get(id(route), route.path)
+        return template
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        global _limiter
+        start = time.perf_counter()
+        if _limiter is None:
+            _limiter = current_default_thread_limiter()
+        if _limiter.borrowed_tokens >= _limiter.total_tokens:
+            registry.inc("opshub_threadpool_saturated_total")
+        db = RequestDB()
+        token = request_db.set(db)
+        registry.inc("opshub_http_requests_in_flight")
+        status = 500
+        size = 0
+
+        async def send_measured(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_measured)
+        finally:
+            request_db.reset(token)
+            registry.inc("opshub_http_requests_in_flight", value=-1)
+            route = self._route_template(scope)
+            labels = (("method", scope["method"]), ("route", route))
+            registry.inc("opshub_http_requests_total", (*labels, ("status", str(status))))
+            registry.observe("opshub_http_response_size_bytes", labels, size)
+            registry.observe("opshub_http_db_queries", labels, db.queries)
+            registry.observe("opshub_http_db_seconds", labels, db.seconds)
+            registry.observe(
+                "opshub_http_request_duration_seconds", labels, time.perf_counter() - start
+            )
@@ -0,0 +1,76 @@
+"""
+Schéma OpenAPI précalculé.
+
+    python -m app.api.openapi openapi.json      # à la construction de l'image
+
+Générer le schéma demande tous les routeurs (donc leur import) et parcourt
+chaque route : ~200 ms au premier GET /openapi.json ou /docs. Avec
+`OPENAPI_FILE`, l'application sert ce fichier tel quel. Le fichier porte
+l'empreinte des sources du paquet `app` (`info.x-source-hash`) ; généré
+depuis d'autres sources (routes ou schémas modifiés depuis), il est ignoré
+et le schéma est régénéré.
+"""
+
+import argparse
+import hashlib
+from pathlib import Path
+from typing import Any
+
+from fastapi import FastAPI
+import orjson
+
+from app.api.lazy import load_routers
+
+HASH_KEY = "x-source-hash"
+
+
+def source_hash() -> str:
+    """Empreinte des modules du paquet `app` (~5 ms, au premier schéma demandé)."""
+    root = Path(__file__).resolve().parents[1]
+    digest = hashlib.sha256()
+    for path in sorted(root.rglob("*.py")):
+        digest.update(path.relative_to(root).as_posix().encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def read_schema(path: str, fingerprint: str) -> dict[str, Any] | None:
+    try:
+        schema = orjson.loads(Path(path).read_bytes())
+    except FileNotFoundError:
+        return None
+    return schema if schema.get("info", {}).get(HASH_KEY) == fingerprint else None
+
+
+def cached_openapi(app: FastAPI, path: str | None) -> None:
+    """Remplace `app.openapi` : fichier précalculé, sinon génération (routeurs chargés)."""
+    generate = app.openapi
+
+    def openapi() -> dict[str, Any]:
+        if app.openapi_schema is None:
+            schema = read_schema(path, source_hash()) if path else None
+            if schema is None:
+                load_routers(app)
+                schema = generate()
+            app.openapi_schema = schema
+        return app.openapi_schema
+
+    app.openapi = openapi
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("output")
+    args = parser.parse_args()
+
+    from app.main import create_app
+
+    app = create_app()
+    load_routers(app)
+    schema = app.openapi()
+    schema["info"][HASH_KEY] = source_hash()
+    Path(args.output).write_bytes(orjson.dumps(schema))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Pagination par curseur (keyset).
+
+Le curseur est opaque pour le client : c'est la clé de tri de la dernière ligne
+renvoyée, encodée en base64. La page suivante filtre sur `clé > curseur` au lieu
+d'un OFFSET, donc une page profonde coûte autant que la première.
+"""
+
+import base64
+from collections.abc import Callable, Sequence
+from datetime import datetime
+import json
+from typing import Any
+
+from fastapi import HTTPException, Query
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import Query as OrmQuery
+from sqlalchemy.sql import ColumnElement
+
+from app.core.config import settings
+
+
+class PageParams:
+    def __init__(
+        self,
+        limit: int | None = Query(None, ge=1, description="Taille de page (plafonnée)"),
+        cursor: str | None = Query(
+            None, description="Curseur opaque renvoyé par la page précédente"
+        ),
+    ):
+        self.limit = min(limit or settings.PAGE_SIZE_DEFAULT, settings.PAGE_SIZE_MAX)
+        self.cursor = cursor
+
+
+def encode_cursor(values: tuple[Any, ...]) -> str:
+    raw = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(raw, separators=(",", ":")).encode()).decode()
+
+
+def decode_cursor(cursor: str, keys: tuple[ColumnElement, ...]) -> tuple[Any, ...]:
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(raw, list) or len(raw) != len(keys):
+            raise ValueError(cursor)
+        values = []
+        for key, value in zip(keys, raw, strict=True):
+            if key.type.python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif not isinstance(value, key.type.python_type):
+                raise ValueError(cursor)
+            values.append(value)
+    except (ValueError, TypeError) as err:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from err
+    return tuple(values)
+
+
+def apply_keyset[Q: (OrmQuery, Select)](
+    query: Q,
+    params: PageParams,
+    keys: tuple[ColumnElement, ...],
+    descending: bool = False,
+) -> Q:
+    """Filtre keyset + ordre + limite (une ligne de plus pour savoir s'il y a une suite)."""
+    if params.cursor:
+        values = decode_cursor(params.cursor, keys)
+        if len(keys) == 1:
+            cond = keys[0] < values[0] if descending else keys[0] > values[0]
+        else:
+            cond = tuple_(*keys) < values if descending else tuple_(*keys) > values
+        query = query.filter(cond)
+
+    query = query.order_by(*(k.desc() if descending else k.asc() for k in keys))
+    return query.limit(params.limit + 1)
+
+
+def page_of(
+    rows: Sequence[Any],
+    params: PageParams,
+    keys: tuple[ColumnElement, ...],
+    key_of: Callable[[Any], tuple[Any, ...]] | None = None,
+) -> dict[str, Any]:
+    """
+    Construit la page et `next_cursor` à partir des lignes de `apply_keyset`.
+
+    `key_of` extrait la clé de tri d'une ligne ; par défaut on lit les attributs
+    du même nom que les colonnes de `keys`.
+    """
+    next_cursor = None
+    if len(rows) > params.limit:
+        rows = rows[: params.limit]
+        last = rows[-1]
+        values = key_of(last) if key_of else tuple(getattr(last, k.key) for k in keys)
+        next_cursor = encode_cursor(values)
+    return {"items": rows, "next_cursor": next_cursor}
+
+
+def paginate(
+    query: OrmQuery,
+    params: PageParams,
+    keys: tuple[ColumnElement, ...],
+    descending: bool = False,
+    key_of: Callable[[Any], tuple[Any, ...]] | None = None,
+) -> dict[str, Any]:
+    """Pagination keyset d'un Query ORM synchrone."""
+    rows = apply_keyset(query, params, keys, descending).all()
+    return page_of(rows, params, keys, key_of)
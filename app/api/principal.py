@@ -0,0 +1,87 @@
+"""
+Principal authentifié mis en cache par sujet du token (l'email).
+
+`get_current_user` ne lit que les colonnes utiles (id, email, rôle, actif) et
+garde le résultat dans un LRU borné à durée de vie limitée. Toute modification
+ORM d'un utilisateur invalide son entrée, à la fois au flush et après le commit
+(pour ne pas laisser un autre thread recharger l'ancienne version entre-temps).
+"""
+
+from dataclasses import dataclass
+
+from sqlalchemy import Row, Select, event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.enums import UserRole
+from app.db.models import User
+
+_PENDING_KEY = "principal_invalidations"
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    id: int
+    email: str
+    role: UserRole
+    is_active: bool
+
+
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE, ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+
+def _principal_stmt(sub: str) -> Select:
+    return select(User.id, User.email, User.role, User.is_active).where(User.email == sub)
+
+
+def _remember(sub: str, row: Row | None) -> Principal | None:
+    if row is None:
+        return None
+    principal = Principal(*row)
+    principal_cache.set(sub, principal)
+    return principal
+
+
+def load_principal(db: Session, sub: str) -> Principal | None:
+    principal = principal_cache.get(sub)
+    if principal is not None:
+        return principal
+    return _remember(sub, db.execute(_principal_stmt(sub)).first())
+
+
+async def load_principal_async(db: AsyncSession, sub: str) -> Principal | None:
+    principal = principal_cache.get(sub)
+    if principal is not None:
+        return principal
+    return _remember(sub, (await db.execute(_principal_stmt(sub))).first())
+
+
+def _emails(target: User) -> set[str]:
+    # l'ancien email aussi, au cas où il vient de changer
+    return {target.email, *(inspect(target).attrs.email.history.deleted or ())}
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_user(mapper, connection, target: User) -> None:
+    emails = _emails(target)
+    for email in emails:
+        principal_cache.invalidate(email)
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).update(emails)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    for email in session.info.pop(_PENDING_KEY, ()):
+        principal_cache.invalidate(email)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending(session: Session, previous_transaction) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,72 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.audit_routing import get_archived, get_in_db, list_in_db, merge_archives
+from app.api.deps import get_async_db, get_audit_buffer
+from app.api.fields import FieldSet
+from app.api.filters import AuditLogFilters
+from app.api.pagination import PageParams
+from app.api.v1.audit_logs import AUDIT_LOG_FIELDS, AUDIT_LOG_PAGE, QUEUED_RESPONSE
+from app.db.audit_buffer import AuditLogBuffer
+from app.db.models import AuditLog
+from app.schemas.audit_log import AuditLogCreate, AuditLogRead
+from app.schemas.pagination import Page
+
+router = APIRouter()
+
+
+@router.post("", response_model=AuditLogRead, status_code=201, responses=QUEUED_RESPONSE)
+async def create_audit_log(
+    payload: AuditLogCreate,
+    db: AsyncSession = Depends(get_async_db),
+    buffer: AuditLogBuffer | None = Depends(get_audit_buffer),
+):
+    if buffer is not None:
+        # put() peut attendre (contre-pression) : hors de la boucle d'événements
+        await run_in_threadpool(lambda: buffer.submit(**payload.model_dump()))
+        return JSONResponse({"status": "queued"}, status_code=202)
+    audit_log = AuditLog(
+        action=payload.action,
+        table_name=payload.table_name,
+        record_id=payload.record_id,
+        user_id=payload.user_id,
+        payload=payload.payload,
+    )
+    db.add(audit_log)
+    await db.commit()
+    await db.refresh(audit_log)
+    return audit_log
+
+
+@router.get("", response_model=Page[AuditLogRead])
+async def list_audit_logs(
+    filters: AuditLogFilters = Depends(),
+    page: PageParams = Depends(),
+    include_archived: bool = False,
+    fields: FieldSet = Depends(AUDIT_LOG_FIELDS),
+    db: AsyncSession = Depends(get_async_db),
+):
+    rows, archives = await db.run_sync(list_in_db, filters, page, include_archived, fields.names)
+    # archives : décompression et moteur sqlite synchrone, hors de la boucle
+    content = (
+        await run_in_threadpool(merge_archives, rows, archives, filters, page, fields.names)
+        if archives
+        else merge_archives(rows, archives, filters, page, fields.names)
+    )
+    return AUDIT_LOG_PAGE.response(content, fields=fields.names)
+
+
+@router.get("/{audit_log_id}", response_model=AuditLogRead)
+async def get_audit_log(
+    audit_log_id: int,
+    fields: FieldSet = Depends(AUDIT_LOG_FIELDS),
+    db: AsyncSession = Depends(get_async_db),
+):
+    audit_log, archives = await db.run_sync(get_in_db, audit_log_id, fields.names)
+    if audit_log is None and archives:
+        audit_log = await run_in_threadpool(get_archived, archives, audit_log_id, fields.names)
+    if not audit_log:
+        raise HTTPException(status_code=404, detail="Audit log not found")
+    return AUDIT_LOG_PAGE.item(audit_log, fields=fields.names)
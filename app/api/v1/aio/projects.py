@@ -0,0 +1,115 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_async_db, require_roles_async
+from app.api.etag import NOT_MODIFIED, is_conditional, rows_etag, tagged, unchanged
+from app.api.fields import FieldSet
+from app.api.includes import IncludeSet
+from app.api.pagination import PageParams, apply_keyset, page_of
+from app.api.v1.projects import PROJECT_FIELDS, PROJECT_INCLUDES, PROJECT_PAGE
+from app.db.enums import UserRole
+from app.db.models import Project
+from app.schemas.pagination import Page
+from app.schemas.project import ProjectCreate, ProjectExpanded, ProjectRead, ProjectUpdate
+
+router = APIRouter()
+
+
+@router.post("", response_model=ProjectRead, status_code=201)
+async def create_project(
+    payload: ProjectCreate,
+    db: AsyncSession = Depends(get_async_db),
+    _=Depends(require_roles_async(UserRole.manager, UserRole.admin)),
+):
+    proj = Project(
+        name=payload.name,
+        description=payload.description,
+        status=payload.status,
+        owner_id=payload.owner_id,
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
+    )
+    db.add(proj)
+    await db.commit()
+    await db.refresh(proj)
+    return proj
+
+
+@router.get("", response_model=Page[ProjectExpanded], responses=NOT_MODIFIED)
+async def list_projects(
+    request: Request,
+    page: PageParams = Depends(),
+    fields: FieldSet = Depends(PROJECT_FIELDS),
+    include: IncludeSet = Depends(PROJECT_INCLUDES),
+    db: AsyncSession = Depends(get_async_db),
+    _=Depends(require_roles_async(UserRole.manager, UserRole.admin)),
+):
+    keys = (Project.id,)
+    kind = fields.variant("projects")
+    if is_conditional(request) and not include:
+        versions = apply_keyset(select(Project.id, Project.updated_at), page, keys)
+        if hit := unchanged(request, kind, await db.execute(versions)):
+            return hit
+    # id et updated_at en plus des champs demandés : curseur et ETag
+    stmt = select(*fields.columns(Project, Project.id, Project.updated_at, *include.columns))
+    rows = (await db.execute(apply_keyset(stmt, page, keys))).all()
+    content = page_of(rows, page, keys)
+    embedded = await db.run_sync(include.embed, content["items"]) if include else None
+    response = PROJECT_PAGE.response(content, fields=fields.names, embedded=embedded)
+    return tagged(request, response, None if include else rows_etag(kind, rows))
+
+
+@router.get("/{project_id}", response_model=ProjectExpanded, responses=NOT_MODIFIED)
+async def get_project(
+    project_id: int,
+    request: Request,
+    fields: FieldSet = Depends(PROJECT_FIELDS),
+    include: IncludeSet = Depends(PROJECT_INCLUDES),
+    db: AsyncSession = Depends(get_async_db),
+):
+    kind = fields.variant("project")
+    if is_conditional(request) and not include:
+        version = select(Project.id, Project.updated_at).where(Project.id == project_id)
+        if hit := unchanged(request, kind, await db.execute(version)):
+            return hit
+    columns = fields.columns(Project, Project.id, Project.updated_at, *include.columns)
+    row = (await db.execute(select(*columns).where(Project.id == project_id))).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    embedded = await db.run_sync(include.embed, [row]) if include else None
+    response = PROJECT_PAGE.item(row, fields=fields.names, embedded=embedded and embedded[0])
+    return tagged(request, response, None if include else rows_etag(kind, [row]))
+
+
+@router.put("/{project_id}", response_model=ProjectRead)
+async def update_project(
+    project_id: int, payload: ProjectUpdate, db: AsyncSession = Depends(get_async_db)
+):
+    proj = await db.get(Project, project_id)
+    if not proj:
+        raise HTTPException(status_code=404, detail="Project not found")
+    if payload.name is not None:
+        proj.name = payload.name
+    if payload.description is not None:
+        proj.description = payload.description
+    if payload.status is not None:
+        proj.status = payload.status
+    if payload.owner_id is not None:
+        proj.owner_id = payload.owner_id
+    proj.updated_at = datetime.now()
+    await db.commit()
+    await db.refresh(proj)
+    return proj
+
+
+@router.delete("/{project_id}", status_code=204)
+async def delete_project(project_id: int, db: AsyncSession = Depends(get_async_db)):
+    proj = await db.get(Project, project_id)
+    if not proj:
+        raise HTTPException(status_code=404, detail="Project not found")
+    await db.delete(proj)
+    await db.commit()
+    return None
@@ -0,0 +1,144 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_async_db
+from app.api.etag import NOT_MODIFIED, is_conditional, rows_etag, tagged, unchanged
+from app.api.fields import FieldSet
+from app.api.filters import TicketFilters
+from app.api.includes import IncludeSet
+from app.api.pagination import PageParams, apply_keyset, page_of
+from app.api.v1.tickets import (
+    SEARCH_KEYS,
+    TICKET_FIELDS,
+    TICKET_INCLUDES,
+    TICKET_PAGE,
+    TICKET_SEARCH_PAGE,
+    TicketSearch,
+    run_bulk,
+)
+from app.db.models import Ticket
+from app.schemas.pagination import Page
+from app.schemas.ticket import (
+    TicketBulkRequest,
+    TicketBulkResponse,
+    TicketCreate,
+    TicketExpanded,
+    TicketRead,
+    TicketSearchHit,
+    TicketUpdate,
+)
+
+router = APIRouter()
+
+
+@router.post("", response_model=TicketRead, status_code=201)
+async def create_ticket(payload: TicketCreate, db: AsyncSession = Depends(get_async_db)):
+    ticket = Ticket(
+        title=payload.title,
+        description=payload.description,
+        priority=payload.priority,
+        status=payload.status,
+        project_id=payload.project_id,
+        assignee_id=payload.assignee_id,
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
+    )
+    db.add(ticket)
+    await db.commit()
+    await db.refresh(ticket)
+    return ticket
+
+
+@router.post(":bulk", response_model=TicketBulkResponse)
+async def bulk_tickets(payload: TicketBulkRequest, db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(run_bulk, payload)
+
+
+@router.get("", response_model=Page[TicketExpanded], responses=NOT_MODIFIED)
+async def list_tickets(
+    request: Request,
+    filters: TicketFilters = Depends(),
+    page: PageParams = Depends(),
+    fields: FieldSet = Depends(TICKET_FIELDS),
+    include: IncludeSet = Depends(TICKET_INCLUDES),
+    db: AsyncSession = Depends(get_async_db),
+):
+    kind = fields.variant("tickets")
+    if is_conditional(request) and not include:
+        versions = select(Ticket.id, Ticket.updated_at)
+        versions = apply_keyset(filters.apply(versions), page, filters.keys, filters.descending)
+        if hit := unchanged(request, kind, await db.execute(versions)):
+            return hit
+    columns = fields.columns(
+        Ticket, *filters.key_columns, Ticket.id, Ticket.updated_at, *include.columns
+    )
+    stmt = apply_keyset(filters.apply(select(*columns)), page, filters.keys, filters.descending)
+    rows = (await db.execute(stmt)).all()
+    content = page_of(rows, page, filters.keys, key_of=filters.key_of)
+    embedded = await db.run_sync(include.embed, content["items"]) if include else None
+    response = TICKET_PAGE.response(content, fields=fields.names, embedded=embedded)
+    return tagged(request, response, None if include else rows_etag(kind, rows))
+
+
+@router.get("/search", response_model=Page[TicketSearchHit])
+async def search_tickets(
+    search: TicketSearch = Depends(),
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+):
+    rows = (await db.execute(search.stmt(page))).all()
+    return TICKET_SEARCH_PAGE.response(page_of(rows, page, SEARCH_KEYS, key_of=search.key_of))
+
+
+@router.get("/{ticket_id}", response_model=TicketExpanded, responses=NOT_MODIFIED)
+async def get_ticket(
+    ticket_id: int,
+    request: Request,
+    fields: FieldSet = Depends(TICKET_FIELDS),
+    include: IncludeSet = Depends(TICKET_INCLUDES),
+    db: AsyncSession = Depends(get_async_db),
+):
+    kind = fields.variant("ticket")
+    if is_conditional(request) and not include:
+        version = select(Ticket.id, Ticket.updated_at).where(Ticket.id == ticket_id)
+        if hit := unchanged(request, kind, await db.execute(version)):
+            return hit
+    columns = fields.columns(Ticket, Ticket.id, Ticket.updated_at, *include.columns)
+    row = (await db.execute(select(*columns).where(Ticket.id == ticket_id))).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Ticket not found")
+    embedded = await db.run_sync(include.embed, [row]) if include else None
+    response = TICKET_PAGE.item(row, fields=fields.names, embedded=embedded and embedded[0])
+    return tagged(request, response, None if include else rows_etag(kind, [row]))
+
+
+@router.put("/{ticket_id}", response_model=TicketRead)
+async def update_ticket(
+    ticket_id: int, payload: TicketUpdate, db: AsyncSession = Depends(get_async_db)
+):
+    ticket = await db.get(Ticket, ticket_id)
+    if not ticket:
+        raise HTTPException(status_code=404, detail="Ticket not found")
+
+    update_data = payload.model_dump(exclude_unset=True)
+    if update_data:
+        update_data["updated_at"] = datetime.now()
+        for key, value in update_data.items():
+            setattr(ticket, key, value)
+        await db.commit()
+        await db.refresh(ticket)
+
+    return ticket
+
+
+@router.delete("/{ticket_id}", status_code=204)
+async def delete_ticket(ticket_id: int, db: AsyncSession = Depends(get_async_db)):
+    ticket = await db.get(Ticket, ticket_id)
+    if not ticket:
+        raise HTTPException(status_code=404, detail="Ticket not found")
+
+    await db.delete(ticket)
+    await db.commit()
@@ -0,0 +1,72 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_async_db
+from app.api.fields import FieldSet
+from app.api.pagination import PageParams, apply_keyset, page_of
+from app.api.v1.users import USER_FIELDS, USER_PAGE
+from app.db.models import User
+from app.schemas.pagination import Page
+from app.schemas.user import UserCreate, UserRead, UserUpdate
+
+router = APIRouter()
+
+
+@router.post("", response_model=UserRead, status_code=201)
+async def create_user(payload: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    if await db.scalar(select(User.id).where(User.email == payload.email)):
+        raise HTTPException(status_code=409, detail="Email already exists")
+    user = User(email=payload.email, full_name=payload.full_name, role=payload.role)
+    db.add(user)
+    await db.commit()
+    await db.refresh(user)
+    return user
+
+
+@router.get("", response_model=Page[UserRead])
+async def list_users(
+    page: PageParams = Depends(),
+    fields: FieldSet = Depends(USER_FIELDS),
+    db: AsyncSession = Depends(get_async_db),
+):
+    keys = (User.id,)
+    stmt = select(*fields.columns(User, User.id))
+    rows = (await db.execute(apply_keyset(stmt, page, keys))).all()
+    return USER_PAGE.response(page_of(rows, page, keys), fields=fields.names)
+
+
+@router.get("/{user_id}", response_model=UserRead)
+async def get_user(
+    user_id: int,
+    fields: FieldSet = Depends(USER_FIELDS),
+    db: AsyncSession = Depends(get_async_db),
+):
+    row = (await db.execute(select(*fields.columns(User)).where(User.id == user_id))).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return USER_PAGE.item(row, fields=fields.names)
+
+
+@router.put("/{user_id}", response_model=UserRead)
+async def update_user(user_id: int, payload: UserUpdate, db: AsyncSession = Depends(get_async_db)):
+    user = await db.get(User, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    if payload.full_name is not None:
+        user.full_name = payload.full_name
+    if payload.role is not None:
+        user.role = payload.role
+    await db.commit()
+    await db.refresh(user)
+    return user
+
+
+@router.delete("/{user_id}", status_code=204)
+async def delete_user(user_id: int, db: AsyncSession = Depends(get_async_db)):
+    user = await db.get(User, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    await db.delete(user)
+    await db.commit()
+    return None
@@ -1,15 +1,37 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db
+from app.api.audit_routing import export_stmt, get_routed, list_routed
+from app.api.deps import get_audit_buffer, get_db, get_read_db
+from app.api.export import ExportFormat, stream_export
+from app.api.fast_json import PageSerializer
+from app.api.fields import FieldSet, sparse_fields
+from app.api.filters import AuditLogFilters
+from app.api.pagination import PageParams
+from app.db.audit_buffer import AuditLogBuffer
 from app.db.models import AuditLog
 from app.schemas.audit_log import AuditLogCreate, AuditLogRead
+from app.schemas.pagination import Page
 
 router = APIRouter()
 
+AUDIT_LOG_PAGE = PageSerializer(AuditLogRead)
+AUDIT_LOG_FIELDS = sparse_fields(AuditLogRead)
 
-@router.post("", response_model=AuditLogRead, status_code=201)
-def create_audit_log(payload: AuditLogCreate, db: Session = Depends(get_db)):
+
+QUEUED_RESPONSE = {202: {"description": "Queued for write-behind ingestion"}}
+
+
+@router.post("", response_model=AuditLogRead, status_code=201, responses=QUEUED_RESPONSE)
+def create_audit_log(
+    payload: AuditLogCreate,
+    db: Session = Depends(get_db),
+    buffer: AuditLogBuffer | None = Depends(get_audit_buffer),
+):
+    if buffer is not None:
+        buffer.submit(**payload.model_dump())
+        return JSONResponse({"status": "queued"}, status_code=202)
     audit_log = AuditLog(
         action=payload.action,
         table_name=payload.table_name,
@@ -23,17 +45,44 @@ def create_audit_log(payload: AuditLogCreate, db: Session = Depends(get_db)):
     return audit_log
 
 
-@router.get("", response_model=list[AuditLogRead])
-def list_audit_logs(db: Session = Depends(get_db)):
-    return db.query(AuditLog).order_by(AuditLog.created_at.desc()).all()
+@router.get("", response_model=Page[AuditLogRead])
+def list_audit_logs(
+    filters: AuditLogFilters = Depends(),
+    page: PageParams = Depends(),
+    include_archived: bool = False,
+    fields: FieldSet = Depends(AUDIT_LOG_FIELDS),
+    db: Session = Depends(get_db),
+):
+    content = list_routed(db, filters, page, include_archived, fields.names)
+    return AUDIT_LOG_PAGE.response(content, fields=fields.names)
+
+
+@router.get("/buffer/stats")
+def audit_buffer_stats(buffer: AuditLogBuffer | None = Depends(get_audit_buffer)):
+    return {"enabled": buffer is not None, **(buffer.stats() if buffer else {})}
+
+
+@router.get("/export")
+def export_audit_logs(
+    format: ExportFormat = "ndjson",
+    gzip: bool = False,
+    filters: AuditLogFilters = Depends(),
+    db: Session = Depends(get_read_db),
+):
+    stmt = export_stmt(db, filters)
+    return stream_export(db, stmt, AuditLogRead, "audit-logs", format, gzip)
 
 
 @router.get("/{audit_log_id}", response_model=AuditLogRead)
-def get_audit_log(audit_log_id: int, db: Session = Depends(get_db)):
-    audit_log = db.query(AuditLog).filter(AuditLog.id == audit_log_id).first()
+def get_audit_log(
+    audit_log_id: int,
+    fields: FieldSet = Depends(AUDIT_LOG_FIELDS),
+    db: Session = Depends(get_db),
+):
+    audit_log = get_routed(db, audit_log_id, fields.names)
     if not audit_log:
         raise HTTPException(status_code=404, detail="Audit log not found")
-    return audit_log
+    return AUDIT_LOG_PAGE.item(audit_log, fields=fields.names)
 
 
 # Pas de PUT/DELETE pour AuditLog - les logs d'audit ne doivent pas être modifiés !
@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
-from app.core.security import create_access_token, verify_password
+from app.core.hashing import password_pool
+from app.core.security import create_access_token, needs_rehash
 from app.db.models import User
 from app.schemas.auth import LoginInput, Token
 
@@ -10,9 +12,18 @@ router = APIRouter()
 
 
 @router.post("/login", response_model=Token)
-def login(data: LoginInput, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == data.email).first()
-    if not user or not verify_password(data.password, user.password_hash) or not user.is_active:
+async def login(data: LoginInput, db: Session = Depends(get_db)):
+    # handler async : le PBKDF2 part dans le pool de processus sans bloquer de thread
+    user = await run_in_threadpool(lambda: db.query(User).filter(User.email == data.email).first())
+    if (
+        not user
+        or not await password_pool.verify(data.password, user.password_hash)
+        or not user.is_active
+    ):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    if needs_rehash(user.password_hash):
+        # mise à niveau transparente (sel aléatoire, coût courant) au login réussi
+        user.password_hash = await password_pool.hash(data.password)
+        await run_in_threadpool(db.commit)
     token = create_access_token(sub=user.email, extra={"role": user.role})
     return {"status_code": status.HTTP_200_OK, "access_token": token, "token_type": "bearer"}
@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import get_change_feed
+from app.db.change_feed import ChangeFeed
+
+router = APIRouter()
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    # pas de mise en tampon par un proxy nginx devant l'application
+    "X-Accel-Buffering": "no",
+}
+
+STREAM_RESPONSES = {
+    200: {"content": {"text/event-stream": {}}, "description": "Server-Sent Events"},
+    503: {"description": "Too many subscribers on this worker"},
+}
+
+
+@router.get("/stream", response_class=StreamingResponse, responses=STREAM_RESPONSES)
+async def stream_changes(
+    project_id: list[int] | None = Query(None),
+    last_event_id: int | None = None,
+    last_event_id_header: int | None = Header(None, alias="Last-Event-ID"),
+    feed: ChangeFeed = Depends(get_change_feed),
+):
+    """
+    Créations, modifications et suppressions de tickets et de projets en
+    direct (`event: ticket.update`, `id:` = numéro de séquence). À la
+    reconnexion, le navigateur renvoie `Last-Event-ID` et le flux reprend
+    juste après ; `?last_event_id=` fait de même au premier appel.
+    `?project_id=` (répétable) filtre par projet.
+    """
+    # handler async sans session : un abonné n'occupe ni thread ni connexion
+    if feed.full:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many change stream subscribers",
+            headers={"Retry-After": "5"},
+        )
+    last_id = last_event_id_header if last_event_id_header is not None else last_event_id
+    projects = frozenset(project_id) if project_id else None
+    return StreamingResponse(
+        feed.stream(last_id, projects), media_type="text/event-stream", headers=SSE_HEADERS
+    )
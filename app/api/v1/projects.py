@@ -1,15 +1,36 @@
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db, require_roles
-from app.db.enums import UserRole
-from app.db.models import Project
-from app.schemas.project import ProjectCreate, ProjectRead, ProjectUpdate
+from app.api.etag import NOT_MODIFIED, is_conditional, rows_etag, tagged, unchanged
+from app.api.fast_json import PageSerializer
+from app.api.fields import FieldSet, sparse_fields
+from app.api.includes import Count, IncludeSet, Related, includes
+from app.api.pagination import PageParams, apply_keyset, page_of
+from app.db.enums import TicketPriority, TicketStatus, UserRole
+from app.db.models import Project, Ticket
+from app.schemas.pagination import Page
+from app.schemas.project import (
+    AssigneeOpenCount,
+    ProjectCreate,
+    ProjectExpanded,
+    ProjectRead,
+    ProjectSummary,
+    ProjectUpdate,
+)
+from app.schemas.user import UserRead
 
 router = APIRouter()
 
+PROJECT_PAGE = PageSerializer(ProjectRead)
+PROJECT_FIELDS = sparse_fields(ProjectRead)
+PROJECT_INCLUDES = includes(
+    owner=Related(Project.owner, UserRead), tickets_count=Count(Project.tickets)
+)
+
 
 @router.post("", response_model=ProjectRead, status_code=201)
 def create_project(
@@ -31,20 +52,120 @@ def create_project(
     return proj
 
 
-@router.get("", response_model=list[ProjectRead])
+@router.get("", response_model=Page[ProjectExpanded], responses=NOT_MODIFIED)
 def list_projects(
+    request: Request,
+    page: PageParams = Depends(),
+    fields: FieldSet = Depends(PROJECT_FIELDS),
+    include: IncludeSet = Depends(PROJECT_INCLUDES),
     db: Session = Depends(get_db),
     _=Depends(require_roles(UserRole.manager, UserRole.admin)),
 ):
-    return db.query(Project).order_by(Project.id).all()
+    keys = (Project.id,)
+    kind = fields.variant("projects")
+    if is_conditional(request) and not include:
+        versions = apply_keyset(select(Project.id, Project.updated_at), page, keys)
+        if hit := unchanged(request, kind, db.execute(versions)):
+            return hit
+    # id et updated_at en plus des champs demandés : curseur et ETag
+    stmt = select(*fields.columns(Project, Project.id, Project.updated_at, *include.columns))
+    rows = db.execute(apply_keyset(stmt, page, keys)).all()
+    content = page_of(rows, page, keys)
+    embedded = include.embed(db, content["items"])
+    response = PROJECT_PAGE.response(content, fields=fields.names, embedded=embedded)
+    return tagged(request, response, None if include else rows_etag(kind, rows))
 
 
-@router.get("/{project_id}", response_model=ProjectRead)
-def get_project(project_id: int, db: Session = Depends(get_db)):
-    proj = db.query(Project).filter(Project.id == project_id).first()
-    if not proj:
+def _empty_summary(project_id: int) -> ProjectSummary:
+    return ProjectSummary(
+        project_id=project_id,
+        total=0,
+        by_status_priority={s: {p: 0 for p in TicketPriority} for s in TicketStatus},
+        open_by_assignee=[],
+    )
+
+
+def project_summaries(db: Session, project_ids: list[int] | None) -> dict[int, ProjectSummary]:
+    """
+    Un seul GROUP BY sur tickets (projet, statut, priorité, assigné) : quelques
+    dizaines de lignes par projet, repliées ici en compteurs. Aucune hydratation ORM.
+    """
+    stmt = select(
+        Ticket.project_id,
+        Ticket.status,
+        Ticket.priority,
+        Ticket.assignee_id,
+        func.count(),
+        func.min(Ticket.created_at),
+    ).group_by(Ticket.project_id, Ticket.status, Ticket.priority, Ticket.assignee_id)
+    if project_ids is not None:
+        stmt = stmt.where(Ticket.project_id.in_(project_ids))
+
+    summaries = {pid: _empty_summary(pid) for pid in project_ids or ()}
+    open_counts: dict[int, dict[int | None, int]] = {}
+    for project_id, status, priority, assignee_id, count, oldest in db.execute(stmt):
+        summary = summaries.setdefault(project_id, _empty_summary(project_id))
+        summary.total += count
+        summary.by_status_priority[status][priority] += count
+        if status == TicketStatus.done:
+            continue
+        per_assignee = open_counts.setdefault(project_id, {})
+        per_assignee[assignee_id] = per_assignee.get(assignee_id, 0) + count
+        if summary.oldest_open_created_at is None or oldest < summary.oldest_open_created_at:
+            summary.oldest_open_created_at = oldest
+
+    now = datetime.now()
+    for project_id, summary in summaries.items():
+        summary.open_by_assignee = [
+            AssigneeOpenCount(assignee_id=assignee_id, open=count)
+            for assignee_id, count in sorted(
+                open_counts.get(project_id, {}).items(), key=lambda item: -item[1]
+            )
+        ]
+        if summary.oldest_open_created_at is not None:
+            age = now - summary.oldest_open_created_at
+            summary.oldest_open_age_seconds = age.total_seconds()
+    return summaries
+
+
+@router.get("/summary", response_model=list[ProjectSummary])
+def list_project_summaries(
+    project_id: list[int] | None = Query(None),
+    db: Session = Depends(get_db),
+    _=Depends(require_roles(UserRole.manager, UserRole.admin)),
+):
+    summaries = project_summaries(db, project_id)
+    return [summaries[pid] for pid in sorted(summaries)]
+
+
+@router.get("/{project_id}/summary", response_model=ProjectSummary)
+def get_project_summary(project_id: int, db: Session = Depends(get_db)):
+    summary = project_summaries(db, [project_id])[project_id]
+    if summary.total == 0 and db.get(Project, project_id) is None:
         raise HTTPException(status_code=404, detail="Project not found")
-    return proj
+    return summary
+
+
+@router.get("/{project_id}", response_model=ProjectExpanded, responses=NOT_MODIFIED)
+def get_project(
+    project_id: int,
+    request: Request,
+    fields: FieldSet = Depends(PROJECT_FIELDS),
+    include: IncludeSet = Depends(PROJECT_INCLUDES),
+    db: Session = Depends(get_db),
+):
+    kind = fields.variant("project")
+    if is_conditional(request) and not include:
+        version = select(Project.id, Project.updated_at).where(Project.id == project_id)
+        if hit := unchanged(request, kind, db.execute(version)):
+            return hit
+    columns = fields.columns(Project, Project.id, Project.updated_at, *include.columns)
+    row = db.execute(select(*columns).where(Project.id == project_id)).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    embedded = include.embed(db, [row])
+    response = PROJECT_PAGE.item(row, fields=fields.names, embedded=embedded and embedded[0])
+    return tagged(request, response, None if include else rows_etag(kind, [row]))
 
 
 @router.put("/{project_id}", response_model=ProjectRead)
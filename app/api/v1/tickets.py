@@ -1,14 +1,47 @@
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import Select, delete, insert, select, update
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db
-from app.db.models import Ticket
-from app.schemas.ticket import TicketCreate, TicketRead, TicketUpdate
+from app.api.deps import get_db, get_read_db
+from app.api.etag import NOT_MODIFIED, is_conditional, rows_etag, tagged, unchanged
+from app.api.export import ExportFormat, columns_for, stream_export
+from app.api.fast_json import PageSerializer
+from app.api.fields import FieldSet, sparse_fields
+from app.api.filters import TicketFilters
+from app.api.includes import IncludeSet, Related, includes
+from app.api.pagination import PageParams, apply_keyset, page_of
+from app.db import audit_trail, fts
+from app.db.enums import TicketStatus
+from app.db.models import Project, Ticket, User
+from app.schemas.pagination import Page
+from app.schemas.project import ProjectRead
+from app.schemas.ticket import (
+    TicketBulkItemResult,
+    TicketBulkOperation,
+    TicketBulkRequest,
+    TicketBulkResponse,
+    TicketCreate,
+    TicketExpanded,
+    TicketRead,
+    TicketSearchHit,
+    TicketUpdate,
+)
+from app.schemas.user import UserRead
 
 router = APIRouter()
 
+TICKET_PAGE = PageSerializer(TicketRead)
+TICKET_FIELDS = sparse_fields(TicketRead)
+TICKET_INCLUDES = includes(
+    assignee=Related(Ticket.assignee, UserRead), project=Related(Ticket.project, ProjectRead)
+)
+TICKET_SEARCH_PAGE = PageSerializer(TicketSearchHit)
+
+# pertinence BM25 croissante, id pour départager
+SEARCH_KEYS = (fts.rank, Ticket.id)
+
 
 @router.post("", response_model=TicketRead, status_code=201)
 def create_ticket(payload: TicketCreate, db: Session = Depends(get_db)):
@@ -28,17 +61,240 @@ def create_ticket(payload: TicketCreate, db: Session = Depends(get_db)):
     return ticket
 
 
-@router.get("", response_model=list[TicketRead])
-def list_tickets(db: Session = Depends(get_db)):
-    return db.query(Ticket).order_by(Ticket.id).all()
+def _existing_ids(db: Session, column, ids: set[int]) -> set[int]:
+    if not ids:
+        return set()
+    return set(db.scalars(select(column).where(column.in_(ids))))
 
 
-@router.get("/{ticket_id}", response_model=TicketRead)
-def get_ticket(ticket_id: int, db: Session = Depends(get_db)):
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
-    if not ticket:
+# colonnes NOT NULL modifiables : un `null` explicite ferait échouer tout le lot en base
+REQUIRED_UPDATE_FIELDS = tuple(
+    name for name in TicketUpdate.model_fields if not Ticket.__table__.c[name].nullable
+)
+
+
+def _null_fields(data: TicketUpdate) -> list[str]:
+    return [
+        name
+        for name in REQUIRED_UPDATE_FIELDS
+        if name in data.model_fields_set and getattr(data, name) is None
+    ]
+
+
+def _validate_bulk(db: Session, ops: list[TicketBulkOperation]) -> list[TicketBulkItemResult]:
+    """Valide toutes les opérations avec une requête IN par table référencée."""
+    creates = [op for op in ops if op.op == "create"]
+    updates = [op for op in ops if op.op == "update"]
+    projects = _existing_ids(db, Project.id, {op.data.project_id for op in creates})
+    users = _existing_ids(
+        db,
+        User.id,
+        {op.data.assignee_id for op in creates + updates if op.data.assignee_id is not None},
+    )
+    tickets = _existing_ids(db, Ticket.id, {op.id for op in ops if op.op != "create"})
+
+    results: list[TicketBulkItemResult] = []
+    targeted: set[int] = set()
+    for index, op in enumerate(ops):
+        res = TicketBulkItemResult(index=index, op=op.op, status=201)
+        if op.op == "create":
+            if op.data.project_id not in projects:
+                res.status, res.error = 422, "Project not found"
+        elif op.id not in tickets:
+            res.status, res.error = 404, "Ticket not found"
+        elif op.op == "update" and (nulls := _null_fields(op.data)):
+            res.status, res.error = 422, f"Field cannot be null: {', '.join(nulls)}"
+        elif op.id in targeted:
+            res.status, res.error = 409, "Ticket already targeted by another operation"
+        else:
+            res.id = op.id
+            res.status = 200 if op.op == "update" else 204
+            targeted.add(op.id)
+        if (
+            res.error is None
+            and op.op != "delete"
+            and op.data.assignee_id is not None
+            and op.data.assignee_id not in users
+        ):
+            res.status, res.error = 422, "Assignee not found"
+        results.append(res)
+    return results
+
+
+def _apply_bulk(
+    db: Session, ops: list[TicketBulkOperation], results: list[TicketBulkItemResult]
+) -> None:
+    """Une instruction ensembliste par type d'opération, sans commit.
+
+    Les instructions Core ne passent pas par `after_flush` : les lignes d'audit
+    sont écrites ici (valeurs envoyées seulement, sans relire l'ancien état).
+    """
+    now = datetime.now()
+    valid = [(res, op) for res, op in zip(results, ops, strict=True) if res.error is None]
+    actor = db.info.get(audit_trail.ACTOR_KEY)
+    audit: list[dict] = []
+
+    creates = [(res, op) for res, op in valid if op.op == "create"]
+    if creates:
+        rows = [{**op.data.model_dump(), "created_at": now, "updated_at": now} for _, op in creates]
+        stmt = insert(Ticket).returning(Ticket.id, sort_by_parameter_order=True)
+        for (res, _), row, ticket_id in zip(creates, rows, db.scalars(stmt, rows), strict=True):
+            res.id = ticket_id
+            payload = {k: audit_trail.jsonable(v) for k, v in row.items() if v is not None}
+            audit.append(audit_trail.audit_row("CREATE", "tickets", ticket_id, actor, payload))
+
+    updates = [
+        {"id": op.id, **op.data.model_dump(exclude_unset=True), "updated_at": now}
+        for _, op in valid
+        if op.op == "update"
+    ]
+    if updates:
+        db.execute(update(Ticket), updates)
+        for row in updates:
+            payload = {k: {"new": audit_trail.jsonable(v)} for k, v in row.items() if k != "id"}
+            audit.append(audit_trail.audit_row("UPDATE", "tickets", row["id"], actor, payload))
+
+    deleted = [op.id for _, op in valid if op.op == "delete"]
+    if deleted:
+        db.execute(
+            delete(Ticket).where(Ticket.id.in_(deleted)),
+            execution_options={"synchronize_session": False},
+        )
+        audit += [audit_trail.audit_row("DELETE", "tickets", i, actor, None) for i in deleted]
+
+    audit_trail.record(db, audit)
+
+
+@router.post(":bulk", response_model=TicketBulkResponse)
+def bulk_tickets(payload: TicketBulkRequest, db: Session = Depends(get_db)):
+    return run_bulk(db, payload)
+
+
+def run_bulk(db: Session, payload: TicketBulkRequest) -> TicketBulkResponse:
+    """Valide puis applique le lot dans une seule transaction."""
+    ops = payload.operations
+    results = _validate_bulk(db, ops)
+    failed = sum(res.error is not None for res in results)
+    if payload.atomic and failed:
+        for res in results:
+            if res.error is None:
+                res.status, res.error = 424, "Not applied: another operation failed"
+        return TicketBulkResponse(succeeded=0, failed=len(results), results=results)
+
+    _apply_bulk(db, ops, results)
+    db.commit()
+    return TicketBulkResponse(succeeded=len(results) - failed, failed=failed, results=results)
+
+
+@router.get("", response_model=Page[TicketExpanded], responses=NOT_MODIFIED)
+def list_tickets(
+    request: Request,
+    filters: TicketFilters = Depends(),
+    page: PageParams = Depends(),
+    fields: FieldSet = Depends(TICKET_FIELDS),
+    include: IncludeSet = Depends(TICKET_INCLUDES),
+    db: Session = Depends(get_db),
+):
+    kind = fields.variant("tickets")
+    if is_conditional(request) and not include:
+        versions = db.execute(
+            apply_keyset(
+                filters.apply(select(Ticket.id, Ticket.updated_at)),
+                page,
+                filters.keys,
+                filters.descending,
+            )
+        )
+        if hit := unchanged(request, kind, versions):
+            return hit
+    columns = fields.columns(
+        Ticket, *filters.key_columns, Ticket.id, Ticket.updated_at, *include.columns
+    )
+    stmt = apply_keyset(filters.apply(select(*columns)), page, filters.keys, filters.descending)
+    rows = db.execute(stmt).all()
+    content = page_of(rows, page, filters.keys, key_of=filters.key_of)
+    embedded = include.embed(db, content["items"])
+    response = TICKET_PAGE.response(content, fields=fields.names, embedded=embedded)
+    return tagged(request, response, None if include else rows_etag(kind, rows))
+
+
+class TicketSearch:
+    def __init__(
+        self,
+        q: str = Query(min_length=1, description="Mots recherchés (tous requis, `mot*` = préfixe)"),
+        project_id: int | None = None,
+        status: list[TicketStatus] | None = Query(None),
+    ):
+        self.expression = fts.fts_query(q)
+        if self.expression is None:
+            raise HTTPException(status_code=400, detail="Empty search query")
+        self.project_id = project_id
+        self.status = status
+
+    def stmt(self, page: PageParams) -> Select:
+        stmt = (
+            select(
+                *columns_for(Ticket, TicketRead),
+                fts.rank.label("rank"),
+                fts.snippet.label("snippet"),
+            )
+            .select_from(fts.tickets_fts)
+            .join(Ticket, Ticket.id == fts.tickets_fts.c.rowid)
+            .where(fts.match(self.expression))
+        )
+        if self.project_id is not None:
+            stmt = stmt.where(Ticket.project_id == self.project_id)
+        if self.status:
+            stmt = stmt.where(Ticket.status.in_(self.status))
+        return apply_keyset(stmt, page, SEARCH_KEYS)
+
+    @staticmethod
+    def key_of(row) -> tuple[float, int]:
+        return (row.rank, row.id)
+
+
+@router.get("/search", response_model=Page[TicketSearchHit])
+def search_tickets(
+    search: TicketSearch = Depends(),
+    page: PageParams = Depends(),
+    db: Session = Depends(get_db),
+):
+    rows = db.execute(search.stmt(page)).all()
+    return TICKET_SEARCH_PAGE.response(page_of(rows, page, SEARCH_KEYS, key_of=search.key_of))
+
+
+@router.get("/export")
+def export_tickets(
+    format: ExportFormat = "ndjson",
+    gzip: bool = False,
+    filters: TicketFilters = Depends(),
+    db: Session = Depends(get_read_db),
+):
+    stmt = filters.apply(select(*columns_for(Ticket, TicketRead)))
+    stmt = stmt.order_by(*(k.desc() if filters.descending else k for k in filters.keys))
+    return stream_export(db, stmt, TicketRead, "tickets", format, gzip)
+
+
+@router.get("/{ticket_id}", response_model=TicketExpanded, responses=NOT_MODIFIED)
+def get_ticket(
+    ticket_id: int,
+    request: Request,
+    fields: FieldSet = Depends(TICKET_FIELDS),
+    include: IncludeSet = Depends(TICKET_INCLUDES),
+    db: Session = Depends(get_db),
+):
+    kind = fields.variant("ticket")
+    if is_conditional(request) and not include:
+        version = select(Ticket.id, Ticket.updated_at).where(Ticket.id == ticket_id)
+        if hit := unchanged(request, kind, db.execute(version)):
+            return hit
+    columns = fields.columns(Ticket, Ticket.id, Ticket.updated_at, *include.columns)
+    row = db.execute(select(*columns).where(Ticket.id == ticket_id)).first()
+    if row is None:
         raise HTTPException(status_code=404, detail="Ticket not found")
-    return ticket
+    embedded = include.embed(db, [row])
+    response = TICKET_PAGE.item(row, fields=fields.names, embedded=embedded and embedded[0])
+    return tagged(request, response, None if include else rows_etag(kind, [row]))
 
 
 @router.put("/{ticket_id}", response_model=TicketRead)
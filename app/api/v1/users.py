@@ -1,12 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
+from app.api.fast_json import PageSerializer
+from app.api.fields import FieldSet, sparse_fields
+from app.api.pagination import PageParams, apply_keyset, page_of
 from app.db.models import User
+from app.schemas.pagination import Page
 from app.schemas.user import UserCreate, UserRead, UserUpdate
 
 router = APIRouter()
 
+USER_PAGE = PageSerializer(UserRead)
+USER_FIELDS = sparse_fields(UserRead)
+
 
 @router.post("", response_model=UserRead, status_code=201)
 def create_user(payload: UserCreate, db: Session = Depends(get_db)):
@@ -19,17 +27,24 @@ def create_user(payload: UserCreate, db: Session = Depends(get_db)):
     return user
 
 
-@router.get("", response_model=list[UserRead])
-def list_users(db: Session = Depends(get_db)):
-    return db.query(User).order_by(User.id).all()
+@router.get("", response_model=Page[UserRead])
+def list_users(
+    page: PageParams = Depends(),
+    fields: FieldSet = Depends(USER_FIELDS),
+    db: Session = Depends(get_db),
+):
+    keys = (User.id,)
+    stmt = select(*fields.columns(User, User.id))
+    rows = db.execute(apply_keyset(stmt, page, keys)).all()
+    return USER_PAGE.response(page_of(rows, page, keys), fields=fields.names)
 
 
 @router.get("/{user_id}", response_model=UserRead)
-def get_user(user_id: int, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+def get_user(user_id: int, fields: FieldSet = Depends(USER_FIELDS), db: Session = Depends(get_db)):
+    row = db.execute(select(*fields.columns(User)).where(User.id == user_id)).first()
+    if row is None:
         raise HTTPException(status_code=404, detail="User not found")
-    return user
+    return USER_PAGE.item(row, fields=fields.names)
 
 
 @router.put("/{user_id}", response_model=UserRead)
@@ -3,13 +3,113 @@ import os
 from pydantic import BaseModel
 
 
+def _env_bool(name: str, default: bool = False) -> bool:
+    return os.getenv(name, str(default)).lower() in ("1", "true", "yes")
+
+
 class Settings(BaseModel):
     # fichier SQLite local (à la racine du conteneur / du projet)
     SQLITE_PATH: str = os.getenv("SQLITE_PATH", "opshub.db")
 
+    # profil moteur SQLite : pragmas appliqués à chaque nouvelle connexion
+    SQLITE_JOURNAL_MODE: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_CACHE_SIZE_KIB: int = int(os.getenv("SQLITE_CACHE_SIZE_KIB", "65536"))
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_TEMP_STORE: str = os.getenv("SQLITE_TEMP_STORE", "MEMORY")
+
+    # pool de connexions
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+    # lectures (GET) servies par un second moteur en lecture seule (query_only),
+    # avec son propre pool : un rapport long n'occupe pas les connexions d'écriture
+    DB_READ_ROUTING: bool = _env_bool("DB_READ_ROUTING", True)
+    DB_READ_POOL_SIZE: int = int(os.getenv("DB_READ_POOL_SIZE", "10"))
+    DB_READ_MAX_OVERFLOW: int = int(os.getenv("DB_READ_MAX_OVERFLOW", "20"))
+
+    # GET /metrics (texte Prometheus) et middleware de mesure
+    METRICS_ENABLED: bool = _env_bool("METRICS_ENABLED", True)
+
+    # profileur SQL par requête : en-têtes X-DB-Query-Count / X-DB-Time, journal
+    # des requêtes lentes (ms) et des N+1 (même requête plus de N fois)
+    DB_PROFILE: bool = _env_bool("DB_PROFILE")
+    DB_SLOW_QUERY_MS: float = float(os.getenv("DB_SLOW_QUERY_MS", "100"))
+    DB_N_PLUS_ONE_THRESHOLD: int = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", "5"))
+
+    # démarrage : routeurs importés à la première requête sous leur préfixe,
+    # schéma OpenAPI lu dans un fichier généré au build (python -m app.api.openapi)
+    LAZY_ROUTERS: bool = _env_bool("LAZY_ROUTERS", True)
+    OPENAPI_FILE: str = os.getenv("OPENAPI_FILE", "")
+
+    # pile asynchrone (AsyncEngine aiosqlite + routeurs async) au lieu du threadpool
+    DB_ASYNC: bool = _env_bool("DB_ASYNC")
+
+    # journal d'audit automatique (after_flush) sur tickets, projets, utilisateurs
+    AUDIT_TRAIL_ENABLED: bool = _env_bool("AUDIT_TRAIL_ENABLED", True)
+
+    # partitions mensuelles : mois gardés en base avant archivage compressé
+    AUDIT_RETENTION_MONTHS: int = int(os.getenv("AUDIT_RETENTION_MONTHS", "12"))
+    AUDIT_ARCHIVE_DIR: str = os.getenv("AUDIT_ARCHIVE_DIR", "audit_archive")
+
+    # ingestion différée des logs d'audit (file bornée + INSERT groupé)
+    AUDIT_BUFFER_ENABLED: bool = _env_bool("AUDIT_BUFFER_ENABLED")
+    AUDIT_BUFFER_FLUSH_MS: int = int(os.getenv("AUDIT_BUFFER_FLUSH_MS", "200"))
+    AUDIT_BUFFER_BATCH_SIZE: int = int(os.getenv("AUDIT_BUFFER_BATCH_SIZE", "500"))
+    AUDIT_BUFFER_MAX_QUEUE: int = int(os.getenv("AUDIT_BUFFER_MAX_QUEUE", "10000"))
+    AUDIT_BUFFER_PUT_TIMEOUT_MS: int = int(os.getenv("AUDIT_BUFFER_PUT_TIMEOUT_MS", "100"))
+
+    # flux SSE GET /api/v1/changes/stream : événements gardés en mémoire pour
+    # la reprise (Last-Event-ID), lecture de la table changes (écritures des
+    # autres workers), battement de cœur, abonnés par worker, rétention en base
+    CHANGES_BUFFER_SIZE: int = int(os.getenv("CHANGES_BUFFER_SIZE", "10000"))
+    CHANGES_POLL_MS: int = int(os.getenv("CHANGES_POLL_MS", "1000"))
+    CHANGES_BATCH_SIZE: int = int(os.getenv("CHANGES_BATCH_SIZE", "500"))
+    CHANGES_HEARTBEAT_SECONDS: float = float(os.getenv("CHANGES_HEARTBEAT_SECONDS", "15"))
+    CHANGES_MAX_SUBSCRIBERS: int = int(os.getenv("CHANGES_MAX_SUBSCRIBERS", "10000"))
+    CHANGES_RETENTION_DAYS: int = int(os.getenv("CHANGES_RETENTION_DAYS", "7"))
+
+    # pagination : taille par défaut et plafond dur côté serveur
+    PAGE_SIZE_DEFAULT: int = int(os.getenv("PAGE_SIZE_DEFAULT", "50"))
+    PAGE_SIZE_MAX: int = int(os.getenv("PAGE_SIZE_MAX", "500"))
+
+    # nombre max d'opérations par appel à POST /api/v1/tickets:bulk
+    BULK_MAX_OPERATIONS: int = int(os.getenv("BULK_MAX_OPERATIONS", "5000"))
+
+    # cache des principaux authentifiés (get_current_user)
+    PRINCIPAL_CACHE_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+    PRINCIPAL_CACHE_TTL_SECONDS: float = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+
+    # pool de processus pour PBKDF2 (0 = calcul dans le threadpool)
+    HASH_POOL_SIZE: int = int(os.getenv("HASH_POOL_SIZE", str(min(os.cpu_count() or 1, 4))))
+    HASH_POOL_MAX_PENDING: int = int(os.getenv("HASH_POOL_MAX_PENDING", "64"))
+
     @property
     def database_url(self) -> str:
         return f"sqlite:///{self.SQLITE_PATH}"
 
+    @property
+    def async_database_url(self) -> str:
+        return f"sqlite+aiosqlite:///{self.SQLITE_PATH}"
+
+    @property
+    def sqlite_pragmas(self) -> dict[str, str | int]:
+        return {
+            "journal_mode": self.SQLITE_JOURNAL_MODE,
+            "synchronous": self.SQLITE_SYNCHRONOUS,
+            "busy_timeout": self.SQLITE_BUSY_TIMEOUT_MS,
+            # valeur négative = taille en KiB plutôt qu'en pages
+            "cache_size": -self.SQLITE_CACHE_SIZE_KIB,
+            "mmap_size": self.SQLITE_MMAP_SIZE,
+            "temp_store": self.SQLITE_TEMP_STORE,
+        }
+
+    @property
+    def sqlite_read_pragmas(self) -> dict[str, str | int]:
+        # query_only en dernier : journal_mode peut encore écrire l'en-tête
+        return {**self.sqlite_pragmas, "query_only": 1}
+
 
 settings = Settings()
@@ -0,0 +1,91 @@
+"""
+Hachage des mots de passe dans un pool de processus dédié et borné.
+
+PBKDF2 est purement CPU : exécuté dans le threadpool AnyIO, une vague de logins
+occupe tous les threads et bloque les autres endpoints. Ici le calcul part dans
+un `ProcessPoolExecutor` ; l'appelant attend sans bloquer de thread, et au-delà
+de `max_pending` calculs en cours ou en file on répond 503 immédiatement.
+"""
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import hmac
+import multiprocessing
+import threading
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.security import PASSWORD_HASH_ITERATIONS, format_hash, new_salt, parse_hash
+
+
+class PasswordHasherPool:
+    def __init__(self, size: int, max_pending: int):
+        self.size = size
+        self.max_pending = max_pending
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._executor: ProcessPoolExecutor | None = None
+
+    def configure(self, size: int, max_pending: int) -> None:
+        self.shutdown()
+        self.size = size
+        self.max_pending = max_pending
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn : pas de fork d'un processus serveur multi-threadé
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.size, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    async def _pbkdf2(self, password: str, salt: str, iterations: int) -> bytes:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication service busy, retry later",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+        try:
+            args = ("sha256", password.encode("utf-8"), salt.encode("utf-8"), iterations)
+            if self.size <= 0:
+                # pas de pool configuré : calcul dans le threadpool (comportement historique)
+                return await asyncio.to_thread(hashlib.pbkdf2_hmac, *args)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), hashlib.pbkdf2_hmac, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    async def hash(self, password: str, iterations: int | None = None) -> str:
+        iterations = iterations or PASSWORD_HASH_ITERATIONS
+        salt = new_salt()
+        return format_hash(iterations, salt, await self._pbkdf2(password, salt, iterations))
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        parsed = parse_hash(password_hash)
+        if parsed is None:
+            return False
+        iterations, salt, stored_hash = parsed
+        digest = await self._pbkdf2(password, salt, iterations)
+        return hmac.compare_digest(digest.hex(), stored_hash)
+
+
+password_pool = PasswordHasherPool(
+    size=settings.HASH_POOL_SIZE, max_pending=settings.HASH_POOL_MAX_PENDING
+)
@@ -0,0 +1,145 @@
+"""
+Métriques au format texte Prometheus, sans dépendance externe.
+
+Chaque thread écrit dans son propre fragment (`threading.local`) : compteurs
+et histogrammes sont de simples listes mutées en place, sans verrou sur le
+chemin chaud. Le verrou ne sert qu'à l'enregistrement d'un nouveau thread et
+à la collecte (`/metrics`), qui additionne les fragments ; ceux des threads
+terminés sont fusionnés puis oubliés.
+"""
+
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Sequence
+import threading
+
+# secondes : de 1 ms à 10 s
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class _Shard:
+    __slots__ = ("counters", "histograms", "thread")
+
+    def __init__(self, thread: threading.Thread):
+        self.thread = thread
+        self.counters: dict[tuple[str, Labels], list[float]] = {}
+        # [n_0, …, n_k, n_+Inf, somme] ; le cumul est fait à la collecte
+        self.histograms: dict[tuple[str, Labels], list[float]] = {}
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards: list[_Shard] = []
+        self._retired = _Shard(threading.main_thread())
+        self._help: dict[str, tuple[str, str]] = {}
+        self._buckets: dict[str, Sequence[float]] = {}
+        self._gauges: list[Callable[[], Iterable[tuple[str, Labels, float]]]] = []
+
+    def counter(self, name: str, help: str) -> None:
+        self._help[name] = ("counter", help)
+
+    def histogram(self, name: str, help: str, buckets: Sequence[float]) -> None:
+        self._help[name] = ("histogram", help)
+        self._buckets[name] = buckets
+
+    def gauge(self, name: str, help: str) -> None:
+        """Jauge : `inc` avec +1 / -1, ou valeurs fournies par un `collector`."""
+        self._help[name] = ("gauge", help)
+
+    def collector[C: Callable[[], Iterable[tuple[str, Labels, float]]]](self, collect: C) -> C:
+        """Jauges lues à la collecte : `collect` rend des (nom, labels, valeur)."""
+        self._gauges.append(collect)
+        return collect
+
+    def _shard(self) -> _Shard:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = _Shard(threading.current_thread())
+            with self._lock:
+                self._shards.append(shard)
+            return shard
+
+    def inc(self, name: str, labels: Labels = (), value: float = 1.0) -> None:
+        counters = self._shard().counters
+        cell = counters.get((name, labels))
+        if cell is None:
+            counters[(name, labels)] = [value]
+        else:
+            cell[0] += value
+
+    def observe(self, name: str, labels: Labels, value: float) -> None:
+        histograms = self._shard().histograms
+        cell = histograms.get((name, labels))
+        buckets = self._buckets[name]
+        if cell is None:
+            cell = histograms[(name, labels)] = [0] * (len(buckets) + 1) + [0.0]
+        cell[bisect_left(buckets, value)] += 1
+        cell[-1] += value
+
+    def _merge(self, into: _Shard, shard: _Shard) -> None:
+        for key, cell in shard.counters.copy().items():
+            into.counters.setdefault(key, [0.0])[0] += cell[0]
+        for key, cell in shard.histograms.copy().items():
+            total = into.histograms.setdefault(key, [0] * (len(cell) - 1) + [0.0])
+            for i, value in enumerate(cell):
+                total[i] += value
+
+    def snapshot(self) -> _Shard:
+        total = _Shard(threading.current_thread())
+        with self._lock:
+            alive = []
+            for shard in self._shards:
+                if shard.thread.is_alive():
+                    alive.append(shard)
+                else:
+                    self._merge(self._retired, shard)
+            self._shards = alive
+            for shard in [self._retired, *alive]:
+                self._merge(total, shard)
+        return total
+
+    def render(self) -> str:
+        """Exposition texte (version 0.0.4)."""
+        total = self.snapshot()
+        samples: dict[str, list[str]] = {name: [] for name in self._help}
+        for (name, labels), cell in sorted(total.counters.items()):
+            samples[name].append(f"{name}{_labels(labels)} {_number(cell[0])}")
+        for (name, labels), cell in sorted(total.histograms.items()):
+            cumulative = 0
+            for bound, count in zip((*self._buckets[name], "+Inf"), cell[:-1], strict=True):
+                cumulative += count
+                le = (("le", bound if isinstance(bound, str) else _number(bound)),)
+                samples[name].append(f"{name}_bucket{_labels(labels + le)} {cumulative}")
+            samples[name].append(f"{name}_sum{_labels(labels)} {_number(cell[-1])}")
+            samples[name].append(f"{name}_count{_labels(labels)} {cumulative}")
+        for collect in self._gauges:
+            for name, labels, value in collect():
+                samples[name].append(f"{name}{_labels(labels)} {_number(value)}")
+
+        lines = []
+        for name, (kind, help) in sorted(self._help.items()):
+            lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}", *samples[name]]
+        return "\n".join(lines) + "\n"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (k, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in labels
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+registry = Registry()
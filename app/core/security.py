@@ -1,36 +1,74 @@
 from datetime import UTC, datetime, timedelta
 import hashlib
+import hmac
 import os
+import secrets
+import time
 from typing import Any
 
 from fastapi import HTTPException, status
 from jose import JWTError, jwt
 
+from app.core.cache import TTLCache
+
 # Variables d'env
 SECRET_KEY = os.getenv("SECRET_KEY", "ThisIsASecretKeyForDemoPurposesOnly")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+
+
+# Coût PBKDF2 des nouveaux hash ; les hash existants gardent le leur
+PASSWORD_HASH_ITERATIONS = int(os.getenv("PASSWORD_HASH_ITERATIONS", "100000"))
+PASSWORD_SALT_BYTES = 16
+
+# Ancien format `pbkdf2_sha256$<salt>$<hash>` : sel constant, 100k itérations
+LEGACY_ITERATIONS = 100000
+
+
+def new_salt() -> str:
+    return secrets.token_hex(PASSWORD_SALT_BYTES)
+
+
+def format_hash(iterations: int, salt: str, digest: bytes) -> str:
+    return f"pbkdf2_sha256${iterations}${salt}${digest.hex()}"
+
 
+def parse_hash(password_hash: str) -> tuple[int, str, str] | None:
+    """Renvoie (itérations, sel, hash hex), ou None si le format est inconnu."""
+    parts = password_hash.split("$")
+    if parts[0] != "pbkdf2_sha256":
+        return None
+    if len(parts) == 3:
+        return LEGACY_ITERATIONS, parts[1], parts[2]
+    # ASCII seulement : "²".isdigit() est vrai mais int("²") échoue
+    if len(parts) == 4 and parts[1].isascii() and parts[1].isdigit() and int(parts[1]) > 0:
+        return int(parts[1]), parts[2], parts[3]
+    return None
 
-def hash_password(password: str) -> str:
-    salt = "opshub_salt_for_testing"
-    hashed = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt.encode("utf-8"), 100000)
-    result = f"pbkdf2_sha256${salt}${hashed.hex()}"
-    return result
+
+def pbkdf2(password: str, salt: str, iterations: int) -> bytes:
+    return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt.encode("utf-8"), iterations)
+
+
+def hash_password(password: str, iterations: int | None = None, salt: str | None = None) -> str:
+    iterations = iterations or PASSWORD_HASH_ITERATIONS
+    salt = salt or new_salt()
+    return format_hash(iterations, salt, pbkdf2(password, salt, iterations))
 
 
 def verify_password(password: str, password_hash: str) -> bool:
-    if not password_hash.startswith("pbkdf2_sha256$"):
+    parsed = parse_hash(password_hash)
+    if parsed is None:
         return False
+    iterations, salt, stored_hash = parsed
+    return hmac.compare_digest(pbkdf2(password, salt, iterations).hex(), stored_hash)
 
-    try:
-        _, salt, stored_hash = password_hash.split("$")
-        hashed = hashlib.pbkdf2_hmac(
-            "sha256", password.encode("utf-8"), salt.encode("utf-8"), 100000
-        )
-        return hashed.hex() == stored_hash
-    except (ValueError, TypeError):
-        return False
+
+def needs_rehash(password_hash: str) -> bool:
+    """Vrai si le hash doit être régénéré (ancien format ou coût différent)."""
+    parsed = parse_hash(password_hash)
+    return parsed is None or password_hash.count("$") != 3 or parsed[0] != PASSWORD_HASH_ITERATIONS
 
 
 def create_access_token(
@@ -46,8 +84,21 @@ def create_access_token(
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
+# Claims déjà vérifiés, indexés par digest du token et expirant à son `exp` :
+# un client réutilise le même token sur des centaines de requêtes.
+claims_cache = TTLCache(maxsize=TOKEN_CACHE_SIZE, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+
 def decode_token(token: str) -> dict[str, Any]:
-    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    claims = claims_cache.get(key)
+    if claims is None:
+        claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        exp = claims.get("exp")
+        if isinstance(exp, int | float):
+            claims_cache.set(key, claims, expires_at=time.monotonic() + exp - time.time())
+    # copie : l'entrée du cache ne doit pas être modifiée par l'appelant
+    return dict(claims)
 
 
 def verify_token(token: str) -> dict[str, Any]:
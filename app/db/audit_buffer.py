@@ -0,0 +1,205 @@
+"""
+Ingestion différée des logs d'audit, avec commit groupé.
+
+Les événements passent par une file bornée en mémoire ; un thread dédié les
+écrit en un INSERT multi-lignes toutes les `flush_ms` millisecondes ou dès
+`batch_size` événements, au premier des deux. File pleine = contre-pression :
+l'appelant attend au plus `put_timeout` puis reçoit un 503.
+
+Un lot refusé est retenté quelques fois (base verrouillée…), puis écrit par
+moitiés pour isoler les lignes fautives : celles-ci partent dans le journal
+`app.db.audit_buffer.dead_letter` (JSON, une ligne par événement) et le
+compteur `dropped`, sans bloquer l'ingestion.
+"""
+
+from datetime import datetime
+import json
+import logging
+import queue
+import threading
+import time
+from typing import Any
+
+from fastapi import HTTPException, status
+from sqlalchemy import Engine, insert
+
+from app.core.config import settings
+from app.db.models import AuditLog
+from app.db.session import engine
+
+logger = logging.getLogger(__name__)
+dead_letter = logging.getLogger(f"{__name__}.dead_letter")
+
+# limite de variables liées par requête SQLite (32766) / colonnes insérées
+_MAX_ROWS_PER_INSERT = 32766 // 6
+
+# essais du lot entier, puis insertions par moitiés (budget borné : base
+# indisponible = lot perdu en quelques secondes, pas un thread bloqué)
+_RETRIES = 3
+_SPLIT_ATTEMPTS = 32
+
+
+class AuditLogBuffer:
+    def __init__(
+        self,
+        engine: Engine,
+        flush_ms: int = 200,
+        batch_size: int = 500,
+        max_queue: int = 10000,
+        put_timeout: float = 0.1,
+    ):
+        self.engine = engine
+        self.flush_interval = flush_ms / 1000
+        self.batch_size = min(batch_size, _MAX_ROWS_PER_INSERT)
+        self.put_timeout = put_timeout
+        self._queue: queue.Queue[dict[str, Any]] = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        # métriques
+        self.batches = 0
+        self.events = 0
+        self.rejected = 0
+        self.errors = 0
+        self.dropped = 0
+        self.flush_seconds_total = 0.0
+        self.flush_seconds_max = 0.0
+        self.last_batch_size = 0
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-log-buffer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Arrête le thread après avoir écrit tout ce qui reste en file."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def submit(self, action: str, table_name: str, record_id: int, **fields: Any) -> None:
+        row = {
+            "action": action,
+            "table_name": table_name,
+            "record_id": record_id,
+            "user_id": fields.get("user_id"),
+            "payload": fields.get("payload"),
+            "created_at": fields.get("created_at") or datetime.now(),
+        }
+        try:
+            self._queue.put(row, timeout=self.put_timeout)
+        except queue.Full:
+            with self._lock:
+                self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Audit log buffer full, retry later",
+                headers={"Retry-After": "1"},
+            ) from None
+
+    def flush(self) -> int:
+        """Vide la file de manière synchrone (utilisé à l'arrêt et en test)."""
+        written = 0
+        while batch := self._drain(block=False):
+            self._write(batch)
+            written += len(batch)
+        return written
+
+    def _drain(self, block: bool) -> list[dict[str, Any]]:
+        batch: list[dict[str, Any]] = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                if block and timeout > 0:
+                    batch.append(self._queue.get(timeout=timeout))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            batch = self._drain(block=True)
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch: list[dict[str, Any]]) -> None:
+        for attempt in range(1, _RETRIES + 1):
+            if self._insert(batch):
+                return
+            if attempt < _RETRIES:
+                time.sleep(self.flush_interval)
+        self._isolate(batch)
+
+    def _isolate(self, batch: list[dict[str, Any]]) -> None:
+        """Écrit le lot par moitiés ; les lignes refusées seules (ou hors budget) sont écartées."""
+        budget = _SPLIT_ATTEMPTS
+        pending = [batch]
+        while pending:
+            rows = pending.pop()
+            if len(rows) == 1 or budget <= 0:
+                self._drop(rows)
+                continue
+            half = len(rows) // 2
+            for part in (rows[half:], rows[:half]):
+                budget -= 1
+                if budget < 0 or not self._insert(part):
+                    pending.append(part)
+
+    def _insert(self, rows: list[dict[str, Any]]) -> bool:
+        start = time.perf_counter()
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(insert(AuditLog).values(rows))
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            logger.exception("audit log flush failed (%d events)", len(rows))
+            return False
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.batches += 1
+            self.events += len(rows)
+            self.last_batch_size = len(rows)
+            self.flush_seconds_total += elapsed
+            self.flush_seconds_max = max(self.flush_seconds_max, elapsed)
+        return True
+
+    def _drop(self, rows: list[dict[str, Any]]) -> None:
+        with self._lock:
+            self.dropped += len(rows)
+        logger.error("dropping %d audit log events", len(rows))
+        for row in rows:
+            dead_letter.error("%s", json.dumps(row, default=str))
+
+    def stats(self) -> dict[str, float | int]:
+        with self._lock:
+            return {
+                "queued": self._queue.qsize(),
+                "batches": self.batches,
+                "events": self.events,
+                "rejected": self.rejected,
+                "errors": self.errors,
+                "dropped": self.dropped,
+                "last_batch_size": self.last_batch_size,
+                "avg_batch_size": self.events / self.batches if self.batches else 0.0,
+                "avg_flush_ms": (
+                    self.flush_seconds_total / self.batches * 1000 if self.batches else 0.0
+                ),
+                "max_flush_ms": self.flush_seconds_max * 1000,
+            }
+
+
+audit_buffer = AuditLogBuffer(
+    engine,
+    flush_ms=settings.AUDIT_BUFFER_FLUSH_MS,
+    batch_size=settings.AUDIT_BUFFER_BATCH_SIZE,
+    max_queue=settings.AUDIT_BUFFER_MAX_QUEUE,
+    put_timeout=settings.AUDIT_BUFFER_PUT_TIMEOUT_MS / 1000,
+)
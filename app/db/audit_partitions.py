@@ -0,0 +1,220 @@
+"""
+Partitions mensuelles des logs d'audit, rétention et archives froides.
+
+`audit_logs` reste la table chaude où tout s'écrit. `rollover` déplace chaque
+mois révolu dans sa propre table `audit_logs_AAAAMM` ; `archive_expired` sort
+les partitions plus vieilles que la rétention dans un fichier SQLite
+compressé (`audit_logs_AAAAMM.db.gz`, lecture seule), toujours interrogeable :
+`open_archive` le décompresse à la demande dans un cache local.
+Le catalogue `audit_log_partitions` dit où vit chaque mois.
+
+    python -m app.db.audit_partitions            # rollover puis archivage
+"""
+
+from datetime import datetime
+import gzip
+import hashlib
+import logging
+import os
+from pathlib import Path
+import shutil
+import tempfile
+import threading
+
+from sqlalchemy import (
+    Column,
+    Connection,
+    Engine,
+    Index,
+    MetaData,
+    Table,
+    create_engine,
+    delete,
+    func,
+    insert,
+    select,
+)
+
+from app.core.config import settings
+from app.db.models import AuditLog, AuditLogPartition
+from app.db.session import engine as default_engine
+
+logger = logging.getLogger(__name__)
+
+_metadata = MetaData()
+_archives: dict[str, Engine] = {}
+_archives_lock = threading.Lock()
+
+# lignes copiées par aller-retour vers le fichier d'archive
+_COPY_BATCH = 5000
+
+
+def month_start(moment: datetime) -> datetime:
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(moment: datetime, months: int) -> datetime:
+    index = moment.year * 12 + moment.month - 1 + months
+    return moment.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(moment: datetime) -> str:
+    return f"{AuditLog.__tablename__}_{moment:%Y%m}"
+
+
+def partition_table(name: str) -> Table:
+    """Même colonnes que audit_logs (sans FK : users peut disparaître), index keyset propre."""
+    if name in _metadata.tables:
+        return _metadata.tables[name]
+    columns = [
+        Column(c.name, c.type, primary_key=c.primary_key, nullable=c.nullable)
+        for c in AuditLog.__table__.columns
+    ]
+    return Table(name, _metadata, *columns, Index(f"ix_{name}_created_at_id", "created_at", "id"))
+
+
+def _refresh_catalog(conn: Connection, name: str, start: datetime) -> None:
+    table = partition_table(name)
+    count, min_id, max_id = conn.execute(
+        select(func.count(), func.min(table.c.id), func.max(table.c.id))
+    ).one()
+    values = {"row_count": count, "min_id": min_id, "max_id": max_id}
+    updated = conn.execute(
+        AuditLogPartition.__table__.update().where(AuditLogPartition.name == name).values(**values)
+    )
+    if not updated.rowcount:
+        conn.execute(
+            insert(AuditLogPartition).values(
+                name=name, period_start=start, period_end=add_months(start, 1), **values
+            )
+        )
+
+
+def rollover(engine: Engine = default_engine, now: datetime | None = None) -> list[str]:
+    """Déplace les mois révolus de la table chaude vers leurs partitions."""
+    current = month_start(now or datetime.now())
+    hot = AuditLog.__table__
+    moved = []
+    with engine.begin() as conn:
+        oldest = conn.execute(
+            select(func.min(hot.c.created_at)).where(hot.c.created_at < current)
+        ).scalar()
+        if oldest is None:
+            return moved
+        archived = set(
+            conn.scalars(
+                select(AuditLogPartition.name).where(AuditLogPartition.archive_path.is_not(None))
+            )
+        )
+        start = month_start(oldest)
+        while start < current:
+            end, name = add_months(start, 1), partition_name(start)
+            in_month = (hot.c.created_at >= start) & (hot.c.created_at < end)
+            if name in archived:
+                # retardataires d'un mois déjà archivé : restent dans la table chaude
+                logger.warning("%s is archived, late rows left in %s", name, hot.name)
+            elif conn.execute(select(hot.c.id).where(in_month).limit(1)).first():
+                table = partition_table(name)
+                table.create(conn, checkfirst=True)
+                columns = [c.name for c in hot.columns]
+                conn.execute(
+                    insert(table).from_select(columns, select(*hot.columns).where(in_month))
+                )
+                conn.execute(delete(hot).where(in_month))
+                _refresh_catalog(conn, name, start)
+                moved.append(name)
+            start = end
+    return moved
+
+
+def _write_archive(engine: Engine, name: str, path: Path) -> None:
+    table = partition_table(name)
+    path.unlink(missing_ok=True)  # reste d'un essai interrompu
+    target = create_engine(f"sqlite:///{path}")
+    try:
+        table.create(target)
+        with engine.connect() as src, target.begin() as dst:
+            result = src.execution_options(yield_per=_COPY_BATCH).execute(select(table))
+            for rows in result.mappings().partitions():
+                dst.execute(insert(table), [dict(r) for r in rows])
+        with target.connect() as dst:
+            dst.exec_driver_sql("VACUUM")
+    finally:
+        target.dispose()
+    with open(path, "rb") as raw, gzip.open(f"{path}.gz", "wb") as packed:
+        shutil.copyfileobj(raw, packed)
+    path.unlink()
+    os.chmod(f"{path}.gz", 0o444)
+
+
+def archive_expired(
+    engine: Engine = default_engine,
+    archive_dir: str | None = None,
+    retention_months: int | None = None,
+    now: datetime | None = None,
+) -> list[str]:
+    """Archive (gzip, lecture seule) les partitions plus vieilles que la rétention."""
+    retention = settings.AUDIT_RETENTION_MONTHS if retention_months is None else retention_months
+    cutoff = add_months(month_start(now or datetime.now()), -retention)
+    directory = Path(archive_dir or settings.AUDIT_ARCHIVE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    with engine.connect() as conn:
+        expired = conn.scalars(
+            select(AuditLogPartition.name).where(
+                AuditLogPartition.archive_path.is_(None),
+                AuditLogPartition.period_end <= cutoff,
+            )
+        ).all()
+    archived = []
+    for name in expired:
+        path = directory / f"{name}.db"
+        # fichier complet sur disque avant de toucher à la base
+        _write_archive(engine, name, path)
+        with engine.begin() as conn:
+            partition_table(name).drop(conn)
+            conn.execute(
+                AuditLogPartition.__table__.update()
+                .where(AuditLogPartition.name == name)
+                .values(archive_path=f"{path}.gz")
+            )
+        archived.append(name)
+    return archived
+
+
+def open_archive(archive_path: str) -> Engine:
+    """Moteur lecture seule sur une archive, décompressée au premier accès."""
+    with _archives_lock:
+        if archive_path in _archives:
+            return _archives[archive_path]
+        cache = Path(tempfile.gettempdir()) / "opshub-audit-archives"
+        cache.mkdir(exist_ok=True)
+        # préfixe du chemin complet : deux répertoires d'archives ne se mélangent pas
+        digest = hashlib.sha1(str(Path(archive_path).resolve()).encode()).hexdigest()[:12]
+        target = cache / f"{digest}-{Path(archive_path).name.removesuffix('.gz')}"
+        if not target.exists():
+            partial = target.with_suffix(".part")
+            with gzip.open(archive_path, "rb") as packed, open(partial, "wb") as raw:
+                shutil.copyfileobj(packed, raw)
+            partial.replace(target)
+        _archives[archive_path] = create_engine(f"sqlite:///file:{target}?mode=ro&uri=true")
+        return _archives[archive_path]
+
+
+def close_archives() -> None:
+    with _archives_lock:
+        for archive in _archives.values():
+            archive.dispose()
+        _archives.clear()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    for name in rollover():
+        logger.info("rolled over %s", name)
+    for name in archive_expired():
+        logger.info("archived %s", name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Journal d'audit automatique alimenté par les événements de session.
+
+Au `after_flush`, chaque Ticket / Project / User créé, modifié ou supprimé
+produit une ligne `AuditLog` insérée dans la même transaction, en un seul
+`executemany`. Le payload ne contient que les colonnes modifiées :
+valeurs initiales à la création, `{"old", "new"}` à la mise à jour, rien à la
+suppression. L'auteur est lu dans `session.info` (posé par `get_current_user`).
+"""
+
+from datetime import date, datetime
+import enum
+from typing import Any
+
+from sqlalchemy import event, insert, inspect
+from sqlalchemy.orm import LoaderCallableStatus, Session
+
+from app.core.config import settings
+from app.db.models import AuditLog, Project, Ticket, User
+
+ACTOR_KEY = "audit_actor_id"
+
+AUDITED = (Ticket, Project, User)
+
+# jamais recopiées en clair dans le journal
+_REDACTED = {"password_hash"}
+
+
+def set_actor(session: Session, user_id: int | None) -> None:
+    session.info[ACTOR_KEY] = user_id
+
+
+def jsonable(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime | date):
+        return value.isoformat()
+    return value
+
+
+def _value(key: str, value: Any) -> Any:
+    return "***" if key in _REDACTED else jsonable(value)
+
+
+def _record_id(obj: Any) -> int:
+    # sans passer par obj.id : après un commit l'instance est expirée et
+    # l'accès relancerait un SELECT à chaque flush
+    state = inspect(obj)
+    return state.key[1][0] if state.key else state.dict["id"]
+
+
+def _created(obj: Any) -> dict[str, Any]:
+    state = inspect(obj)
+    return {
+        attr.key: _value(attr.key, value)
+        for attr in state.mapper.column_attrs
+        if (value := state.dict.get(attr.key)) is not None
+    }
+
+
+def _changed(obj: Any) -> dict[str, Any]:
+    state = inspect(obj)
+    columns = state.mapper.column_attrs
+    diff = {}
+    # committed_state ne contient que les attributs modifiés, avec leur valeur
+    # d'origine (NO_VALUE si elle n'était pas chargée) : pas de calcul d'historique
+    for key, old in state.committed_state.items():
+        if key not in columns:
+            continue
+        old = None if old is LoaderCallableStatus.NO_VALUE else old
+        new = state.dict.get(key)
+        if old != new:
+            diff[key] = {"old": _value(key, old), "new": _value(key, new)}
+    return diff
+
+
+def audit_row(
+    action: str, table_name: str, record_id: int, user_id: int | None, payload: dict | None
+) -> dict[str, Any]:
+    return {
+        "action": action,
+        "table_name": table_name,
+        "record_id": record_id,
+        "user_id": user_id,
+        "payload": payload,
+        "created_at": datetime.now(),
+    }
+
+
+_INSERT = insert(AuditLog)
+
+
+def record(session: Session, rows: list[dict[str, Any]]) -> None:
+    """Insère des lignes d'audit déjà construites (chemins Core sans événements ORM)."""
+    if rows and settings.AUDIT_TRAIL_ENABLED:
+        session.connection().execute(_INSERT, rows)
+
+
+@event.listens_for(Session, "after_flush")
+def _audit_flush(session: Session, flush_context) -> None:
+    if not settings.AUDIT_TRAIL_ENABLED:
+        return
+    actor = session.info.get(ACTOR_KEY)
+    rows = []
+    for obj in session.new:
+        if isinstance(obj, AUDITED):
+            rows.append(
+                audit_row("CREATE", obj.__tablename__, _record_id(obj), actor, _created(obj))
+            )
+    for obj in session.dirty:
+        if isinstance(obj, AUDITED) and (diff := _changed(obj)):
+            rows.append(audit_row("UPDATE", obj.__tablename__, _record_id(obj), actor, diff))
+    for obj in session.deleted:
+        if isinstance(obj, AUDITED):
+            rows.append(audit_row("DELETE", obj.__tablename__, _record_id(obj), actor, None))
+    record(session, rows)
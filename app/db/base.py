@@ -1,5 +1,28 @@
+import re
+
 from sqlalchemy.orm import DeclarativeBase
 
 
 class Base(DeclarativeBase):
     pass
+
+
+# tables créées hors de Base.metadata : index plein texte FTS5 (table virtuelle
+# et ses tables internes, voir app.db.fts), partitions mensuelles des logs
+# d'audit (voir app.db.audit_partitions)
+_UNMANAGED_TABLES = re.compile(r"tickets_fts(_\w+)?|audit_logs_\d{6}")
+
+
+def include_name(name: str | None, type_: str, parent_names: dict) -> bool:
+    """Filtre de l'autogénération Alembic : ignore les tables gérées à part."""
+    return not (type_ == "table" and name and _UNMANAGED_TABLES.fullmatch(name))
+
+
+def sqlite_ddl(statement: str):
+    """Écouteur `after_create` / `before_drop` : DDL propre à SQLite, ignoré ailleurs."""
+
+    def run(target, connection, **kw) -> None:
+        if connection.dialect.name == "sqlite":
+            connection.exec_driver_sql(statement)
+
+    return run
@@ -0,0 +1,397 @@
+"""
+Diffusion des changements tickets / projets : flux SSE par abonné.
+
+La table `changes` (triggers, voir `app.db.changes`) est la source de vérité.
+Par worker, une seule tâche y lit les nouvelles lignes (`id > tête`) toutes
+les `poll_ms` millisecondes (écritures des autres workers), ou aussitôt
+après un commit local qui a touché un ticket ou un projet. Elle range les
+événements, trames SSE déjà encodées, dans un anneau borné en mémoire puis
+réveille tous les abonnés d'un coup.
+
+Un abonné n'a ni file ni tâche à lui, seulement un curseur (dernier id
+envoyé) : réveillé, il lit la suite dans l'anneau ; trop en retard (reprise
+sur un vieux `Last-Event-ID`, client lent), il la relit en base par pages.
+Un client lent ne retient donc que son curseur, et un abonné inactif ne
+coûte qu'une attente sur un `asyncio.Event` partagé ; le battement de cœur
+est cadencé par la tâche de lecture, pas par un timer par abonné. Si les
+événements manquants ont été purgés, l'abonné reçoit un `reset` (état à
+recharger) puis reprend à la tête.
+
+    python -m app.db.change_feed        # purge au-delà de CHANGES_RETENTION_DAYS
+"""
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Collection
+import contextlib
+import contextvars
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import logging
+import weakref
+
+from fastapi.concurrency import run_in_threadpool
+import orjson
+from sqlalchemy import Engine, Row, Text, delete, event, func, select, text, type_coerce
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.db.models import Change, Project, Ticket
+from app.db.session import engine as write_engine, read_engine
+
+logger = logging.getLogger(__name__)
+
+RETRY = b"retry: 3000\n\n"
+PING = b": ping\n\n"
+
+_COLUMNS = (
+    Change.id,
+    Change.entity,
+    Change.entity_id,
+    Change.project_id,
+    Change.op,
+    # JSON brut : recopié tel quel dans la trame, sans décodage
+    type_coerce(Change.data, Text).label("data"),
+    Change.created_at,
+)
+
+# dernier id attribué, même si la purge a vidé la table
+_LAST_SEQ = text("SELECT seq FROM sqlite_sequence WHERE name = 'changes'")
+
+
+@dataclass(frozen=True, slots=True)
+class ChangeEvent:
+    seq: int
+    project_id: int
+    frame: bytes
+
+
+def _event(row: Row) -> ChangeEvent:
+    body = orjson.dumps(
+        {
+            "seq": row.id,
+            "entity": row.entity,
+            "op": row.op,
+            "id": row.entity_id,
+            "project_id": row.project_id,
+            "data": None if row.data is None else orjson.Fragment(row.data),
+            "at": row.created_at.isoformat(),
+        }
+    )
+    name = f"{row.entity}.{row.op}".encode()
+    return ChangeEvent(
+        row.id, row.project_id, b"id: %d\nevent: %s\ndata: %s\n\n" % (row.id, name, body)
+    )
+
+
+def reset_frame(seq: int) -> bytes:
+    """Événements perdus : le client recharge son état et reprend après `seq`."""
+    return b'id: %d\nevent: reset\ndata: {"seq":%d}\n\n' % (seq, seq)
+
+
+class ChangeFeed:
+    def __init__(
+        self,
+        engine: Engine,
+        buffer_size: int = 10000,
+        poll_ms: int = 1000,
+        batch_size: int = 500,
+        heartbeat: float = 15.0,
+        max_subscribers: int = 10000,
+    ):
+        self.engine = engine
+        self.buffer: deque[ChangeEvent] = deque(maxlen=buffer_size)
+        self.poll_interval = poll_ms / 1000
+        self.batch_size = batch_size
+        self.heartbeat = heartbeat
+        self.max_subscribers = max_subscribers
+        # dernier id lu dans la table
+        self.head = 0
+        self.ticks = 0
+        self.closed = False
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._task: asyncio.Task | None = None
+        self._ready = asyncio.Event()
+        self._wake = asyncio.Event()
+        self._published = asyncio.Event()
+        self._notified = False
+        # métriques
+        self.subscribers = 0
+        self.polls = 0
+        self.events = 0
+        self.catchups = 0
+
+    @property
+    def full(self) -> bool:
+        return self.subscribers >= self.max_subscribers
+
+    def start(self) -> None:
+        """Lance la tâche de lecture dans la boucle courante (idempotent)."""
+        # pas d'await : test et démarrage atomiques dans la boucle
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._task is not None and not self._task.done():
+            return
+        if self._loop is not loop or self._ready.is_set():
+            # sinon garder l'événement : des abonnés y attendent déjà le premier `head`
+            self._ready = asyncio.Event()
+        self._loop = loop
+        self.closed = False
+        self.buffer.clear()
+        self._wake = asyncio.Event()
+        self._published = asyncio.Event()
+        self._notified = False
+        # contexte vierge : ses lectures ne sont pas comptées dans la requête
+        # (profileur SQL, métriques) de l'abonné qui l'a démarrée
+        self._task = loop.create_task(self._run(), context=contextvars.Context())
+        _feeds.add(self)
+
+    async def stop(self) -> None:
+        """Termine les flux en cours (au prochain réveil) et arrête la lecture."""
+        task, loop = self._task, self._loop
+        self._task = self._loop = None
+        _feeds.discard(self)
+        if task is None or loop is not asyncio.get_running_loop():
+            return
+        self.closed = True
+        # libère aussi les abonnés encore en attente du premier `head`
+        self._ready.set()
+        self._publish()
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+    def notify(self) -> None:
+        """Appelable depuis n'importe quel thread : des changements viennent d'être commités."""
+        loop = self._loop
+        if loop is None or self._notified:
+            return
+        self._notified = True
+        with contextlib.suppress(RuntimeError):  # boucle fermée
+            loop.call_soon_threadsafe(self._wake.set)
+
+    async def stream(
+        self, last_id: int | None = None, projects: Collection[int] | None = None
+    ) -> AsyncIterator[bytes]:
+        """Trames SSE après `last_id` (à défaut : à partir de maintenant), sans fin."""
+        self.start()
+        await self._ready.wait()
+        self.subscribers += 1
+        try:
+            yield RETRY
+            cursor = self.head if last_id is None else last_id
+            if cursor > self.head:
+                # id plus récent que la dernière lecture (écrit par un autre worker ?)
+                if cursor > await run_in_threadpool(self._last_seq):
+                    # séquence inconnue (base recréée) : rien de sûr à rejouer
+                    cursor = self.head
+                    yield reset_frame(cursor)
+                else:
+                    # relecture immédiate plutôt qu'au prochain tour
+                    self._wake.set()
+            seen = self.ticks
+            while not self.closed:
+                # pris avant la lecture : une publication pendant celle-ci n'est pas perdue
+                published = self._published
+                frames, cursor = await self._after(cursor, projects)
+                if frames:
+                    yield b"".join(frames)
+                elif self.ticks != seen:
+                    yield PING
+                seen = self.ticks
+                if cursor < self.head:
+                    continue
+                await published.wait()
+        finally:
+            self.subscribers -= 1
+
+    async def _after(
+        self, cursor: int, projects: Collection[int] | None
+    ) -> tuple[list[bytes], int]:
+        """Au plus `batch_size` événements après `cursor` : (trames filtrées, nouveau curseur)."""
+        head = self.head
+        if cursor >= head:
+            return [], cursor
+        if self.buffer and cursor >= self.buffer[0].seq - 1:
+            # abonné à jour : les nouveaux événements sont au bout de l'anneau
+            fresh = []
+            for change in reversed(self.buffer):
+                if change.seq <= cursor:
+                    break
+                fresh.append(change)
+            fresh = fresh[::-1][: self.batch_size]
+        else:
+            self.catchups += 1
+            fresh, oldest = await run_in_threadpool(self._read, cursor, head, projects)
+            if oldest is None or cursor < oldest - 1:
+                return [reset_frame(head)], head
+            if len(fresh) < self.batch_size:
+                # tout ce qui manquait jusqu'à `head` (filtre compris) est lu
+                return [change.frame for change in fresh], head
+        if not fresh:
+            return [], head
+        frames = [c.frame for c in fresh if projects is None or c.project_id in projects]
+        return frames, fresh[-1].seq
+
+    def _read(
+        self, after: int, until: int, projects: Collection[int] | None
+    ) -> tuple[list[ChangeEvent], int | None]:
+        stmt = select(*_COLUMNS).where(Change.id > after, Change.id <= until)
+        if projects is not None:
+            stmt = stmt.where(Change.project_id.in_(projects))
+        stmt = stmt.order_by(Change.id).limit(self.batch_size)
+        with self.engine.connect() as conn:
+            oldest = conn.scalar(select(func.min(Change.id)))
+            rows = conn.execute(stmt).all()
+        return [_event(row) for row in rows], oldest
+
+    def _poll(self, after: int) -> list[ChangeEvent]:
+        fresh: list[ChangeEvent] = []
+        with self.engine.connect() as conn:
+            while True:
+                stmt = select(*_COLUMNS).where(Change.id > after)
+                rows = conn.execute(stmt.order_by(Change.id).limit(self.batch_size)).all()
+                fresh += map(_event, rows)
+                if len(rows) < self.batch_size:
+                    return fresh
+                after = rows[-1].id
+
+    def _last_seq(self) -> int:
+        with self.engine.connect() as conn:
+            return conn.scalar(_LAST_SEQ) or 0
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                self.head = await run_in_threadpool(self._last_seq)
+                break
+            except Exception:
+                # base verrouillée ou indisponible : les abonnés attendent la prochaine tentative
+                logger.exception("change feed start failed")
+                await asyncio.sleep(self.poll_interval)
+        self._ready.set()
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time() + self.heartbeat
+        while True:
+            timeout = max(0.0, min(self.poll_interval, next_tick - loop.time()))
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            # remis à zéro avant la lecture : un commit pendant celle-ci relance un tour
+            self._wake.clear()
+            self._notified = False
+            try:
+                fresh = await run_in_threadpool(self._poll, self.head)
+            except Exception:
+                logger.exception("change feed poll failed")
+                fresh = []
+            self.polls += 1
+            if fresh:
+                self.buffer.extend(fresh)
+                self.head = fresh[-1].seq
+                self.events += len(fresh)
+            if loop.time() >= next_tick:
+                self.ticks += 1
+                next_tick = loop.time() + self.heartbeat
+            elif not fresh:
+                continue
+            self._publish()
+
+    def _publish(self) -> None:
+        published, self._published = self._published, asyncio.Event()
+        published.set()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "subscribers": self.subscribers,
+            "head": self.head,
+            "buffered": len(self.buffer),
+            "polls": self.polls,
+            "events": self.events,
+            "catchups": self.catchups,
+        }
+
+
+# flux démarrés : réveillés par les commits locaux, lus par /metrics
+_feeds: weakref.WeakSet[ChangeFeed] = weakref.WeakSet()
+
+_PENDING_KEY = "change_feed_pending"
+
+
+def _mark(mapper, connection, target) -> None:
+    session = Session.object_session(target)
+    if session is not None:
+        session.info[_PENDING_KEY] = True
+
+
+for _model in (Ticket, Project):
+    for _name in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _name, _mark)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_bulk(state: ORMExecuteState) -> None:
+    # instructions Core en masse (POST /api/v1/tickets:bulk) : pas d'événement par ligne
+    if state.is_select or state.bind_mapper is None:
+        return
+    if state.bind_mapper.class_ in (Ticket, Project):
+        state.session.info[_PENDING_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_after_commit(session: Session) -> None:
+    if session.info.pop(_PENDING_KEY, False):
+        for feed in list(_feeds):
+            feed.notify()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending(session: Session, previous_transaction) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+registry.gauge("opshub_changes_subscribers", "Open change streams (SSE)")
+registry.gauge("opshub_changes_head", "Last change sequence number read")
+registry.gauge("opshub_changes_buffered", "Change events held in the in-memory ring")
+registry.gauge("opshub_changes_catchups", "Subscriber reads served from the changes table")
+
+
+@registry.collector
+def _feed_gauges():
+    for feed in list(_feeds):
+        stats = feed.stats()
+        yield "opshub_changes_subscribers", (), stats["subscribers"]
+        yield "opshub_changes_head", (), stats["head"]
+        yield "opshub_changes_buffered", (), stats["buffered"]
+        yield "opshub_changes_catchups", (), stats["catchups"]
+
+
+def prune(engine: Engine = write_engine, days: int = settings.CHANGES_RETENTION_DAYS) -> int:
+    """Supprime les changements de plus de `days` jours ; rend le nombre de lignes."""
+    cutoff = datetime.now() - timedelta(days=days)
+    with engine.begin() as conn:
+        # ids et dates croissent ensemble : le premier id à garder, trouvé en ne
+        # parcourant que les lignes expirées (pas d'index sur created_at)
+        keep = conn.scalar(
+            select(Change.id).where(Change.created_at >= cutoff).order_by(Change.id).limit(1)
+        )
+        stmt = delete(Change) if keep is None else delete(Change).where(Change.id < keep)
+        return conn.execute(stmt).rowcount
+
+
+change_feed = ChangeFeed(
+    read_engine,
+    buffer_size=settings.CHANGES_BUFFER_SIZE,
+    poll_ms=settings.CHANGES_POLL_MS,
+    batch_size=settings.CHANGES_BATCH_SIZE,
+    heartbeat=settings.CHANGES_HEARTBEAT_SECONDS,
+    max_subscribers=settings.CHANGES_MAX_SUBSCRIBERS,
+)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    logger.info("pruned %d changes", prune())
+
+
+if __name__ == "__main__":
+    main()
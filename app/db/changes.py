@@ -0,0 +1,91 @@
+"""
+Journal des changements tickets / projets (table `changes`), source du flux SSE.
+
+Des triggers SQLite y écrivent une ligne par INSERT / UPDATE / DELETE, dans la
+transaction de l'écriture : ORM, instructions Core en masse et autres workers
+compris. L'id AUTOINCREMENT sert de numéro de séquence (SQLite sérialise les
+écritures : l'ordre des ids est celui des commits). `data` est l'état complet
+de la ligne après création / modification, NULL à la suppression.
+Comme pour `fts`, `create_all` installe les triggers avec chaque table ; la
+migration Alembic en garde sa propre copie.
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from sqlalchemy import Connection, Table, event
+
+from app.db.base import sqlite_ddl
+
+CHANGES = "changes"
+
+_NOW = "strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')"
+
+
+def _iso(column: str) -> str:
+    # même format que datetime.isoformat() côté API
+    return f"replace({column}, ' ', 'T')"
+
+
+_TICKET_JSON = f"""json_object(
+    'id', new.id, 'project_id', new.project_id, 'title', new.title,
+    'description', new.description, 'priority', new.priority, 'status', new.status,
+    'assignee_id', new.assignee_id,
+    'created_at', {_iso("new.created_at")}, 'updated_at', {_iso("new.updated_at")}
+)"""
+
+_PROJECT_JSON = f"""json_object(
+    'id', new.id, 'name', new.name, 'description', new.description,
+    'status', new.status, 'owner_id', new.owner_id,
+    'created_at', {_iso("new.created_at")}, 'updated_at', {_iso("new.updated_at")}
+)"""
+
+
+# suffixe du trigger, instruction, op publiée, ligne lue
+_OPS = (
+    ("ai", "INSERT", "create", "new"),
+    ("au", "UPDATE", "update", "new"),
+    ("ad", "DELETE", "delete", "old"),
+)
+
+
+def _triggers(table: str, entity: str, project_id: str, data: str) -> dict[str, str]:
+    """DDL des trois triggers de `table` ; `project_id` est une expression en `{row}`."""
+    ddl = {}
+    for suffix, dml, op, row in _OPS:
+        name = f"{CHANGES}_{table}_{suffix}"
+        values = data if row == "new" else "NULL"
+        ddl[name] = f"""
+    CREATE TRIGGER {name} AFTER {dml} ON {table} BEGIN
+        INSERT INTO {CHANGES}(entity, entity_id, project_id, op, data, created_at)
+        VALUES ('{entity}', {row}.id, {project_id.format(row=row)}, '{op}', {values}, {_NOW});
+    END
+    """
+    return ddl
+
+
+TRIGGERS: dict[str, dict[str, str]] = {
+    "tickets": _triggers("tickets", "ticket", "{row}.project_id", _TICKET_JSON),
+    "projects": _triggers("projects", "project", "{row}.id", _PROJECT_JSON),
+}
+
+
+def install(table: Table) -> None:
+    # supprimés avec leur table : pas de before_drop
+    for ddl in TRIGGERS[table.name].values():
+        event.listen(table, "after_create", sqlite_ddl(ddl))
+
+
+@contextmanager
+def suspended(conn: Connection, table: str) -> Iterator[None]:
+    """Retire les triggers de `table` le temps d'un chargement en masse (sans événements)."""
+    found = conn.exec_driver_sql(
+        "SELECT name, sql FROM sqlite_master"
+        " WHERE type = 'trigger' AND tbl_name = ? AND name LIKE ?",
+        (table, f"{CHANGES}_%"),
+    ).all()
+    for name, _ in found:
+        conn.exec_driver_sql(f"DROP TRIGGER {name}")
+    yield
+    for _, sql in found:
+        conn.exec_driver_sql(sql)
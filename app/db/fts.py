@@ -0,0 +1,119 @@
+"""
+Index plein texte FTS5 des tickets (title, description).
+
+Table FTS5 à contenu externe : elle n'indexe que les tokens et relit le texte
+dans `tickets` (rowid = tickets.id). Des triggers la tiennent à jour à chaque
+INSERT / UPDATE / DELETE, y compris pour les instructions Core en masse.
+`create_all` l'installe avec la table tickets (événement `after_create`) ;
+la migration Alembic en garde sa propre copie.
+"""
+
+import html
+
+from sqlalchemy import (
+    Float,
+    String,
+    Table,
+    TypeDecorator,
+    column,
+    event,
+    func,
+    literal_column,
+    table,
+)
+from sqlalchemy.sql import ColumnElement
+
+from app.db.base import sqlite_ddl
+
+TICKETS_FTS = "tickets_fts"
+
+# unicode61 + remove_diacritics : « eleve » trouve « élève »
+TICKETS_FTS_TABLE_DDL = f"""
+    CREATE VIRTUAL TABLE {TICKETS_FTS} USING fts5(
+        title, description,
+        content='tickets', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """
+
+# retiré par le chargement en masse (app.db.seed), recréé après la reconstruction
+TICKETS_FTS_INSERT_TRIGGER = f"{TICKETS_FTS}_ai"
+
+TICKETS_FTS_TRIGGERS: dict[str, str] = {
+    TICKETS_FTS_INSERT_TRIGGER: f"""
+    CREATE TRIGGER {TICKETS_FTS_INSERT_TRIGGER} AFTER INSERT ON tickets BEGIN
+        INSERT INTO {TICKETS_FTS}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    f"{TICKETS_FTS}_ad": f"""
+    CREATE TRIGGER {TICKETS_FTS}_ad AFTER DELETE ON tickets BEGIN
+        INSERT INTO {TICKETS_FTS}({TICKETS_FTS}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    f"{TICKETS_FTS}_au": f"""
+    CREATE TRIGGER {TICKETS_FTS}_au AFTER UPDATE OF title, description ON tickets BEGIN
+        INSERT INTO {TICKETS_FTS}({TICKETS_FTS}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {TICKETS_FTS}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+}
+
+# reconstruit l'index depuis tickets (backfill)
+TICKETS_FTS_REBUILD = f"INSERT INTO {TICKETS_FTS}({TICKETS_FTS}) VALUES ('rebuild')"
+
+
+def install(tickets: Table) -> None:
+    for ddl in (TICKETS_FTS_TABLE_DDL, *TICKETS_FTS_TRIGGERS.values()):
+        event.listen(tickets, "after_create", sqlite_ddl(ddl))
+    event.listen(tickets, "before_drop", sqlite_ddl(f"DROP TABLE IF EXISTS {TICKETS_FTS}"))
+
+
+def fts_query(text: str) -> str | None:
+    """
+    Requête utilisateur -> expression MATCH sûre : chaque mot devient une chaîne
+    FTS5 (les opérateurs et la ponctuation ne sont plus interprétés), tous les
+    mots sont requis ; un `*` final garde la recherche par préfixe.
+    """
+    terms = []
+    for word in text.split():
+        prefix = word.endswith("*")
+        word = word.rstrip("*").replace('"', '""')
+        if word:
+            terms.append(f'"{word}"' + ("*" if prefix else ""))
+    return " ".join(terms) or None
+
+
+tickets_fts = table(TICKETS_FTS, column("rowid"))
+_fts = literal_column(TICKETS_FTS)
+
+
+def match(expression: str) -> ColumnElement[bool]:
+    return _fts.op("MATCH")(expression)
+
+
+# BM25 : plus petit = plus pertinent ; un mot du titre pèse 10 fois plus
+rank = func.bm25(_fts, 10.0, 1.0, type_=Float)
+
+# bornes des termes trouvés dans l'extrait : caractères de contrôle (STX / ETX),
+# remplacés par <mark> une fois le texte des tickets échappé
+_MARK_START, _MARK_END = "\x02", "\x03"
+
+
+class Highlight(TypeDecorator):
+    """Extrait FTS5 -> HTML sûr : texte échappé, seuls les <mark> sont du balisage."""
+
+    impl = String
+    cache_ok = True
+
+    def process_result_value(self, value: str | None, dialect) -> str | None:
+        if value is None:
+            return None
+        return html.escape(value).replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+
+
+# extrait de la meilleure colonne, 12 tokens autour des termes trouvés
+snippet = func.snippet(_fts, -1, _MARK_START, _MARK_END, "…", 12, type_=Highlight)
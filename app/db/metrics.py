@@ -0,0 +1,116 @@
+"""
+Instrumentation SQLAlchemy : requêtes (nombre, durée) et pools de connexions.
+
+Les événements `before/after_cursor_execute` sont posés sur la classe Engine
+(tous les moteurs, async compris via leur moteur sync). La durée de chaque
+requête est aussi ajoutée au compteur de la requête HTTP en cours
+(`request_db`, contextvar copiée dans le threadpool). L'attente d'une
+connexion se mesure dans `_do_get`, d'où les sous-classes de pool que
+`create_db_engine` utilise ; leur nom (`pool_logging_name`) sert de label.
+"""
+
+from contextvars import ContextVar
+import time
+from typing import Any
+import weakref
+
+from sqlalchemy import Engine, event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.metrics import LATENCY_BUCKETS, registry
+
+
+class RequestDB:
+    """Requêtes SQL d'une requête HTTP (mutable : partagé avec le threadpool)."""
+
+    __slots__ = ("queries", "seconds", "statements")
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.seconds = 0.0
+        # (SQL, durée) de chaque requête, seulement si le profileur est actif
+        self.statements: list[tuple[str, float]] | None = None
+
+
+request_db: ContextVar[RequestDB | None] = ContextVar("request_db", default=None)
+
+registry.counter("opshub_db_queries_total", "SQL statements executed")
+registry.histogram(
+    "opshub_db_query_duration_seconds", "SQL statement execution time", LATENCY_BUCKETS
+)
+registry.counter("opshub_db_pool_checkouts_total", "Connections checked out of the pool")
+registry.histogram(
+    "opshub_db_pool_wait_seconds", "Time spent waiting for a pooled connection", LATENCY_BUCKETS
+)
+
+_pools: "weakref.WeakSet[QueuePool]" = weakref.WeakSet()
+
+
+def _name(pool: Any) -> str:
+    return pool._orig_logging_name or "default"
+
+
+class _TimedPool:
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._labels = (("pool", _name(self)),)
+        _pools.add(self)
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            registry.inc("opshub_db_pool_checkouts_total", self._labels)
+            registry.observe(
+                "opshub_db_pool_wait_seconds", self._labels, time.perf_counter() - start
+            )
+
+
+class TimedQueuePool(_TimedPool, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedPool, AsyncAdaptedQueuePool):
+    pass
+
+
+registry.gauge("opshub_db_pool_size", "Configured pool size")
+registry.gauge("opshub_db_pool_checked_out", "Connections currently in use")
+registry.gauge("opshub_db_pool_overflow", "Overflow connections (max_overflow)")
+
+
+@registry.collector
+def _pool_gauges():
+    for pool in list(_pools):
+        labels = (("pool", _name(pool)),)
+        yield "opshub_db_pool_size", labels, pool.size()
+        yield "opshub_db_pool_checked_out", labels, pool.checkedout()
+        # négatif tant que le pool n'a pas ouvert pool_size connexions
+        yield "opshub_db_pool_overflow", labels, pool.overflow()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    labels = (("engine", _name(conn.engine.pool)),)
+    registry.inc("opshub_db_queries_total", labels)
+    registry.observe("opshub_db_query_duration_seconds", labels, elapsed)
+    current = request_db.get()
+    if current is not None:
+        current.queries += 1
+        current.seconds += elapsed
+        if current.statements is not None:
+            current.statements.append((statement, elapsed))
+
+
+@event.listens_for(Engine, "handle_error")
+def _failed(context) -> None:
+    starts = context.connection.info.get("query_start") if context.connection else None
+    if starts:
+        starts.pop()
@@ -1,8 +1,9 @@
 from datetime import datetime
 
-from sqlalchemy import JSON, Boolean, Enum, ForeignKey, Integer, String, Text
+from sqlalchemy import JSON, Boolean, Enum, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.db import changes, fts
 from app.db.base import Base
 from app.db.enums import ProjectStatus, TicketPriority, TicketStatus, UserRole
 
@@ -37,6 +38,22 @@ class Project(Base):
 
 class Ticket(Base):
     __tablename__ = "tickets"
+    # index alignés sur les filtres / tris de GET /api/v1/tickets
+    __table_args__ = (
+        # couvrant : sert aussi le GROUP BY de /projects/summary sans lire la table
+        Index(
+            "ix_tickets_project_status_priority",
+            "project_id",
+            "status",
+            "priority",
+            "assignee_id",
+            "created_at",
+        ),
+        Index("ix_tickets_assignee_status", "assignee_id", "status"),
+        Index("ix_tickets_created_at_id", "created_at", "id"),
+        Index("ix_tickets_updated_at_id", "updated_at", "id"),
+    )
+
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"))
     title: Mapped[str] = mapped_column(String(255))
@@ -53,8 +70,22 @@ class Ticket(Base):
     assignee: Mapped["User"] = relationship(back_populates="tickets_assigned")
 
 
+# index plein texte tickets_fts + triggers, créés avec la table
+fts.install(Ticket.__table__)
+# triggers du journal des changements (flux SSE)
+changes.install(Project.__table__)
+changes.install(Ticket.__table__)
+
+
 class AuditLog(Base):
     __tablename__ = "audit_logs"
+    # clé de la pagination keyset (created_at DESC, id DESC) ; AUTOINCREMENT :
+    # les ids ne sont jamais réutilisés après un transfert vers une partition
+    __table_args__ = (
+        Index("ix_audit_logs_created_at_id", "created_at", "id"),
+        {"sqlite_autoincrement": True},
+    )
+
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     action: Mapped[str] = mapped_column(String(255))
     table_name: Mapped[str] = mapped_column(String(255))
@@ -62,3 +93,38 @@ class AuditLog(Base):
     user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id"))
     payload: Mapped[dict | None] = mapped_column(JSON)
     created_at: Mapped[datetime] = mapped_column(default=datetime.now)
+
+
+class AuditLogPartition(Base):
+    """Catalogue des partitions mensuelles de audit_logs (table ou archive)."""
+
+    __tablename__ = "audit_log_partitions"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    period_start: Mapped[datetime] = mapped_column(index=True)
+    period_end: Mapped[datetime] = mapped_column()
+    row_count: Mapped[int] = mapped_column(Integer, default=0)
+    min_id: Mapped[int | None] = mapped_column(Integer)
+    max_id: Mapped[int | None] = mapped_column(Integer)
+    # renseigné une fois la partition sortie de la base (fichier .db.gz)
+    archive_path: Mapped[str | None] = mapped_column(String(1024))
+
+
+class Change(Base):
+    """Changement d'un ticket ou d'un projet, écrit par trigger (voir app.db.changes)."""
+
+    __tablename__ = changes.CHANGES
+    # id = numéro de séquence du flux ; AUTOINCREMENT : jamais réattribué après
+    # une purge, un Last-Event-ID ne désigne jamais un autre événement
+    __table_args__ = (
+        Index("ix_changes_project_id_id", "project_id", "id"),
+        {"sqlite_autoincrement": True},
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    entity: Mapped[str] = mapped_column(String(16))
+    entity_id: Mapped[int] = mapped_column(Integer)
+    project_id: Mapped[int] = mapped_column(Integer)
+    op: Mapped[str] = mapped_column(String(8))
+    data: Mapped[dict | None] = mapped_column(JSON)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.now)
@@ -0,0 +1,68 @@
+"""
+Profil SQL d'une requête HTTP : journal des requêtes lentes et détection N+1.
+
+Les requêtes sont relevées par les événements `after_cursor_execute` de
+`app.db.metrics` dans le `RequestDB` de la requête en cours ; rien à changer
+dans les handlers ni dans `get_db`. Un N+1 est la même requête normalisée
+(paramètres et listes `IN` repliés) exécutée plus de `DB_N_PLUS_ONE_THRESHOLD`
+fois par la même requête HTTP.
+"""
+
+from collections import Counter
+import logging
+import re
+from typing import Any
+
+import orjson
+
+from app.core.config import settings
+from app.db.metrics import RequestDB
+
+logger = logging.getLogger(__name__)
+
+_SPACES = re.compile(r"\s+")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+# IN (?, ?, ?) -> IN (?) : la taille de la liste ne change pas la requête
+_PARAM_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+
+
+def normalize(statement: str) -> str:
+    statement = _LITERALS.sub("?", _SPACES.sub(" ", statement).strip())
+    return _PARAM_LISTS.sub("(?)", statement)
+
+
+def repeated(db: RequestDB, threshold: int) -> list[tuple[str, int]]:
+    """Requêtes normalisées exécutées plus de `threshold` fois (N+1 probables)."""
+    counts = Counter(normalize(statement) for statement, _ in db.statements or ())
+    return [(statement, n) for statement, n in counts.most_common() if n > threshold]
+
+
+def report(method: str, path: str, db: RequestDB) -> dict[str, Any] | None:
+    """
+    Entrée du journal si la requête a une requête SQL lente ou un N+1, sinon None.
+    """
+    slow_seconds = settings.DB_SLOW_QUERY_MS / 1000
+    slow = [
+        {"sql": statement, "ms": round(seconds * 1000, 3)}
+        for statement, seconds in db.statements or ()
+        if seconds >= slow_seconds
+    ]
+    n_plus_one = [
+        {"sql": statement, "count": n}
+        for statement, n in repeated(db, settings.DB_N_PLUS_ONE_THRESHOLD)
+    ]
+    if not slow and not n_plus_one:
+        return None
+    return {
+        "method": method,
+        "path": path,
+        "queries": db.queries,
+        "db_ms": round(db.seconds * 1000, 3),
+        "slow": slow,
+        "n_plus_one": n_plus_one,
+    }
+
+
+def log(entry: dict[str, Any]) -> None:
+    """Une ligne JSON par requête HTTP, aussi disponible dans `record.db_profile`."""
+    logger.warning(orjson.dumps(entry).decode(), extra={"db_profile": entry})
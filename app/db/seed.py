@@ -0,0 +1,345 @@
+"""
+Données synthétiques en masse : utilisateurs, projets, tickets, logs d'audit.
+
+    python -m app.db.seed --tickets 1000000 --audit-logs 10000000 --seed 42
+
+Distributions réalistes plutôt qu'uniformes : charge des assignés et taille
+des projets en loi de Zipf, activité croissante dans le temps, statut qui
+dépend de l'âge du ticket (les vieux tickets sont surtout `done`). Pour une
+même graine et les mêmes tailles, la base produite est identique (dates
+comprises : elles partent de `--end`, pas de l'heure courante).
+
+Chargement : `executemany` Core par lots de `CHUNK` lignes, une transaction
+par table, pragmas de chargement (`journal_mode=OFF`, `synchronous=OFF`),
+index secondaires et trigger FTS retirés pendant l'insertion puis recréés
+(l'index plein texte est reconstruit en une passe). Les triggers du journal
+`changes` sont retirés aussi : un chargement n'est pas un flux d'événements.
+À réserver à une base neuve ou jetable : sans journal, une interruption peut
+la corrompre.
+"""
+
+import argparse
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from itertools import accumulate
+import logging
+import math
+import random
+import time
+from typing import Any
+
+from sqlalchemy import Connection, Engine, Table, func, insert, select
+
+from app.core.config import settings
+from app.core.security import hash_password
+from app.db import changes, fts
+from app.db.base import Base
+from app.db.enums import ProjectStatus, TicketPriority, TicketStatus, UserRole
+from app.db.models import AuditLog, Project, Ticket, User
+from app.db.session import create_db_engine
+
+logger = logging.getLogger(__name__)
+
+PASSWORD = "seed-password"
+CHUNK = 20_000
+END = datetime(2025, 1, 1)
+
+BULK_PRAGMAS: dict[str, str | int] = {
+    "journal_mode": "OFF",
+    "synchronous": "OFF",
+    "cache_size": -512 * 1024,
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,
+}
+
+ROLES = ((UserRole.admin, 2), (UserRole.manager, 8), (UserRole.agent, 60), (UserRole.viewer, 30))
+PRIORITIES = ((TicketPriority.low, 30), (TicketPriority.med, 50), (TicketPriority.high, 20))
+AUDIT_ACTIONS = (("update", 70), ("create", 20), ("delete", 10))
+AUDIT_TABLES = (("tickets", 85), ("projects", 10), ("users", 5))
+
+VERBS = ("Fix", "Investigate", "Add", "Remove", "Update", "Refactor", "Document", "Review")
+SUBJECTS = (
+    "login timeout",
+    "export",
+    "pagination",
+    "search results",
+    "email notification",
+    "dashboard",
+    "permissions",
+    "billing report",
+    "audit trail",
+    "API rate limit",
+)
+AREAS = ("web", "mobile", "backend", "billing", "onboarding", "admin", "reporting")
+TITLES = [f"{verb} {subject} in {area}" for verb in VERBS for subject in SUBJECTS for area in AREAS]
+DESCRIPTIONS = [f"Reported by {area} team" for area in AREAS]
+
+
+@dataclass(frozen=True)
+class Dataset:
+    users: int = 100
+    projects: int = 20
+    tickets: int = 10_000
+    audit_logs: int = 100_000
+    seed: int = 42
+    days: int = 730
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+def email(i: int) -> str:
+    """E-mail du i-ème utilisateur généré (0 = premier, un admin)."""
+    return f"user{i}@example.com"
+
+
+def _zipf(n: int, s: float) -> list[float]:
+    """Poids cumulés de rang 1..n en 1/rang^s (pour `random.choices`)."""
+    return list(accumulate(1 / rank**s for rank in range(1, n + 1)))
+
+
+def _weighted[T](pairs: tuple[tuple[T, int], ...]) -> tuple[list[T], list[int]]:
+    return [value for value, _ in pairs], list(accumulate(weight for _, weight in pairs))
+
+
+class _Generator:
+    def __init__(self, dataset: Dataset, end: datetime):
+        self.dataset = dataset
+        self.end = end
+        self.rng = random.Random(dataset.seed)
+        self.span = timedelta(days=dataset.days).total_seconds()
+        # rang Zipf -> id : le plus chargé n'est pas forcément l'id 1
+        self.assignees = self.rng.sample(range(1, dataset.users + 1), dataset.users)
+        self.assignee_weights = _zipf(dataset.users, 1.1)
+        self.project_ids = self.rng.sample(range(1, dataset.projects + 1), dataset.projects)
+        self.project_weights = _zipf(dataset.projects, 0.8)
+
+    def timestamps(self, k: int, low: float = 0.0, high: float = 1.0) -> list[datetime]:
+        """
+        Densité croissante vers `end` (activité en hausse, linéaire) : quantiles
+        `low`..`high` de la période, pour découper un flux trié en lots.
+        """
+        rng, width = self.rng.random, high - low
+        return [
+            self.end - timedelta(seconds=self.span * (1 - math.sqrt(low + width * rng())))
+            for _ in range(k)
+        ]
+
+    def users(self) -> Iterator[dict[str, Any]]:
+        roles, cum = _weighted(ROLES)
+        # même hash pour tous (PBKDF2 coûteux), sel dérivé de la graine
+        password_hash = hash_password(PASSWORD, salt=f"{self.dataset.seed:032x}")
+        start = self.end - timedelta(seconds=self.span)
+        for i in range(self.dataset.users):
+            role = UserRole.admin if i == 0 else self.rng.choices(roles, cum_weights=cum)[0]
+            yield {
+                "email": email(i),
+                "full_name": f"User {i}",
+                "role": role,
+                "password_hash": password_hash,
+                "is_active": self.rng.random() > 0.05,
+                "created_at": start,
+            }
+
+    def projects(self) -> Iterator[dict[str, Any]]:
+        start = self.end - timedelta(seconds=self.span)
+        for i in range(self.dataset.projects):
+            yield {
+                "name": f"{self.rng.choice(AREAS)} project {i}",
+                "description": None,
+                "status": (
+                    ProjectStatus.archived if self.rng.random() < 0.1 else ProjectStatus.active
+                ),
+                "owner_id": self.rng.randint(1, self.dataset.users),
+                "created_at": start,
+                "updated_at": start,
+            }
+
+    def tickets(self) -> Iterator[list[dict[str, Any]]]:
+        rng = self.rng
+        priorities, priority_cum = _weighted(PRIORITIES)
+        remaining = self.dataset.tickets
+        while remaining:
+            k = min(CHUNK, remaining)
+            remaining -= k
+            created = self.timestamps(k)
+            projects = rng.choices(self.project_ids, cum_weights=self.project_weights, k=k)
+            assignees = rng.choices(self.assignees, cum_weights=self.assignee_weights, k=k)
+            chosen = rng.choices(priorities, cum_weights=priority_cum, k=k)
+            titles = rng.choices(TITLES, k=k)
+            descriptions = rng.choices(DESCRIPTIONS, k=k)
+            rows = []
+            for i in range(k):
+                age_days = (self.end - created[i]).total_seconds() / 86400
+                # proportion de `done` qui tend vers 85 % avec l'âge
+                done = 0.85 * (1 - math.exp(-age_days / 30))
+                roll = rng.random()
+                if roll < done:
+                    status = TicketStatus.done
+                elif roll < done + (1 - done) * 0.35:
+                    status = TicketStatus.in_progress
+                else:
+                    status = TicketStatus.open
+                updated = min(self.end, created[i] + timedelta(days=rng.expovariate(1 / 5)))
+                rows.append(
+                    {
+                        "project_id": projects[i],
+                        "title": titles[i],
+                        "description": descriptions[i],
+                        "priority": chosen[i],
+                        "status": status,
+                        # 10 % non assignés
+                        "assignee_id": assignees[i] if rng.random() >= 0.1 else None,
+                        "created_at": created[i],
+                        "updated_at": updated,
+                    }
+                )
+            yield rows
+
+    def audit_logs(self) -> Iterator[list[dict[str, Any]]]:
+        rng = self.rng
+        actions, action_cum = _weighted(AUDIT_ACTIONS)
+        tables, table_cum = _weighted(AUDIT_TABLES)
+        statuses = [status.value for status in TicketStatus]
+        sizes = {
+            "tickets": max(self.dataset.tickets, 1),
+            "projects": max(self.dataset.projects, 1),
+            "users": self.dataset.users,
+        }
+        total = remaining = self.dataset.audit_logs
+        while remaining:
+            k = min(CHUNK, remaining)
+            done = total - remaining
+            remaining -= k
+            # journal en ordre chronologique : ids croissants avec le temps
+            created = sorted(self.timestamps(k, done / total, (done + k) / total))
+            users = rng.choices(self.assignees, cum_weights=self.assignee_weights, k=k)
+            chosen = rng.choices(tables, cum_weights=table_cum, k=k)
+            verbs = rng.choices(actions, cum_weights=action_cum, k=k)
+            yield [
+                {
+                    "action": verbs[i],
+                    "table_name": chosen[i],
+                    "record_id": int(rng.random() * sizes[chosen[i]]) + 1,
+                    "user_id": users[i],
+                    "payload": {"status": rng.choice(statuses)} if verbs[i] == "update" else None,
+                    "created_at": created[i],
+                }
+                for i in range(k)
+            ]
+
+
+def _chunks(rows: Iterator[dict[str, Any]]) -> Iterator[list[dict[str, Any]]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == CHUNK:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _load(conn: Connection, table: Table, chunks: Iterator[list[dict[str, Any]]]) -> int:
+    """Insère sans index secondaires (recréés ensuite : un tri plutôt que N insertions)."""
+    indexes = [index for index in table.indexes if not index.unique]
+    for index in indexes:
+        index.drop(conn, checkfirst=True)
+    count = 0
+    for chunk in chunks:
+        conn.execute(insert(table), chunk)
+        count += len(chunk)
+    for index in indexes:
+        index.create(conn)
+    return count
+
+
+def _has_fts(conn: Connection) -> bool:
+    found = conn.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts.TICKETS_FTS,)
+    )
+    return found.first() is not None
+
+
+def seed(
+    engine: Engine,
+    dataset: Dataset,
+    end: datetime = END,
+    progress: Callable[[str, int, float], None] | None = None,
+) -> None:
+    """Remplit une base vide (tables créées au besoin) ; ValueError si déjà peuplée."""
+    Base.metadata.create_all(bind=engine)
+    generator = _Generator(dataset, end)
+    with engine.connect() as conn:
+        for model in (User, Project, Ticket, AuditLog):
+            if conn.execute(select(func.count()).select_from(model)).scalar():
+                raise ValueError(f"{model.__tablename__} is not empty")
+
+    steps = (
+        (User.__table__, lambda: _chunks(generator.users())),
+        (Project.__table__, lambda: _chunks(generator.projects())),
+        (Ticket.__table__, generator.tickets),
+        (AuditLog.__table__, generator.audit_logs),
+    )
+    for table, chunks in steps:
+        start = time.perf_counter()
+        with engine.begin() as conn:
+            # index plein texte reconstruit en une passe plutôt que ligne à ligne
+            with_fts = table is Ticket.__table__ and _has_fts(conn)
+            if with_fts:
+                conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {fts.TICKETS_FTS_INSERT_TRIGGER}")
+            with changes.suspended(conn, table.name):
+                count = _load(conn, table, chunks())
+            if with_fts:
+                conn.exec_driver_sql(fts.TICKETS_FTS_REBUILD)
+                conn.exec_driver_sql(fts.TICKETS_FTS_TRIGGERS[fts.TICKETS_FTS_INSERT_TRIGGER])
+        if progress is not None:
+            progress(table.name, count, time.perf_counter() - start)
+
+
+def seed_database(
+    url: str,
+    dataset: Dataset,
+    end: datetime = END,
+    progress: Callable[[str, int, float], None] | None = None,
+) -> None:
+    """`seed` avec les pragmas de chargement, puis retour au journal de l'application."""
+    engine = create_db_engine(url, BULK_PRAGMAS, pool_size=1, max_overflow=0)
+    try:
+        seed(engine, dataset, end, progress)
+        with engine.connect() as conn:
+            conn.exec_driver_sql(f"PRAGMA journal_mode = {settings.SQLITE_JOURNAL_MODE}")
+    finally:
+        engine.dispose()
+
+
+def main() -> None:
+    defaults = Dataset()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database", default=settings.SQLITE_PATH, help="fichier SQLite")
+    parser.add_argument("--users", type=int, default=defaults.users)
+    parser.add_argument("--projects", type=int, default=defaults.projects)
+    parser.add_argument("--tickets", type=int, default=defaults.tickets)
+    parser.add_argument("--audit-logs", type=int, default=defaults.audit_logs)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--days", type=int, default=defaults.days, help="période couverte")
+    parser.add_argument("--end", type=datetime.fromisoformat, default=END)
+    args = parser.parse_args()
+    logging.basicConfig()
+    logger.setLevel(logging.INFO)
+
+    def progress(table: str, count: int, seconds: float) -> None:
+        logger.info("%s: %d rows in %.1fs (%.0f rows/s)", table, count, seconds, count / seconds)
+
+    dataset = Dataset(
+        args.users, args.projects, args.tickets, args.audit_logs, args.seed, args.days
+    )
+    try:
+        seed_database(f"sqlite:///{args.database}", dataset, args.end, progress)
+    except ValueError as exc:
+        parser.exit(1, f"{exc}\n")
+
+
+if __name__ == "__main__":
+    main()
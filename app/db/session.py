@@ -1,10 +1,102 @@
-from sqlalchemy import create_engine
+from typing import Any
+
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.db.metrics import TimedAsyncQueuePool, TimedQueuePool
 
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False} if settings.database_url.startswith("sqlite") else {},
-)
+
+def set_sqlite_pragmas(dbapi_conn: Any, pragmas: dict[str, str | int]) -> None:
+    cursor = dbapi_conn.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def create_db_engine(
+    url: str | None = None, pragmas: dict[str, str | int] | None = None, **kwargs: Any
+) -> Engine:
+    """
+    Moteur configuré selon le profil de `settings` : pool dimensionné et, pour
+    SQLite, pragmas (WAL, synchronous, busy_timeout...) posés à chaque connexion.
+    """
+    url = url or settings.database_url
+    if not url.startswith("sqlite"):
+        return create_engine(url, **kwargs)
+
+    kwargs.setdefault("poolclass", TimedQueuePool)
+    eng = create_engine(url, **_sqlite_engine_kwargs(kwargs))
+    _listen_pragmas(eng, pragmas)
+    return eng
+
+
+def create_async_db_engine(
+    url: str | None = None, pragmas: dict[str, str | int] | None = None, **kwargs: Any
+) -> AsyncEngine:
+    """Équivalent async (aiosqlite) de `create_db_engine`, même profil."""
+    url = url or settings.async_database_url
+    if not url.startswith("sqlite"):
+        return create_async_engine(url, **kwargs)
+
+    kwargs.setdefault("poolclass", TimedAsyncQueuePool)
+    eng = create_async_engine(url, **_sqlite_engine_kwargs(kwargs))
+    _listen_pragmas(eng.sync_engine, pragmas)
+    return eng
+
+
+def create_read_engine(url: str | None = None, **kwargs: Any) -> Engine:
+    """
+    Moteur des lectures : même fichier WAL, connexions `query_only` et pool
+    séparé. En WAL les lecteurs ne bloquent pas l'écrivain ; avec un pool à part
+    ils ne lui prennent pas non plus ses connexions.
+    """
+    kwargs.setdefault("pool_size", settings.DB_READ_POOL_SIZE)
+    kwargs.setdefault("max_overflow", settings.DB_READ_MAX_OVERFLOW)
+    return create_db_engine(url, settings.sqlite_read_pragmas, **kwargs)
+
+
+def create_async_read_engine(url: str | None = None, **kwargs: Any) -> AsyncEngine:
+    kwargs.setdefault("pool_size", settings.DB_READ_POOL_SIZE)
+    kwargs.setdefault("max_overflow", settings.DB_READ_MAX_OVERFLOW)
+    return create_async_db_engine(url, settings.sqlite_read_pragmas, **kwargs)
+
+
+def _sqlite_engine_kwargs(kwargs: dict[str, Any]) -> dict[str, Any]:
+    kwargs.setdefault("pool_size", settings.DB_POOL_SIZE)
+    kwargs.setdefault("max_overflow", settings.DB_MAX_OVERFLOW)
+    kwargs.setdefault("pool_timeout", settings.DB_POOL_TIMEOUT)
+    kwargs["connect_args"] = {
+        "check_same_thread": False,
+        "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+        **kwargs.get("connect_args", {}),
+    }
+    return kwargs
+
+
+def _listen_pragmas(eng: Engine, pragmas: dict[str, str | int] | None) -> None:
+    pragmas = settings.sqlite_pragmas if pragmas is None else pragmas
+
+    @event.listens_for(eng, "connect")
+    def _on_connect(dbapi_conn: Any, _record: Any) -> None:
+        set_sqlite_pragmas(dbapi_conn, pragmas)
+
+
+# pool_logging_name : label « pool » / « engine » des métriques
+engine = create_db_engine(pool_logging_name="write")
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+read_engine = create_read_engine(pool_logging_name="read")
+ReadSessionLocal = sessionmaker(bind=read_engine, autoflush=False, autocommit=False)
+
+# les moteurs async ne se connectent qu'au premier usage (DB_ASYNC=true)
+async_engine = create_async_db_engine(pool_logging_name="async_write")
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+async_read_engine = create_async_read_engine(pool_logging_name="async_read")
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=async_read_engine, autoflush=False, expire_on_commit=False
+)
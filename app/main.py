@@ -1,15 +1,94 @@
-from fastapi import FastAPI
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from importlib import import_module
 
-from app.api.v1 import audit_logs, auth, projects, tickets, users
+from fastapi import APIRouter, FastAPI
+
+from app.api import metrics
+from app.api.lazy import LazyRouter
+from app.api.middleware import DBRouteHeader, MetricsMiddleware, SQLProfiler
+from app.api.openapi import cached_openapi
+from app.core.config import settings
+from app.db.session import async_engine, async_read_engine
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # imports locaux : modèles ORM et JWT restent hors du chemin de démarrage
+    if settings.AUDIT_BUFFER_ENABLED:
+        from app.db.audit_buffer import audit_buffer
+
+        audit_buffer.start()
+    yield
+    from app.core.hashing import password_pool
+    from app.db.audit_buffer import audit_buffer
+    from app.db.change_feed import change_feed
+
+    # ferme les flux SSE encore ouverts
+    await change_feed.stop()
+    # écrit les logs d'audit encore en file avant de rendre la main
+    audit_buffer.stop()
+    password_pool.shutdown()
+    await async_engine.dispose()
+    await async_read_engine.dispose()
+
+
+def with_async_routes(sync_router: APIRouter, async_router: APIRouter) -> APIRouter:
+    """
+    Remplace chaque route synchrone par sa version async (même chemin, mêmes
+    méthodes) en gardant l'ordre de déclaration ; les routes sans équivalent
+    async (exports...) restent servies par le threadpool.
+    """
+    overrides = {(r.path, frozenset(r.methods)): r for r in async_router.routes}
+    merged = APIRouter()
+    merged.routes.extend(
+        overrides.get((r.path, frozenset(r.methods)), r) for r in sync_router.routes
+    )
+    return merged
+
+
+# module de app.api.v1 (et de app.api.v1.aio), préfixe, tags
+ROUTERS = (
+    ("auth", "/auth", ["auth"]),
+    ("users", "/users", ["users"]),
+    ("projects", "/projects", ["projects"]),
+    ("tickets", "/api/v1/tickets", ["tickets"]),
+    ("audit_logs", "/api/v1/audit-logs", ["audit-logs"]),
+    ("changes", "/api/v1/changes", ["changes"]),
+)
+
+# sans variante dans app.api.v1.aio (changes est déjà entièrement async)
+WITHOUT_AIO = frozenset({"auth", "changes"})
+
+
+def _router(name: str, use_async: bool) -> APIRouter:
+    router = import_module(f"app.api.v1.{name}").router
+    if use_async and name not in WITHOUT_AIO:
+        router = with_async_routes(router, import_module(f"app.api.v1.aio.{name}").router)
+    return router
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="OpsHub", version="1.0.0")
-    app.include_router(auth.router, prefix="/auth", tags=["auth"])
-    app.include_router(users.router, prefix="/users", tags=["users"])
-    app.include_router(projects.router, prefix="/projects", tags=["projects"])
-    app.include_router(tickets.router, prefix="/api/v1/tickets", tags=["tickets"])
-    app.include_router(audit_logs.router, prefix="/api/v1/audit-logs", tags=["audit-logs"])
+    app = FastAPI(title="OpsHub", version="1.0.0", lifespan=lifespan)
+    app.add_middleware(DBRouteHeader)
+    # inerte tant que DB_PROFILE est faux (réglable sans recréer l'application)
+    app.add_middleware(SQLProfiler)
+    if settings.METRICS_ENABLED:
+        # ajouté en dernier = le plus externe : mesure aussi les autres middlewares
+        app.add_middleware(MetricsMiddleware)
+        app.include_router(metrics.router, tags=["metrics"])
+    # lu ici : une application créée en mode async le reste
+    use_async = settings.DB_ASYNC
+    for name, prefix, tags in ROUTERS:
+
+        def load(name: str = name) -> APIRouter:
+            return _router(name, use_async)
+
+        if settings.LAZY_ROUTERS:
+            app.router.routes.append(LazyRouter(app, prefix, load, tags=tags))
+        else:
+            app.include_router(load(), prefix=prefix, tags=tags)
+    cached_openapi(app, settings.OPENAPI_FILE or None)
     return app
 
 
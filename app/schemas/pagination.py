@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+
+class Page[T](BaseModel):
+    items: list[T]
+    next_cursor: str | None = None
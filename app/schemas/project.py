@@ -1,6 +1,9 @@
+from datetime import datetime
+
 from pydantic import BaseModel, ConfigDict
 
-from app.db.enums import ProjectStatus
+from app.db.enums import ProjectStatus, TicketPriority, TicketStatus
+from app.schemas.user import UserRead
 
 
 class ProjectCreate(BaseModel):
@@ -24,3 +27,23 @@ class ProjectRead(BaseModel):
     description: str | None
     status: ProjectStatus
     owner_id: int | None
+
+
+class ProjectExpanded(ProjectRead):
+    # présents seulement avec ?include=owner,tickets_count
+    owner: UserRead | None = None
+    tickets_count: int | None = None
+
+
+class AssigneeOpenCount(BaseModel):
+    assignee_id: int | None
+    open: int
+
+
+class ProjectSummary(BaseModel):
+    project_id: int
+    total: int
+    by_status_priority: dict[TicketStatus, dict[TicketPriority, int]]
+    open_by_assignee: list[AssigneeOpenCount]
+    oldest_open_created_at: datetime | None = None
+    oldest_open_age_seconds: float | None = None
@@ -1,8 +1,12 @@
 from datetime import datetime
+from typing import Annotated, Literal
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
+from app.core.config import settings
 from app.db.enums import TicketPriority, TicketStatus
+from app.schemas.project import ProjectRead
+from app.schemas.user import UserRead
 
 
 class TicketBase(BaseModel):
@@ -32,3 +36,61 @@ class TicketRead(TicketBase):
     id: int
     created_at: datetime
     updated_at: datetime
+
+
+class TicketExpanded(TicketRead):
+    # présents seulement avec ?include=assignee,project
+    assignee: UserRead | None = None
+    project: ProjectRead | None = None
+
+
+class TicketSearchHit(TicketRead):
+    # score BM25 : plus petit = plus pertinent
+    rank: float
+    # fragment HTML : texte échappé, termes trouvés entre <mark> et </mark>
+    snippet: str
+
+
+class TicketBulkCreate(BaseModel):
+    op: Literal["create"]
+    data: TicketCreate
+
+
+class TicketBulkUpdate(BaseModel):
+    op: Literal["update"]
+    id: int
+    data: TicketUpdate
+
+
+class TicketBulkDelete(BaseModel):
+    op: Literal["delete"]
+    id: int
+
+
+TicketBulkOperation = Annotated[
+    TicketBulkCreate | TicketBulkUpdate | TicketBulkDelete, Field(discriminator="op")
+]
+
+
+class TicketBulkRequest(BaseModel):
+    # plafond vérifié par la validation : un lot trop long est refusé dès
+    # l'opération en trop, sans valider les suivantes
+    operations: list[TicketBulkOperation] = Field(
+        min_length=1, max_length=settings.BULK_MAX_OPERATIONS
+    )
+    # atomic : si une opération échoue, aucune n'est appliquée
+    atomic: bool = False
+
+
+class TicketBulkItemResult(BaseModel):
+    index: int
+    op: str
+    status: int
+    id: int | None = None
+    error: str | None = None
+
+
+class TicketBulkResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: list[TicketBulkItemResult]
@@ -0,0 +1,249 @@
+"""
+Charge sur l'API complète : débit et latences p50 / p95 / p99 par scénario.
+
+    python -m benchmarks.api_load --tickets 1000000 --audit-logs 10000000 \\
+        --db /tmp/opshub-1m.db --concurrency 1,8,32 --output results.json
+    python -m benchmarks.compare baseline.json results.json
+
+L'application (`create_app`) tourne in-process derrière httpx.ASGITransport :
+handlers, dépendances, middlewares et SQLite réels, sans réseau. Chaque
+scénario est rejoué à chaque niveau de `--concurrency` (requêtes en vol) ;
+la latence est mesurée par requête, hors attente du sémaphore. Avec `--db`,
+la base construite est gardée (paramètres dans `<db>.json`) et réutilisée
+aux runs suivants : 10 M de logs d'audit ne se régénèrent pas à chaque fois.
+"""
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+from contextlib import contextmanager
+from datetime import datetime
+import json
+import os
+from pathlib import Path
+import platform
+import random
+import statistics
+import subprocess
+import time
+from typing import Any
+
+import httpx
+from sqlalchemy import Engine
+
+from app.db import seed
+from app.db.enums import TicketPriority, TicketStatus
+from app.db.seed import PASSWORD, Dataset
+from app.db.session import create_db_engine
+from app.main import create_app
+from benchmarks.common import asgi_client, temp_engine, use_engine
+
+Scenario = Callable[[httpx.AsyncClient, random.Random, Dataset], Awaitable[httpx.Response]]
+
+STATUSES = [s.value for s in TicketStatus]
+PRIORITIES = [p.value for p in TicketPriority]
+
+
+def _login(client, rng, data):
+    user = seed.email(rng.randrange(data.users))
+    return client.post("/auth/login", json={"email": user, "password": PASSWORD})
+
+
+def _get_ticket(client, rng, data):
+    return client.get(f"/api/v1/tickets/{rng.randint(1, data.tickets)}")
+
+
+def _list_tickets(client, rng, data):
+    params = {"limit": 50, "project_id": rng.randint(1, data.projects)}
+    return client.get("/api/v1/tickets", params=params)
+
+
+def _create_ticket(client, rng, data):
+    payload = {
+        "title": f"load {rng.random():.6f}",
+        "project_id": rng.randint(1, data.projects),
+        "priority": rng.choice(PRIORITIES),
+    }
+    return client.post("/api/v1/tickets", json=payload)
+
+
+def _update_ticket(client, rng, data):
+    payload = {"status": rng.choice(STATUSES)}
+    return client.put(f"/api/v1/tickets/{rng.randint(1, data.tickets)}", json=payload)
+
+
+def _audit_log_write(client, rng, data):
+    payload = {
+        "action": "update",
+        "table_name": "tickets",
+        "record_id": rng.randint(1, data.tickets),
+        "user_id": rng.randint(1, data.users),
+        "payload": {"status": rng.choice(STATUSES)},
+    }
+    return client.post("/api/v1/audit-logs", json=payload)
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "login": _login,
+    "get_ticket": _get_ticket,
+    "list_tickets": _list_tickets,
+    "create_ticket": _create_ticket,
+    "update_ticket": _update_ticket,
+    "audit_log_write": _audit_log_write,
+}
+
+
+def _percentiles(ms: list[float]) -> dict[str, float]:
+    if len(ms) < 2:
+        value = ms[0] if ms else 0.0
+        return {"p50_ms": value, "p95_ms": value, "p99_ms": value}
+    cuts = statistics.quantiles(ms, n=100)
+    return {
+        "p50_ms": round(statistics.median(ms), 3),
+        "p95_ms": round(cuts[94], 3),
+        "p99_ms": round(cuts[98], 3),
+    }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    data: Dataset,
+    requests: int,
+    concurrency: int,
+    rng_seed: int,
+) -> dict[str, Any]:
+    rng = random.Random(rng_seed)
+    sem = asyncio.Semaphore(concurrency)
+    timings: list[float] = []
+    errors = 0
+
+    async def one() -> None:
+        nonlocal errors
+        async with sem:
+            start = time.perf_counter()
+            try:
+                response = await scenario(client, rng, data)
+                response.raise_for_status()
+            except Exception:
+                errors += 1
+            else:
+                timings.append((time.perf_counter() - start) * 1000)
+
+    for _ in range(min(concurrency, requests)):
+        await one()
+    timings.clear()
+    errors = 0
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": requests,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "throughput": round(len(timings) / elapsed, 1),
+        **_percentiles(sorted(timings)),
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+@contextmanager
+def _database(path: str | None, data: Dataset):
+    """Base temporaire, ou `path` construite une fois puis réutilisée."""
+    if path is None:
+        with temp_engine() as engine:
+            # connexion du create_all fermée : les pragmas de chargement s'appliquent
+            engine.dispose()
+            seed.seed_database(str(engine.url), data, progress=_progress)
+            yield engine, data
+        return
+
+    meta = Path(f"{path}.json")
+    if os.path.exists(path) and meta.exists():
+        data = Dataset(**json.loads(meta.read_text()))
+        print(f"reusing {path}: {data}")
+    else:
+        seed.seed_database(f"sqlite:///{path}", data, progress=_progress)
+        meta.write_text(json.dumps(data.as_dict()))
+    engine = create_db_engine(f"sqlite:///{path}")
+    try:
+        yield engine, data
+    finally:
+        engine.dispose()
+
+
+def _progress(table: str, count: int, seconds: float) -> None:
+    print(f"seeded {table}: {count} rows in {seconds:.1f}s")
+
+
+async def run(engine: Engine, data: Dataset, args: argparse.Namespace) -> list[dict[str, Any]]:
+    app = create_app()
+    use_engine(app, engine)
+    results = []
+    print(
+        f"{'scenario':<16} {'conc':>5} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'p99 ms':>8} {'errors':>7}"
+    )
+    async with asgi_client(app) as client:
+        for name in args.scenarios.split(","):
+            requests = args.login_requests if name == "login" else args.requests
+            for concurrency in (int(c) for c in args.concurrency.split(",")):
+                result = await run_scenario(
+                    client, SCENARIOS[name], data, requests, concurrency, data.seed
+                )
+                results.append({"scenario": name, "concurrency": concurrency, **result})
+                print(
+                    f"{name:<16} {concurrency:>5} {result['throughput']:>9.1f} "
+                    f"{result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+                    f"{result['p99_ms']:>8.2f} {result['errors']:>7}"
+                )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=Dataset.users)
+    parser.add_argument("--projects", type=int, default=Dataset.projects)
+    parser.add_argument("--tickets", type=int, default=Dataset.tickets)
+    parser.add_argument("--audit-logs", type=int, default=Dataset.audit_logs)
+    parser.add_argument("--seed", type=int, default=Dataset.seed)
+    parser.add_argument("--days", type=int, default=Dataset.days)
+    parser.add_argument("--db", help="fichier SQLite gardé entre les runs")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--concurrency", default="1,8,32")
+    parser.add_argument("--requests", type=int, default=1000)
+    # PBKDF2 : une connexion coûte des centaines de fois une lecture
+    parser.add_argument("--login-requests", type=int, default=50)
+    parser.add_argument("--output", help="résultats JSON (pour benchmarks.compare)")
+    args = parser.parse_args()
+    unknown = set(args.scenarios.split(",")) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    data = Dataset(args.users, args.projects, args.tickets, args.audit_logs, args.seed, args.days)
+    with _database(args.db, data) as (engine, data):
+        results = asyncio.run(run(engine, data, args))
+
+    if args.output:
+        report = {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "dataset": data.as_dict(),
+            "results": results,
+        }
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+        print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
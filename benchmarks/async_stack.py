@@ -0,0 +1,100 @@
+"""
+Requêtes/s à forte concurrence : routeurs sync (threadpool) vs pile async.
+
+    python -m benchmarks.async_stack --requests 2000 --concurrency 200
+"""
+
+import argparse
+import asyncio
+from datetime import datetime
+import random
+import time
+
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.db.models import Project, Ticket
+from app.db.session import create_db_engine
+from app.main import create_app
+from benchmarks.common import asgi_client, temp_engine, use_async_engine, use_engine
+
+
+def _seed(engine, tickets: int) -> None:
+    now = datetime.now()
+    with engine.begin() as conn:
+        conn.execute(insert(Project), [{"name": "bench", "created_at": now, "updated_at": now}])
+        conn.execute(
+            insert(Ticket),
+            [
+                {"project_id": 1, "title": f"t{i}", "created_at": now, "updated_at": now}
+                for i in range(tickets)
+            ],
+        )
+
+
+async def _drive(app, paths: list[str], concurrency: int) -> tuple[float, int]:
+    sem = asyncio.Semaphore(concurrency)
+    errors = 0
+
+    async def one(client, path):
+        nonlocal errors
+        async with sem:
+            try:
+                r = await client.get(path)
+                r.raise_for_status()
+            except Exception:
+                # typiquement sqlalchemy.exc.TimeoutError : pool épuisé
+                errors += 1
+
+    async with asgi_client(app) as client:
+        await one(client, paths[0])
+        start = time.perf_counter()
+        await asyncio.gather(*(one(client, p) for p in paths))
+        return len(paths) / (time.perf_counter() - start), errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--tickets", type=int, default=10000)
+    parser.add_argument("--pool-timeout", type=float, default=2.0)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    workloads = {
+        "get_ticket": [
+            f"/api/v1/tickets/{rng.randint(1, args.tickets)}" for _ in range(args.requests)
+        ],
+        "list_tickets": ["/api/v1/tickets?limit=50"] * args.requests,
+    }
+
+    # attente pool courte côté sync : les requêtes qui gardent une connexion en
+    # attendant un thread (sérialisation de la réponse) affament le threadpool, et
+    # sans timeout court le run resterait bloqué ; le mode async attend sans thread
+    def make_engine(url):
+        return create_db_engine(url, pool_timeout=args.pool_timeout)
+
+    with temp_engine(make_engine) as engine:
+        _seed(engine, args.tickets)
+        print(f"{'endpoint':<14} {'mode':<6} {'req/s':>8} {'errors':>7}")
+        for name, paths in workloads.items():
+            for mode in (False, True):
+                settings.DB_ASYNC = mode
+                app = create_app()
+                use_engine(app, engine)
+                async_engine = use_async_engine(app, engine)
+
+                async def run(app=app, async_engine=async_engine, paths=paths):
+                    try:
+                        return await _drive(app, paths, args.concurrency)
+                    finally:
+                        await async_engine.dispose()
+
+                rps, errors = asyncio.run(run())
+                label = "async" if mode else "sync"
+                print(f"{name:<14} {label:<6} {rps:>8.0f} {errors:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Surcoût du journal d'audit automatique sur la latence d'écriture.
+
+    python -m benchmarks.audit_trail --iterations 1000
+
+Chaque itération crée un ticket puis le modifie (POST puis PUT
+/api/v1/tickets), avec et sans le hook `after_flush`. « session » mesure les
+deux commits ORM seuls, « http » la requête complète. Objectif : moins de
+10 % de surcoût sur la latence vue par le client.
+"""
+
+import argparse
+import asyncio
+from collections.abc import Callable
+from datetime import datetime
+import statistics
+import time
+
+from sqlalchemy import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.enums import TicketStatus
+from app.db.models import Project, Ticket
+from app.main import create_app
+from benchmarks.common import asgi_client, temp_engine, use_engine
+
+
+def _project(engine: Engine) -> int:
+    with Session(engine) as db:
+        project = Project(name="bench")
+        db.add(project)
+        db.commit()
+        return project.id
+
+
+def _session_writes(engine: Engine, iterations: int) -> list[float]:
+    project_id = _project(engine)
+    samples = []
+    with Session(engine) as db:
+        for i in range(iterations):
+            start = time.perf_counter()
+            ticket = Ticket(title=f"ticket {i}", project_id=project_id)
+            db.add(ticket)
+            db.commit()
+            ticket.status = TicketStatus.in_progress
+            ticket.updated_at = datetime.now()
+            db.commit()
+            samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def _http_writes(engine: Engine, iterations: int) -> list[float]:
+    project_id = _project(engine)
+    app = create_app()
+    use_engine(app, engine)
+
+    async def run() -> list[float]:
+        samples = []
+        async with asgi_client(app) as client:
+            for i in range(iterations):
+                start = time.perf_counter()
+                r = await client.post(
+                    "/api/v1/tickets", json={"title": f"ticket {i}", "project_id": project_id}
+                )
+                await client.put(f"/api/v1/tickets/{r.json()['id']}", json={"status": "done"})
+                samples.append((time.perf_counter() - start) * 1e6)
+        return samples
+
+    return asyncio.run(run())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    cases: dict[str, Callable[[Engine, int], list[float]]] = {
+        "session": _session_writes,
+        "http": _http_writes,
+    }
+    enabled = settings.AUDIT_TRAIL_ENABLED
+    print(f"{'path':<8} {'off µs':>9} {'on µs':>9} {'overhead':>9}")
+    try:
+        for name, fn in cases.items():
+            medians: dict[bool, list[float]] = {False: [], True: []}
+            # rounds alternés pour lisser le bruit (cache disque, fréquence CPU)
+            for _ in range(args.rounds):
+                for audited in (False, True):
+                    settings.AUDIT_TRAIL_ENABLED = audited
+                    with temp_engine() as engine:
+                        medians[audited].append(statistics.median(fn(engine, args.iterations)))
+            off, on = statistics.median(medians[False]), statistics.median(medians[True])
+            print(f"{name:<8} {off:>9.1f} {on:>9.1f} {on / off - 1:>+9.1%}")
+    finally:
+        settings.AUDIT_TRAIL_ENABLED = enabled
+
+
+if __name__ == "__main__":
+    main()
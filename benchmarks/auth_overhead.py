@@ -0,0 +1,73 @@
+"""
+Surcoût d'authentification par requête, avec et sans caches.
+
+    python -m benchmarks.auth_overhead --iterations 20000
+
+« froid » vide les caches (claims JWT + principal) avant chaque appel, ce qui
+reproduit le coût d'avant les caches ; « chaud » est le cas d'un client qui
+réutilise son token.
+"""
+
+import argparse
+from collections.abc import Callable
+import time
+
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_user
+from app.api.principal import principal_cache
+from app.core.security import claims_cache, create_access_token, decode_token, hash_password
+from app.db.enums import UserRole
+from app.db.models import User
+from benchmarks.common import temp_engine
+
+
+def _per_call_us(fn: Callable[[], object], iterations: int, before: Callable[[], None]) -> float:
+    total = 0.0
+    for _ in range(iterations):
+        before()
+        start = time.perf_counter()
+        fn()
+        total += time.perf_counter() - start
+    return total / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    def cold() -> None:
+        claims_cache.clear()
+        principal_cache.clear()
+
+    def warm() -> None:
+        pass
+
+    with temp_engine() as engine:
+        with Session(engine) as db:
+            db.add(
+                User(
+                    email="bench@example.com",
+                    full_name="Bench",
+                    role=UserRole.agent,
+                    password_hash=hash_password("pw", iterations=1000),
+                )
+            )
+            db.commit()
+
+            token = create_access_token(sub="bench@example.com")
+            cases = {
+                "decode_token": lambda: decode_token(token),
+                "get_current_user": lambda: get_current_user(token, db),
+            }
+            print(f"{'path':<18} {'cold µs':>9} {'warm µs':>9} {'speedup':>8}")
+            for name, fn in cases.items():
+                cold_us = _per_call_us(fn, args.iterations, cold)
+                fn()
+                warm_us = _per_call_us(fn, args.iterations, warm)
+                print(f"{name:<18} {cold_us:>9.1f} {warm_us:>9.1f} {cold_us / warm_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Flux SSE des changements : coût des abonnés inactifs et délai de diffusion.
+
+    python -m benchmarks.change_feed --subscribers 5000 --writes 20
+
+`--subscribers` flux ouverts in-process sur GET /api/v1/changes/stream
+(application ASGI appelée directement, sans réseau ni serveur). Mesures :
+mémoire par abonné (tracemalloc), CPU consommé pendant `--idle` secondes
+sans écriture (battements de cœur compris), puis, pour chaque écriture (un
+ticket modifié et commité dans un thread, comme un handler synchrone), le
+délai jusqu'au premier et au dernier abonné servi.
+"""
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+import statistics
+import time
+import tracemalloc
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from app.api.deps import get_change_feed
+from app.db.change_feed import ChangeFeed
+from app.db.enums import TicketStatus
+from app.db.models import Project, Ticket
+from app.main import create_app
+from benchmarks.common import temp_engine
+
+PATH = "/api/v1/changes/stream"
+
+SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0", "spec_version": "2.3"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": PATH,
+    "raw_path": PATH.encode(),
+    "root_path": "",
+    "query_string": b"",
+    "headers": [],
+    "client": ("bench", 50000),
+    "server": ("bench", 80),
+}
+
+
+class Fanout:
+    """Arrivées de l'écriture en cours chez les abonnés."""
+
+    def __init__(self, subscribers: int):
+        self.subscribers = subscribers
+        self.start = 0.0
+        self.arrivals: list[float] = []
+        self.done = asyncio.Event()
+
+    def reset(self) -> None:
+        self.start = time.perf_counter()
+        self.arrivals = []
+        self.done = asyncio.Event()
+
+    def received(self) -> None:
+        self.arrivals.append(time.perf_counter() - self.start)
+        if len(self.arrivals) == self.subscribers:
+            self.done.set()
+
+
+async def _subscriber(app, disconnected: asyncio.Event, fanout: Fanout) -> None:
+    async def receive():
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if b"\nevent: " in message.get("body", b""):
+            fanout.received()
+
+    await app(dict(SCOPE), receive, send)
+
+
+async def run(args: argparse.Namespace) -> dict[str, float]:
+    with temp_engine() as engine:
+        with engine.begin() as conn:
+            project_id = conn.execute(insert(Project).values(name="bench")).inserted_primary_key[0]
+            conn.execute(insert(Ticket).values(title="bench", project_id=project_id))
+        factory = sessionmaker(bind=engine)
+
+        def write(i: int) -> None:
+            with factory() as db:
+                ticket = db.get(Ticket, 1)
+                ticket.title = f"bench {i}"
+                ticket.status = TicketStatus.in_progress if i % 2 else TicketStatus.open
+                db.commit()
+
+        app = create_app()
+        feed = ChangeFeed(engine, poll_ms=args.poll_ms, heartbeat=args.heartbeat)
+        app.dependency_overrides[get_change_feed] = lambda: feed
+        disconnected = asyncio.Event()
+        fanout = Fanout(args.subscribers)
+
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        tasks = [
+            asyncio.create_task(_subscriber(app, disconnected, fanout))
+            for _ in range(args.subscribers)
+        ]
+        while feed.subscribers < args.subscribers:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.1)
+        per_subscriber = (tracemalloc.get_traced_memory()[0] - baseline) / args.subscribers
+        tracemalloc.stop()
+
+        cpu, wall = time.process_time(), time.perf_counter()
+        await asyncio.sleep(args.idle)
+        idle_cpu = (time.process_time() - cpu) / (time.perf_counter() - wall)
+
+        first, last = [], []
+        for i in range(args.writes):
+            fanout.reset()
+            await asyncio.to_thread(write, i)
+            await asyncio.wait_for(fanout.done.wait(), 30)
+            first.append(min(fanout.arrivals) * 1000)
+            last.append(max(fanout.arrivals) * 1000)
+
+        disconnected.set()
+        await feed.stop()
+        await asyncio.gather(*tasks)
+
+    return {
+        "subscribers": args.subscribers,
+        "bytes_per_subscriber": round(per_subscriber),
+        "idle_cpu_percent": round(idle_cpu * 100, 2),
+        "first_ms_p50": round(statistics.median(first), 3),
+        "last_ms_p50": round(statistics.median(last), 3),
+        "last_ms_max": round(max(last), 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--subscribers", type=int, default=2000)
+    parser.add_argument("--writes", type=int, default=20)
+    parser.add_argument("--idle", type=float, default=5.0, help="secondes sans écriture")
+    parser.add_argument("--heartbeat", type=float, default=1.0)
+    parser.add_argument("--poll-ms", type=int, default=1000)
+    parser.add_argument("--output", help="résultats JSON")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    print(f"subscribers           {result['subscribers']}")
+    print(f"memory / subscriber   {result['bytes_per_subscriber'] / 1024:.1f} KiB")
+    print(f"idle CPU              {result['idle_cpu_percent']:.2f} %")
+    print(f"fan-out first (p50)   {result['first_ms_p50']:.2f} ms")
+    print(f"fan-out last  (p50)   {result['last_ms_p50']:.2f} ms")
+    print(f"fan-out last  (max)   {result['last_ms_max']:.2f} ms")
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
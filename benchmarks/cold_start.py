@@ -0,0 +1,135 @@
+"""
+Démarrage à froid : import, première requête et premier /openapi.json.
+
+    python -m benchmarks.cold_start --runs 5 --top 15
+
+Chaque mesure est un nouveau processus Python (aucun module en cache), dans
+trois configurations : « eager » (LAZY_ROUTERS=0, schéma généré), « lazy »
+(routeurs importés au premier appel) et « lazy+file » (schéma OpenAPI lu
+dans le fichier de `python -m app.api.openapi`). On garde la médiane.
+Suit la répartition de `-X importtime` en mode lazy : temps propre par
+paquet (`app.*` au deuxième niveau) et modules les plus coûteux.
+"""
+
+import argparse
+from collections import defaultdict
+import json
+import os
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from app.db.seed import Dataset, seed_database
+
+# le client de test (httpx) est importé hors mesure
+CHILD = """
+import json, time
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(app.main.app) as client:
+    ready = time.perf_counter()
+    client.get("/api/v1/tickets/1").raise_for_status()
+    served = time.perf_counter()
+    client.get("/openapi.json").raise_for_status()
+    documented = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "first_request_ms": (served - ready) * 1000,
+    "openapi_ms": (documented - served) * 1000,
+}))
+"""
+
+PHASES = ("import_ms", "first_request_ms", "openapi_ms")
+
+
+def _child(env: dict[str, str], *flags: str, code: str = CHILD) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        env={**os.environ, **env},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def measure(env: dict[str, str], runs: int) -> dict[str, float]:
+    samples = [json.loads(_child(env).stdout.splitlines()[-1]) for _ in range(runs)]
+    result = {phase: statistics.median(s[phase] for s in samples) for phase in PHASES}
+    result["ready_ms"] = result["import_ms"] + result["first_request_ms"]
+    return result
+
+
+def importtime(env: dict[str, str]) -> list[tuple[str, int, int]]:
+    """(module, µs propres, µs cumulés) d'après `-X importtime`."""
+    rows = []
+    for line in _child(env, "-X", "importtime", code="import app.main").stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def _package(module: str) -> str:
+    parts = module.split(".")
+    return ".".join(parts[:2]) if parts[0] == "app" else parts[0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--output", help="résultats JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="opshub-cold-") as tmp:
+        db = str(Path(tmp) / "cold.db")
+        seed_database(f"sqlite:///{db}", Dataset(users=10, projects=2, tickets=100, audit_logs=0))
+        schema = str(Path(tmp) / "openapi.json")
+        subprocess.run(
+            [sys.executable, "-m", "app.api.openapi", schema],
+            env={**os.environ, "SQLITE_PATH": db},
+            check=True,
+        )
+        base = {"SQLITE_PATH": db, "OPENAPI_FILE": ""}
+        configs = {
+            "eager": {**base, "LAZY_ROUTERS": "0"},
+            "lazy": {**base, "LAZY_ROUTERS": "1"},
+            "lazy+file": {**base, "LAZY_ROUTERS": "1", "OPENAPI_FILE": schema},
+        }
+
+        print(f"{'config':<10} {'import':>8} {'1st req':>8} {'ready':>8} {'openapi':>8}  (ms)")
+        results = {}
+        for name, env in configs.items():
+            result = results[name] = measure(env, args.runs)
+            print(
+                f"{name:<10} {result['import_ms']:>8.0f} {result['first_request_ms']:>8.0f} "
+                f"{result['ready_ms']:>8.0f} {result['openapi_ms']:>8.0f}"
+            )
+
+        modules = importtime(configs["lazy"])
+    packages: dict[str, int] = defaultdict(int)
+    for name, self_us, _ in modules:
+        packages[_package(name)] += self_us
+    total = sum(packages.values())
+    print(f"\nimport app.main (lazy), temps propre par paquet : {total / 1000:.0f} ms")
+    for name, self_us in sorted(packages.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"  {name:<28} {self_us / 1000:>7.1f} ms {self_us / total:>6.1%}")
+    print("\nmodules les plus coûteux (temps propre)")
+    for name, self_us, cumulative_us in sorted(modules, key=lambda row: -row[1])[: args.top]:
+        print(f"  {name:<40} {self_us / 1000:>7.1f} ms  (cumulé {cumulative_us / 1000:.1f})")
+
+    if args.output:
+        report = {
+            "configs": results,
+            "packages_ms": {name: us / 1000 for name, us in packages.items()},
+        }
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
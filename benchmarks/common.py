@@ -0,0 +1,69 @@
+"""
+Outils partagés par les benchmarks : base SQLite temporaire et client ASGI
+in-process (httpx + ASGITransport), sans serveur HTTP ni réseau.
+"""
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+import os
+import tempfile
+
+from fastapi import FastAPI
+import httpx
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.api.deps import get_async_db, get_db, get_read_db
+from app.db.base import Base
+from app.db.session import create_async_db_engine, create_db_engine
+
+
+@contextmanager
+def temp_engine(make_engine: Callable[[str], Engine] = create_db_engine) -> Iterator[Engine]:
+    fd, path = tempfile.mkstemp(suffix=".db", prefix="opshub-bench-")
+    os.close(fd)
+    engine = make_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.unlink(path + suffix)
+            except FileNotFoundError:
+                pass
+
+
+def use_engine(app: FastAPI, engine: Engine) -> sessionmaker[Session]:
+    """Branche `get_db` (et `get_read_db`) de l'application sur `engine`."""
+    factory = sessionmaker(bind=engine, autoflush=False)
+
+    def _get_db():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = _get_db
+    app.dependency_overrides[get_read_db] = _get_db
+    return factory
+
+
+def use_async_engine(app: FastAPI, engine: Engine, **kwargs) -> AsyncEngine:
+    """Branche `get_async_db` sur le même fichier SQLite que `engine`."""
+    async_engine = create_async_db_engine(f"sqlite+aiosqlite:///{engine.url.database}", **kwargs)
+    factory = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def _get_async_db():
+        async with factory() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = _get_async_db
+    return async_engine
+
+
+def asgi_client(app: FastAPI) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
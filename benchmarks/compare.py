@@ -0,0 +1,72 @@
+"""
+Compare deux rapports de `benchmarks.api_load` et signale les régressions.
+
+    python -m benchmarks.compare baseline.json results.json --threshold 10
+
+Pour chaque (scénario, concurrence) présent des deux côtés : variation du
+débit et du p95. Une baisse de débit ou une hausse du p95 au-delà de
+`--threshold` % est une régression ; le code de sortie vaut alors 1 (CI).
+"""
+
+import argparse
+import json
+from pathlib import Path
+import sys
+from typing import Any
+
+
+def _load(path: str) -> dict[str, Any]:
+    return json.loads(Path(path).read_text())
+
+
+def _change(before: float, after: float) -> float:
+    return (after - before) / before * 100 if before else 0.0
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float
+) -> list[dict[str, Any]]:
+    before = {(r["scenario"], r["concurrency"]): r for r in baseline["results"]}
+    rows = []
+    for result in current["results"]:
+        key = (result["scenario"], result["concurrency"])
+        if key not in before:
+            continue
+        throughput = _change(before[key]["throughput"], result["throughput"])
+        p95 = _change(before[key]["p95_ms"], result["p95_ms"])
+        rows.append(
+            {
+                "scenario": key[0],
+                "concurrency": key[1],
+                "throughput_change": throughput,
+                "p95_change": p95,
+                "regression": throughput < -threshold or p95 > threshold,
+            }
+        )
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=10.0, help="tolérance en %%")
+    args = parser.parse_args()
+
+    baseline, current = _load(args.baseline), _load(args.current)
+    if baseline.get("dataset") != current.get("dataset"):
+        print(f"warning: datasets differ: {baseline.get('dataset')} vs {current.get('dataset')}")
+
+    rows = compare(baseline, current, args.threshold)
+    print(f"{'scenario':<16} {'conc':>5} {'req/s Δ%':>9} {'p95 Δ%':>8}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['scenario']:<16} {row['concurrency']:>5} "
+            f"{row['throughput_change']:>+9.1f} {row['p95_change']:>+8.1f}{flag}"
+        )
+    sys.exit(1 if any(row["regression"] for row in rows) else 0)
+
+
+if __name__ == "__main__":
+    main()
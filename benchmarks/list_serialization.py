@@ -0,0 +1,105 @@
+"""
+Listes : chemin ORM + response_model contre tuples Core + orjson.
+
+    python -m benchmarks.list_serialization --rows 10000 100000
+
+« orm » reproduit le chemin d'avant : objets ORM dans l'identity map,
+validation `Page[TicketRead]` (from_attributes) puis encodage JSON, comme le
+fait FastAPI avec `response_model`. « core » est le chemin rapide de
+GET /api/v1/tickets. Mesures : latence médiane et pic mémoire (tracemalloc)
+pour une page de N lignes.
+"""
+
+import argparse
+from collections.abc import Callable
+from datetime import datetime
+import gc
+import statistics
+import time
+import tracemalloc
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.api.fast_json import PageSerializer
+from app.api.pagination import PageParams, apply_keyset, page_of, paginate
+from app.core.config import settings
+from app.db.models import Project, Ticket
+from app.schemas.pagination import Page
+from app.schemas.ticket import TicketRead
+from benchmarks.common import temp_engine
+
+KEYS = (Ticket.id,)
+
+
+def _seed(engine, tickets: int) -> None:
+    now = datetime.now()
+    with engine.begin() as conn:
+        conn.execute(insert(Project), [{"name": "bench", "created_at": now, "updated_at": now}])
+        conn.execute(
+            insert(Ticket),
+            [
+                {
+                    "project_id": 1,
+                    "title": f"ticket {i}",
+                    "description": "lorem ipsum " * 4,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(tickets)
+            ],
+        )
+
+
+def orm_path(db: Session, page: PageParams) -> bytes:
+    content = paginate(db.query(Ticket), page, keys=KEYS)
+    return Page[TicketRead].model_validate(content).model_dump_json().encode()
+
+
+def core_path(db: Session, page: PageParams, serializer=PageSerializer(TicketRead)) -> bytes:
+    rows = db.execute(apply_keyset(select(*serializer.columns(Ticket)), page, KEYS)).all()
+    return serializer.dumps(**page_of(rows, page, KEYS))
+
+
+def _measure(fn: Callable[[], bytes], repeat: int) -> tuple[float, float]:
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings) * 1000, peak / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    settings.PAGE_SIZE_MAX = max(args.rows)
+    print(f"{'rows':>7} {'path':<5} {'median ms':>10} {'peak MiB':>9}")
+    for rows in args.rows:
+        with temp_engine() as engine:
+            _seed(engine, rows)
+            page = PageParams(limit=rows, cursor=None)
+            results = {}
+            for name, path in (("orm", orm_path), ("core", core_path)):
+                # session neuve à chaque appel : identity map vide, comme par requête
+                def run(path=path, page=page) -> bytes:
+                    with Session(engine) as db:
+                        return path(db, page)
+
+                results[name] = run()
+                ms, peak = _measure(run, args.repeat)
+                print(f"{rows:>7} {name:<5} {ms:>10.1f} {peak:>9.1f}")
+            assert results["orm"].count(b'"id"') == results["core"].count(b'"id"') == rows
+
+
+if __name__ == "__main__":
+    main()
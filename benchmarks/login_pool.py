@@ -0,0 +1,76 @@
+"""
+Débit de POST /auth/login selon la taille du pool de hachage.
+
+    python -m benchmarks.login_pool --logins 200 --concurrency 32 --sizes 0,1,2,4
+
+Taille 0 = PBKDF2 dans le threadpool AnyIO (comportement historique).
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.core.hashing import password_pool
+from app.core.security import hash_password
+from app.db.enums import UserRole
+from app.db.models import User
+from app.main import app
+from benchmarks.common import asgi_client, temp_engine, use_engine
+
+PASSWORD = "bench-password"
+
+
+async def _run(logins: int, concurrency: int, emails: list[str]) -> tuple[float, int]:
+    sem = asyncio.Semaphore(concurrency)
+    rejected = 0
+
+    async def one(client, email):
+        nonlocal rejected
+        async with sem:
+            r = await client.post("/auth/login", json={"email": email, "password": PASSWORD})
+            if r.status_code == 503:
+                rejected += 1
+            else:
+                r.raise_for_status()
+
+    async with asgi_client(app) as client:
+        # préchauffage : démarrage des processus du pool
+        await one(client, emails[0])
+        start = time.perf_counter()
+        await asyncio.gather(*(one(client, emails[i % len(emails)]) for i in range(logins)))
+        return time.perf_counter() - start, rejected
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--sizes", default="0,1,2,4,8")
+    parser.add_argument("--max-pending", type=int, default=1024)
+    args = parser.parse_args()
+
+    with temp_engine() as engine:
+        factory = use_engine(app, engine)
+        emails = [f"bench{i}@example.com" for i in range(16)]
+        with factory() as db:
+            db.add_all(
+                User(
+                    email=email,
+                    full_name="Bench",
+                    role=UserRole.agent,
+                    password_hash=hash_password(PASSWORD),
+                )
+                for email in emails
+            )
+            db.commit()
+
+        print(f"{'pool':>5} {'logins/s':>10} {'rejected':>9}")
+        for size in (int(s) for s in args.sizes.split(",")):
+            password_pool.configure(size=size, max_pending=args.max_pending)
+            elapsed, rejected = asyncio.run(_run(args.logins, args.concurrency, emails))
+            print(f"{size:>5} {args.logins / elapsed:>10.1f} {rejected:>9}")
+        password_pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
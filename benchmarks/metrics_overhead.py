@@ -0,0 +1,96 @@
+"""
+Coût du middleware de métriques par requête.
+
+    python -m benchmarks.metrics_overhead --requests 3000
+
+« middleware » : une application ASGI vide, nue puis enveloppée dans
+`MetricsMiddleware` (compteurs, histogrammes, contextvar SQL) ; la différence
+est le coût d'enregistrement, objectif < 50 µs. « app » : GET d'un ticket par
+l'application complète, avec et sans `METRICS_ENABLED` (requêtes SQL comprises).
+"""
+
+import argparse
+import asyncio
+from datetime import datetime
+import time
+from types import SimpleNamespace
+
+from sqlalchemy import insert
+
+from app.api.middleware import MetricsMiddleware
+from app.core.config import settings
+from app.db.models import Project, Ticket
+from app.main import create_app
+from benchmarks.common import asgi_client, temp_engine, use_engine
+
+# ce que le routeur laisse dans le scope : route trouvée, application
+_ROUTE = SimpleNamespace(path="/bench")
+_APP = SimpleNamespace(routes=[])
+
+
+async def _empty(scope, receive, send) -> None:
+    scope["route"] = _ROUTE
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _per_call_us(app, iterations: int) -> float:
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message) -> None:
+        pass
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        scope = {"type": "http", "method": "GET", "path": "/bench", "app": _APP}
+        await app(scope, receive, send)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+async def _app_us(enabled: bool, engine, requests: int) -> float:
+    settings.METRICS_ENABLED = enabled
+    app = create_app()
+    use_engine(app, engine)
+    async with asgi_client(app) as client:
+        for _ in range(50):
+            await client.get("/api/v1/tickets/1")
+        start = time.perf_counter()
+        for _ in range(requests):
+            response = await client.get("/api/v1/tickets/1")
+            response.raise_for_status()
+        return (time.perf_counter() - start) / requests * 1e6
+
+
+async def run(args: argparse.Namespace) -> None:
+    bare = await _per_call_us(_empty, args.iterations)
+    measured = await _per_call_us(MetricsMiddleware(_empty), args.iterations)
+    print(f"{'case':<12} {'off µs':>9} {'on µs':>9} {'overhead µs':>12}")
+    print(f"{'middleware':<12} {bare:>9.1f} {measured:>9.1f} {measured - bare:>12.1f}")
+
+    with temp_engine() as engine:
+        now = datetime.now()
+        with engine.begin() as conn:
+            conn.execute(insert(Project), {"name": "bench", "created_at": now, "updated_at": now})
+            conn.execute(
+                insert(Ticket),
+                {"project_id": 1, "title": "bench", "created_at": now, "updated_at": now},
+            )
+        enabled = settings.METRICS_ENABLED
+        try:
+            off = await _app_us(False, engine, args.requests)
+            on = await _app_us(True, engine, args.requests)
+        finally:
+            settings.METRICS_ENABLED = enabled
+    print(f"{'app':<12} {off:>9.1f} {on:>9.1f} {on - off:>12.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=50000)
+    parser.add_argument("--requests", type=int, default=3000)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
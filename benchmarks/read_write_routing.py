@@ -0,0 +1,97 @@
+"""
+Latence des écritures pendant des rapports longs : pool partagé contre moteur
+de lecture dédié.
+
+    python -m benchmarks.read_write_routing --reports 4 --writes 100
+
+« shared » : rapports et écritures se partagent un pool de `--pool` connexions
+(ce que faisait `get_db` pour toutes les requêtes). « routed » : les rapports
+passent par `create_read_engine` (query_only, pool séparé), les écritures
+gardent le moteur principal. On mesure p50 / p99 / max d'un INSERT + COMMIT
+pendant que `--reports` threads enchaînent une agrégation lente.
+"""
+
+import argparse
+from datetime import datetime
+import statistics
+import threading
+import time
+
+from sqlalchemy import Engine, insert, text
+
+from app.db.models import Project, Ticket
+from app.db.session import create_db_engine, create_read_engine
+from benchmarks.common import temp_engine
+
+# ~100 ms de CPU SQLite par défaut, sans verrou d'écriture
+REPORT = text(
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c LIMIT :n) SELECT sum(x) FROM c"
+)
+
+
+def _reports(engine: Engine, size: int, stop: threading.Event) -> None:
+    while not stop.is_set():
+        with engine.connect() as conn:
+            conn.execute(REPORT, {"n": size}).scalar()
+
+
+def _writes(engine: Engine, count: int) -> list[float]:
+    now = datetime.now()
+    timings = []
+    for i in range(count):
+        start = time.perf_counter()
+        with engine.begin() as conn:
+            conn.execute(
+                insert(Ticket),
+                {"project_id": 1, "title": f"w{i}", "created_at": now, "updated_at": now},
+            )
+        timings.append(time.perf_counter() - start)
+        time.sleep(0.002)
+    return timings
+
+
+def run(url: str, routed: bool, args: argparse.Namespace) -> list[float]:
+    pool = {"pool_size": args.pool, "max_overflow": 0}
+    writer = create_db_engine(url, **pool)
+    reader = create_read_engine(url, **pool) if routed else writer
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=_reports, args=(reader, args.report_size, stop))
+        for _ in range(args.reports)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.2)
+    try:
+        return _writes(writer, args.writes)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+        writer.dispose()
+        reader.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reports", type=int, default=4)
+    parser.add_argument("--pool", type=int, default=4)
+    parser.add_argument("--writes", type=int, default=100)
+    parser.add_argument("--report-size", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print(f"{'mode':<7} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for name, routed in (("shared", False), ("routed", True)):
+        with temp_engine() as engine:
+            now = datetime.now()
+            with engine.begin() as conn:
+                conn.execute(
+                    insert(Project), {"name": "bench", "created_at": now, "updated_at": now}
+                )
+            ms = sorted(t * 1000 for t in run(str(engine.url), routed, args))
+            p99 = statistics.quantiles(ms, n=100)[98]
+            print(f"{name:<7} {statistics.median(ms):>8.2f} {p99:>8.2f} {ms[-1]:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Charge mixte lecture/écriture concurrente : profil SQLite d'origine vs profil
+configuré dans `Settings` (WAL, synchronous=NORMAL, busy_timeout, pool...).
+
+    python -m benchmarks.sqlite_profile --threads 16 --seconds 10 --write-ratio 0.2
+"""
+
+import argparse
+from datetime import datetime
+import random
+import statistics
+import threading
+import time
+
+from sqlalchemy import Engine, create_engine, insert, select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.db.enums import TicketStatus
+from app.db.models import Project, Ticket
+from app.db.session import create_db_engine
+from benchmarks.common import temp_engine
+
+PROJECTS = 50
+
+
+def _seed(engine: Engine, tickets: int) -> None:
+    now = datetime.now()
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Project),
+            [{"name": f"p{i}", "created_at": now, "updated_at": now} for i in range(PROJECTS)],
+        )
+        conn.execute(
+            insert(Ticket),
+            [
+                {
+                    "project_id": i % PROJECTS + 1,
+                    "title": f"t{i}",
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(tickets)
+            ],
+        )
+
+
+def _worker(engine, stop, write_ratio, tickets, stats, lock) -> None:
+    rng = random.Random(threading.get_ident())
+    reads, writes, errors = [], [], 0
+    while not stop.is_set():
+        is_write = rng.random() < write_ratio
+        start = time.perf_counter()
+        try:
+            with Session(engine) as db:
+                if is_write:
+                    db.execute(
+                        insert(Ticket).values(
+                            project_id=rng.randint(1, PROJECTS),
+                            title="bench",
+                            created_at=datetime.now(),
+                            updated_at=datetime.now(),
+                        )
+                    )
+                    db.execute(
+                        update(Ticket)
+                        .where(Ticket.id == rng.randint(1, tickets))
+                        .values(status=TicketStatus.in_progress, updated_at=datetime.now())
+                    )
+                    db.commit()
+                else:
+                    db.execute(
+                        select(Ticket.id, Ticket.title, Ticket.status)
+                        .where(Ticket.project_id == rng.randint(1, PROJECTS))
+                        .order_by(Ticket.id.desc())
+                        .limit(50)
+                    ).all()
+        except OperationalError:
+            errors += 1
+            continue
+        (writes if is_write else reads).append(time.perf_counter() - start)
+    with lock:
+        stats["reads"].extend(reads)
+        stats["writes"].extend(writes)
+        stats["errors"] += errors
+
+
+def _p(samples: list[float], q: int) -> float:
+    if len(samples) < 2:
+        return 0.0
+    return statistics.quantiles(samples, n=100)[q - 1] * 1000
+
+
+def _original_engine(url: str) -> Engine:
+    # moteur tel que créé avant l'introduction du profil
+    return create_engine(url, connect_args={"check_same_thread": False})
+
+
+def run(profile: str, args) -> None:
+    make_engine = _original_engine if profile == "origine" else create_db_engine
+    with temp_engine(make_engine) as engine:
+        _seed(engine, args.tickets)
+
+        stop, lock = threading.Event(), threading.Lock()
+        stats = {"reads": [], "writes": [], "errors": 0}
+        threads = [
+            threading.Thread(
+                target=_worker, args=(engine, stop, args.write_ratio, args.tickets, stats, lock)
+            )
+            for _ in range(args.threads)
+        ]
+        for t in threads:
+            t.start()
+        time.sleep(args.seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+
+        ops = len(stats["reads"]) + len(stats["writes"])
+        print(
+            f"{profile:<8} {ops / args.seconds:>9.0f} {stats['errors']:>7} "
+            f"{_p(stats['reads'], 50):>8.2f} {_p(stats['reads'], 99):>8.2f} "
+            f"{_p(stats['writes'], 50):>8.2f} {_p(stats['writes'], 99):>8.2f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--tickets", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(
+        f"{'profil':<8} {'ops/s':>9} {'locked':>7} {'r p50ms':>8} {'r p99ms':>8} {'w p50ms':>8} {'w p99ms':>8}"
+    )
+    for profile in ("origine", "tuned"):
+        run(profile, args)
+
+
+if __name__ == "__main__":
+    main()
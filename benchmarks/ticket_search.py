@@ -0,0 +1,102 @@
+"""
+Recherche de tickets : index FTS5 (BM25) contre un balayage LIKE.
+
+    python -m benchmarks.ticket_search --tickets 1000000
+
+Insère N tickets au vocabulaire aléatoire (l'index se remplit par trigger),
+puis mesure la latence médiane de la première page de GET
+/api/v1/tickets/search (requête SQL seule, hors HTTP) pour des termes
+fréquents, rares, multi-mots et préfixes. « like » est l'approche naïve
+(`title LIKE '%mot%' OR description LIKE '%mot%'`, sans classement) : elle
+s'arrête dès la première page pour un mot fréquent, mais balaie toute la
+table pour un mot rare. FTS5 trouve les lignes par l'index mais doit classer
+toutes les correspondances par BM25 avant d'en rendre 50.
+"""
+
+import argparse
+from datetime import datetime
+import itertools
+import random
+import statistics
+import time
+
+from sqlalchemy import insert, or_, select
+from sqlalchemy.orm import Session
+
+from app.api.pagination import PageParams
+from app.api.v1.tickets import TicketSearch
+from app.db.models import Project, Ticket
+from benchmarks.common import temp_engine
+
+# les premiers mots sont les plus fréquents, mot4999 est rare
+WORDS = ["erreur", "réseau", "connexion", "imprimante"] + [f"mot{i}" for i in range(5000)]
+QUERIES = ("erreur", "mot4999", "réseau connexion", "imprim*")
+BATCH = 50_000
+
+
+def _seed(engine, tickets: int, rng: random.Random) -> None:
+    now = datetime.now()
+    # distribution de Zipf grossière : quelques mots très fréquents, beaucoup de rares
+    cum_weights = list(itertools.accumulate(1 / (i + 1) for i in range(len(WORDS))))
+    with engine.begin() as conn:
+        conn.execute(insert(Project), [{"name": "bench", "created_at": now, "updated_at": now}])
+        for start in range(0, tickets, BATCH):
+            conn.execute(
+                insert(Ticket),
+                [
+                    {
+                        "project_id": 1,
+                        "title": " ".join(rng.choices(WORDS, cum_weights=cum_weights, k=5)),
+                        "description": " ".join(rng.choices(WORDS, cum_weights=cum_weights, k=30)),
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for _ in range(min(BATCH, tickets - start))
+                ],
+            )
+
+
+def fts_search(db: Session, q: str, page: PageParams) -> int:
+    return len(db.execute(TicketSearch(q=q, project_id=None, status=None).stmt(page)).all())
+
+
+def like_search(db: Session, q: str, page: PageParams) -> int:
+    stmt = select(Ticket.id).limit(page.limit + 1)
+    for word in q.rstrip("*").split():
+        pattern = f"%{word.rstrip('*')}%"
+        stmt = stmt.where(or_(Ticket.title.like(pattern), Ticket.description.like(pattern)))
+    return len(db.execute(stmt).all())
+
+
+def _median_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tickets", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    page = PageParams(limit=50, cursor=None)
+    with temp_engine() as engine:
+        start = time.perf_counter()
+        _seed(engine, args.tickets, random.Random(args.seed))
+        print(f"seed {args.tickets} tickets: {time.perf_counter() - start:.1f}s")
+        print(f"{'query':<18} {'path':<5} {'median ms':>10} {'hits':>5}")
+        with Session(engine) as db:
+            for q in QUERIES:
+                for name, path in (("fts", fts_search), ("like", like_search)):
+                    hits = path(db, q, page)
+                    ms = _median_ms(lambda path=path, q=q: path(db, q, page), args.repeat)
+                    print(f"{q:<18} {name:<5} {ms:>10.1f} {hits:>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,8 @@ from sqlalchemy import engine_from_config, pool
 
 # 1) Importer settings & metadata
 from app.core.config import settings
-from app.db.base import Base  # Base declarative
+from app.db import models  # noqa: F401  (enregistre les tables dans Base.metadata)
+from app.db.base import Base, include_name  # Base declarative
 
 target_metadata = Base.metadata
 
@@ -19,7 +20,12 @@ if config.config_file_name is not None:
 
 def run_migrations_offline():
     url = config.get_main_option("sqlalchemy.url")
-    context.configure(url=url, target_metadata=target_metadata, literal_binds=True)
+    context.configure(
+        url=url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        include_name=include_name,
+    )
     with context.begin_transaction():
         context.run_migrations()
 
@@ -31,7 +37,9 @@ def run_migrations_online():
         poolclass=pool.NullPool,
     )
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection, target_metadata=target_metadata, include_name=include_name
+        )
         with context.begin_transaction():
             context.run_migrations()
 
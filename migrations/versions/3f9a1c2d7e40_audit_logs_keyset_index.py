@@ -0,0 +1,27 @@
+"""audit logs keyset index
+
+Revision ID: 3f9a1c2d7e40
+Revises: b1c7c2ecf870
+Create Date: 2026-10-18 09:12:41.318204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9a1c2d7e40"
+down_revision: Union[str, Sequence[str], None] = "b1c7c2ecf870"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_audit_logs_created_at_id", "audit_logs", ["created_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_audit_logs_created_at_id", table_name="audit_logs")
@@ -0,0 +1,54 @@
+"""audit log partitions catalog
+
+Revision ID: 5e8b3d9c1a27
+Revises: c4a7e2f91b35
+Create Date: 2026-10-18 16:12:40.218733
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "5e8b3d9c1a27"
+down_revision: Union[str, Sequence[str], None] = "c4a7e2f91b35"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "audit_log_partitions",
+        sa.Column("name", sa.String(length=64), nullable=False),
+        sa.Column("period_start", sa.DateTime(), nullable=False),
+        sa.Column("period_end", sa.DateTime(), nullable=False),
+        sa.Column("row_count", sa.Integer(), nullable=False),
+        sa.Column("min_id", sa.Integer(), nullable=True),
+        sa.Column("max_id", sa.Integer(), nullable=True),
+        sa.Column("archive_path", sa.String(length=1024), nullable=True),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.create_index(
+        op.f("ix_audit_log_partitions_period_start"),
+        "audit_log_partitions",
+        ["period_start"],
+        unique=False,
+    )
+    # AUTOINCREMENT : un id transféré vers une partition n'est jamais réattribué
+    with op.batch_alter_table(
+        "audit_logs", recreate="always", table_kwargs={"sqlite_autoincrement": True}
+    ):
+        pass
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table(
+        "audit_logs", recreate="always", table_kwargs={"sqlite_autoincrement": False}
+    ):
+        pass
+    op.drop_index(op.f("ix_audit_log_partitions_period_start"), table_name="audit_log_partitions")
+    op.drop_table("audit_log_partitions")
@@ -0,0 +1,35 @@
+"""tickets filter indexes
+
+Revision ID: 8d2e5b7a4c19
+Revises: 3f9a1c2d7e40
+Create Date: 2026-10-18 10:04:17.552930
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8d2e5b7a4c19"
+down_revision: Union[str, Sequence[str], None] = "3f9a1c2d7e40"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_tickets_project_status", "tickets", ["project_id", "status"], unique=False)
+    op.create_index(
+        "ix_tickets_assignee_status", "tickets", ["assignee_id", "status"], unique=False
+    )
+    op.create_index("ix_tickets_created_at_id", "tickets", ["created_at", "id"], unique=False)
+    op.create_index("ix_tickets_updated_at_id", "tickets", ["updated_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tickets_updated_at_id", table_name="tickets")
+    op.drop_index("ix_tickets_created_at_id", table_name="tickets")
+    op.drop_index("ix_tickets_assignee_status", table_name="tickets")
+    op.drop_index("ix_tickets_project_status", table_name="tickets")
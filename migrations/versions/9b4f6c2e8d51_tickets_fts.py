@@ -0,0 +1,63 @@
+"""tickets full-text index (fts5)
+
+Revision ID: 9b4f6c2e8d51
+Revises: 5e8b3d9c1a27
+Create Date: 2026-10-18 18:02:11.504317
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9b4f6c2e8d51"
+down_revision: Union[str, Sequence[str], None] = "5e8b3d9c1a27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# copie figée de app.db.fts au moment de la migration
+DDL = (
+    """
+    CREATE VIRTUAL TABLE tickets_fts USING fts5(
+        title, description,
+        content='tickets', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER tickets_fts_ai AFTER INSERT ON tickets BEGIN
+        INSERT INTO tickets_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER tickets_fts_ad AFTER DELETE ON tickets BEGIN
+        INSERT INTO tickets_fts(tickets_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER tickets_fts_au AFTER UPDATE OF title, description ON tickets BEGIN
+        INSERT INTO tickets_fts(tickets_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO tickets_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for statement in DDL:
+        op.execute(statement)
+    # indexe les tickets existants
+    op.execute("INSERT INTO tickets_fts(tickets_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for trigger in ("tickets_fts_au", "tickets_fts_ad", "tickets_fts_ai"):
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS tickets_fts")
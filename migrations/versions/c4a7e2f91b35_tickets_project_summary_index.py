@@ -0,0 +1,35 @@
+"""tickets project summary covering index
+
+Revision ID: c4a7e2f91b35
+Revises: 8d2e5b7a4c19
+Create Date: 2026-10-18 14:36:02.907114
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4a7e2f91b35"
+down_revision: Union[str, Sequence[str], None] = "8d2e5b7a4c19"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # remplace (project_id, status) : même préfixe, mais couvre aussi l'agrégat
+    op.drop_index("ix_tickets_project_status", table_name="tickets")
+    op.create_index(
+        "ix_tickets_project_status_priority",
+        "tickets",
+        ["project_id", "status", "priority", "assignee_id", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tickets_project_status_priority", table_name="tickets")
+    op.create_index("ix_tickets_project_status", "tickets", ["project_id", "status"], unique=False)
@@ -0,0 +1,102 @@
+"""change feed table and triggers (tickets, projects)
+
+Revision ID: e2a8c5f13b70
+Revises: 9b4f6c2e8d51
+Create Date: 2026-10-18 21:36:05.118240
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "e2a8c5f13b70"
+down_revision: Union[str, Sequence[str], None] = "9b4f6c2e8d51"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# copie figée de app.db.changes au moment de la migration
+_NOW = "strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')"
+
+_TICKET_JSON = """json_object(
+    'id', new.id, 'project_id', new.project_id, 'title', new.title,
+    'description', new.description, 'priority', new.priority, 'status', new.status,
+    'assignee_id', new.assignee_id,
+    'created_at', replace(new.created_at, ' ', 'T'),
+    'updated_at', replace(new.updated_at, ' ', 'T')
+)"""
+
+_PROJECT_JSON = """json_object(
+    'id', new.id, 'name', new.name, 'description', new.description,
+    'status', new.status, 'owner_id', new.owner_id,
+    'created_at', replace(new.created_at, ' ', 'T'),
+    'updated_at', replace(new.updated_at, ' ', 'T')
+)"""
+
+TRIGGERS = {
+    "changes_tickets_ai": f"""
+    CREATE TRIGGER changes_tickets_ai AFTER INSERT ON tickets BEGIN
+        INSERT INTO changes(entity, entity_id, project_id, op, data, created_at)
+        VALUES ('ticket', new.id, new.project_id, 'create', {_TICKET_JSON}, {_NOW});
+    END
+    """,
+    "changes_tickets_au": f"""
+    CREATE TRIGGER changes_tickets_au AFTER UPDATE ON tickets BEGIN
+        INSERT INTO changes(entity, entity_id, project_id, op, data, created_at)
+        VALUES ('ticket', new.id, new.project_id, 'update', {_TICKET_JSON}, {_NOW});
+    END
+    """,
+    "changes_tickets_ad": f"""
+    CREATE TRIGGER changes_tickets_ad AFTER DELETE ON tickets BEGIN
+        INSERT INTO changes(entity, entity_id, project_id, op, data, created_at)
+        VALUES ('ticket', old.id, old.project_id, 'delete', NULL, {_NOW});
+    END
+    """,
+    "changes_projects_ai": f"""
+    CREATE TRIGGER changes_projects_ai AFTER INSERT ON projects BEGIN
+        INSERT INTO changes(entity, entity_id, project_id, op, data, created_at)
+        VALUES ('project', new.id, new.id, 'create', {_PROJECT_JSON}, {_NOW});
+    END
+    """,
+    "changes_projects_au": f"""
+    CREATE TRIGGER changes_projects_au AFTER UPDATE ON projects BEGIN
+        INSERT INTO changes(entity, entity_id, project_id, op, data, created_at)
+        VALUES ('project', new.id, new.id, 'update', {_PROJECT_JSON}, {_NOW});
+    END
+    """,
+    "changes_projects_ad": f"""
+    CREATE TRIGGER changes_projects_ad AFTER DELETE ON projects BEGIN
+        INSERT INTO changes(entity, entity_id, project_id, op, data, created_at)
+        VALUES ('project', old.id, old.id, 'delete', NULL, {_NOW});
+    END
+    """,
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "changes",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("entity", sa.String(length=16), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("op", sa.String(length=8), nullable=False),
+        sa.Column("data", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sqlite_autoincrement=True,
+    )
+    op.create_index("ix_changes_project_id_id", "changes", ["project_id", "id"], unique=False)
+    for statement in TRIGGERS.values():
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for trigger in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.drop_index("ix_changes_project_id_id", table_name="changes")
+    op.drop_table("changes")
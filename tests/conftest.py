@@ -19,14 +19,15 @@ import uuid
 
 from fastapi.testclient import TestClient
 import pytest
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
-from app.api.deps import get_db
-from app.core.security import get_password_hash
+from app.api.deps import get_db, get_read_db
+from app.api.principal import principal_cache
+from app.core.security import claims_cache, get_password_hash
 from app.db.base import Base
 from app.db.enums import ProjectStatus, TicketPriority, TicketStatus, UserRole
 from app.db.models import AuditLog, Project, Ticket, User
+from app.db.session import create_db_engine
 from app.main import app
 
 
@@ -39,9 +40,9 @@ def engine():
 
     test_db_url = f"sqlite:///{db_path}"
 
-    eng = create_engine(
+    # même profil (pragmas, pool) que l'application
+    eng = create_db_engine(
         test_db_url,
-        connect_args={"check_same_thread": False},
         echo=False,  # Mettre à True pour voir les requêtes SQL
     )
 
@@ -50,11 +51,13 @@ def engine():
 
     yield eng
 
-    # Nettoyage : supprimer le fichier temporaire à la fin
-    try:
-        os.unlink(db_path)
-    except (OSError, FileNotFoundError, PermissionError):
-        pass
+    # Nettoyage : supprimer le fichier temporaire (et les fichiers WAL) à la fin
+    eng.dispose()
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.unlink(db_path + suffix)
+        except (OSError, FileNotFoundError, PermissionError):
+            pass
 
 
 @pytest.fixture(scope="function")
@@ -77,6 +80,16 @@ def db_session(engine):
             conn.commit()
 
 
+@pytest.fixture(autouse=True)
+def clear_auth_caches():
+    """Les ids sont réutilisés d'un test à l'autre : on repart de caches vides."""
+    principal_cache.clear()
+    claims_cache.clear()
+    yield
+    principal_cache.clear()
+    claims_cache.clear()
+
+
 @pytest.fixture(scope="function")
 def client(db_session):
     """
@@ -90,8 +103,9 @@ def client(db_session):
         finally:
             pass
 
-    # Remplacer la dépendance
+    # Remplacer la dépendance (lectures comprises : une seule session par test)
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
 
     # Créer le client de test
     with TestClient(app) as test_client:
@@ -0,0 +1,197 @@
+"""
+Pile asynchrone (DB_ASYNC=true) : mêmes contrats HTTP que les routeurs sync.
+"""
+
+import asyncio
+from datetime import datetime
+from http import HTTPStatus
+
+from fastapi.testclient import TestClient
+import pytest
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.api import audit_routing
+from app.api.deps import get_async_db, get_db, get_read_db
+from app.api.v1 import tickets
+from app.api.v1.aio import tickets as aio_tickets
+from app.core.config import settings
+from app.db.audit_partitions import (
+    archive_expired,
+    close_archives,
+    open_archive,
+    partition_table,
+    rollover,
+)
+from app.db.enums import UserRole
+from app.main import create_app, with_async_routes
+
+
+@pytest.fixture
+def async_client(engine, db_session, monkeypatch):
+    monkeypatch.setattr(settings, "DB_ASYNC", True)
+    aio_app = create_app()
+
+    # NullPool : aucune connexion aiosqlite ne survit à la boucle du TestClient
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{engine.url.database}", poolclass=NullPool
+    )
+    factory = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with factory() as session:
+            yield session
+
+    def override_get_db():
+        yield db_session
+
+    aio_app.dependency_overrides[get_async_db] = override_get_async_db
+    aio_app.dependency_overrides[get_db] = override_get_db
+    aio_app.dependency_overrides[get_read_db] = override_get_db
+    with TestClient(aio_app) as test_client:
+        yield test_client
+
+
+def test_async_routes_replace_sync_handlers():
+    merged = with_async_routes(tickets.router, aio_tickets.router)
+    routes = {(r.path, m): r.endpoint for r in merged.routes for m in r.methods}
+    assert routes[("/{ticket_id}", "GET")] is aio_tickets.get_ticket
+    # pas d'équivalent async : l'export reste servi par le routeur sync
+    assert routes[("/export", "GET")] is tickets.export_tickets
+    # l'ordre de déclaration est conservé (/export avant /{ticket_id})
+    paths = [r.path for r in merged.routes]
+    assert paths.index("/export") < paths.index("/{ticket_id}")
+
+
+def test_async_export_still_served(async_client: TestClient, ticket_factory):
+    ticket = ticket_factory()
+    r = async_client.get("/api/v1/tickets/export")
+    assert r.status_code == HTTPStatus.OK
+    assert str(ticket.id) in r.text
+
+
+def test_async_ticket_crud(async_client: TestClient, user_factory, project_factory):
+    user = user_factory()
+    project = project_factory(owner_id=user.id)
+
+    r = async_client.post(
+        "/api/v1/tickets", json={"title": "Async", "project_id": project.id, "assignee_id": user.id}
+    )
+    assert r.status_code == HTTPStatus.CREATED, r.text
+    ticket_id = r.json()["id"]
+
+    r = async_client.put(f"/api/v1/tickets/{ticket_id}", json={"status": "done"})
+    assert r.status_code == HTTPStatus.OK
+    assert r.json()["status"] == "done"
+
+    r = async_client.get("/api/v1/tickets", params={"status": "done"})
+    assert [t["id"] for t in r.json()["items"]] == [ticket_id]
+    conditional = {"If-None-Match": r.headers["etag"]}
+    r = async_client.get("/api/v1/tickets", params={"status": "done"}, headers=conditional)
+    assert r.status_code == HTTPStatus.NOT_MODIFIED
+
+    etag = async_client.get(f"/api/v1/tickets/{ticket_id}").headers["etag"]
+    r = async_client.get(f"/api/v1/tickets/{ticket_id}", headers={"If-None-Match": etag})
+    assert r.status_code == HTTPStatus.NOT_MODIFIED
+
+    assert async_client.delete(f"/api/v1/tickets/{ticket_id}").status_code == HTTPStatus.NO_CONTENT
+    assert async_client.get(f"/api/v1/tickets/{ticket_id}").status_code == HTTPStatus.NOT_FOUND
+
+
+def test_async_ticket_search(async_client: TestClient, ticket_factory):
+    hit = ticket_factory(title="Réseau coupé")
+    ticket_factory(title="Imprimante")
+
+    r = async_client.get("/api/v1/tickets/search", params={"q": "reseau"})
+    assert r.status_code == HTTPStatus.OK
+    assert [t["id"] for t in r.json()["items"]] == [hit.id]
+    assert "<mark>" in r.json()["items"][0]["snippet"]
+
+
+def test_async_ticket_bulk(async_client: TestClient, project_factory):
+    project = project_factory()
+    ops = [{"op": "create", "data": {"title": f"T{i}", "project_id": project.id}} for i in range(3)]
+
+    r = async_client.post("/api/v1/tickets:bulk", json={"operations": ops})
+    assert r.status_code == HTTPStatus.OK, r.text
+    assert r.json()["succeeded"] == 3
+
+
+def test_async_projects_require_role(async_client: TestClient, user_factory):
+    user_factory(email="aio@example.com", role=UserRole.manager, password="pw")
+    tok = async_client.post(
+        "/auth/login", json={"email": "aio@example.com", "password": "pw"}
+    ).json()["access_token"]
+
+    assert async_client.get("/projects").status_code == HTTPStatus.UNAUTHORIZED
+    r = async_client.get("/projects", headers={"Authorization": f"Bearer {tok}"})
+    assert r.status_code == HTTPStatus.OK
+    assert r.json()["items"] == []
+
+
+def test_async_users_and_audit_logs(async_client: TestClient, user_factory, audit_log_factory):
+    user = user_factory(full_name="Async User")
+    log = audit_log_factory(record_id=user.id)
+
+    r = async_client.put(f"/users/{user.id}", json={"role": "agent"})
+    assert r.status_code == HTTPStatus.OK
+    assert r.json()["role"] == "agent"
+
+    r = async_client.get("/api/v1/audit-logs", params={"table_name": "test_table"})
+    assert [item["id"] for item in r.json()["items"]] == [log.id]
+
+    # l'UPDATE de la pile async est journalisé automatiquement
+    r = async_client.get("/api/v1/audit-logs", params={"table_name": "users", "action": "UPDATE"})
+    [entry] = r.json()["items"]
+    assert entry["record_id"] == user.id
+    assert entry["payload"] == {"role": {"old": "viewer", "new": "agent"}}
+    assert async_client.get("/api/v1/audit-logs/999").status_code == HTTPStatus.NOT_FOUND
+
+
+def test_async_sparse_fields(async_client: TestClient, ticket_factory, user_factory):
+    ticket = ticket_factory(title="Sparse")
+    user = user_factory(email="sparse-async@example.com")
+
+    r = async_client.get("/api/v1/tickets", params={"fields": "id,title"})
+    assert r.json()["items"] == [{"id": ticket.id, "title": "Sparse"}]
+    r = async_client.get(f"/api/v1/tickets/{ticket.id}", params={"fields": "status"})
+    assert r.json() == {"status": "open"}
+    r = async_client.get(f"/users/{user.id}", params={"fields": "email"})
+    assert r.json() == {"email": "sparse-async@example.com"}
+    r = async_client.get("/api/v1/tickets", params={"fields": "id", "include": "project"})
+    assert r.json()["items"][0]["project"]["id"] == ticket.project_id
+    r = async_client.get("/api/v1/audit-logs", params={"fields": "id,bogus"})
+    assert r.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_async_audit_archives_read_off_the_loop(
+    async_client: TestClient, engine, audit_log_factory, tmp_path, monkeypatch
+):
+    log = audit_log_factory(action="archived", created_at=datetime(2026, 7, 15))
+    opened = []
+
+    def spy(archive_path: str):
+        try:
+            asyncio.get_running_loop()
+            opened.append("event loop")
+        except RuntimeError:
+            opened.append("worker thread")
+        return open_archive(archive_path)
+
+    monkeypatch.setattr(audit_routing, "open_archive", spy)
+    now = datetime(2026, 10, 18, 12, 0)
+    try:
+        rollover(engine, now=now)
+        archive_expired(engine, archive_dir=str(tmp_path), retention_months=2, now=now)
+
+        r = async_client.get("/api/v1/audit-logs", params={"include_archived": True})
+        assert [item["id"] for item in r.json()["items"]] == [log.id]
+        assert async_client.get(f"/api/v1/audit-logs/{log.id}").json()["action"] == "archived"
+    finally:
+        close_archives()
+        with engine.begin() as conn:
+            for name in inspect(conn).get_table_names():
+                if name.startswith("audit_logs_"):
+                    partition_table(name).drop(conn)
+    assert opened == ["worker thread"] * 2
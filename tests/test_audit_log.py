@@ -1,4 +1,14 @@
+from datetime import datetime
+import json
+
 from fastapi.testclient import TestClient
+import pytest
+from sqlalchemy import inspect
+
+from app.api.deps import get_audit_buffer
+from app.db.audit_buffer import AuditLogBuffer
+from app.db.audit_partitions import archive_expired, close_archives, partition_table, rollover
+from app.main import app
 
 
 def test_create_audit_log(client: TestClient, user_factory):
@@ -29,13 +39,67 @@ def test_list_audit_logs(client: TestClient, audit_log_factory):
     response = client.get("/api/v1/audit-logs")
     assert response.status_code == 200
 
-    data = response.json()
+    data = response.json()["items"]
     assert len(data) == 2
     # Les logs sont triés par date décroissante
     assert data[0]["action"] in ["CREATE", "UPDATE"]
     assert data[1]["action"] in ["CREATE", "UPDATE"]
 
 
+def test_list_audit_logs_cursor(client: TestClient, audit_log_factory):
+    logs = [audit_log_factory(action=f"A{i}") for i in range(5)]
+
+    r1 = client.get("/api/v1/audit-logs", params={"limit": 2})
+    page1 = r1.json()
+    assert [log["id"] for log in page1["items"]] == [logs[4].id, logs[3].id]
+    assert page1["next_cursor"]
+
+    r2 = client.get("/api/v1/audit-logs", params={"limit": 2, "cursor": page1["next_cursor"]})
+    page2 = r2.json()
+    assert [log["id"] for log in page2["items"]] == [logs[2].id, logs[1].id]
+
+    r3 = client.get("/api/v1/audit-logs", params={"limit": 2, "cursor": page2["next_cursor"]})
+    page3 = r3.json()
+    assert [log["id"] for log in page3["items"]] == [logs[0].id]
+    assert page3["next_cursor"] is None
+
+
+def test_audit_logs_sparse_fields(client: TestClient, audit_log_factory):
+    logs = [audit_log_factory(action=f"A{i}") for i in range(3)]
+
+    page = client.get("/api/v1/audit-logs", params={"fields": "action", "limit": 2}).json()
+    assert page["items"] == [{"action": "A2"}, {"action": "A1"}]
+    params = {"fields": "action", "cursor": page["next_cursor"]}
+    assert client.get("/api/v1/audit-logs", params=params).json()["items"] == [{"action": "A0"}]
+
+    r = client.get(f"/api/v1/audit-logs/{logs[0].id}", params={"fields": "id,table_name"})
+    assert set(r.json()) == {"id", "table_name"}
+    assert client.get("/api/v1/audit-logs", params={"fields": "nope"}).status_code == 422
+
+
+def test_list_audit_logs_filters(client: TestClient, audit_log_factory):
+    audit_log_factory(table_name="tickets", record_id=1)
+    match = audit_log_factory(table_name="tickets", record_id=2)
+    audit_log_factory(table_name="projects", record_id=2)
+
+    response = client.get("/api/v1/audit-logs", params={"table_name": "tickets", "record_id": 2})
+    assert response.status_code == 200
+    assert [log["id"] for log in response.json()["items"]] == [match.id]
+
+
+def test_export_audit_logs(client: TestClient, audit_log_factory):
+    first = audit_log_factory(table_name="tickets", payload={"k": "v"})
+    second = audit_log_factory(table_name="tickets")
+    audit_log_factory(table_name="users")
+
+    response = client.get("/api/v1/audit-logs/export", params={"table_name": "tickets"})
+    assert response.status_code == 200
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["id"] for r in rows] == [second.id, first.id]
+    assert rows[1]["payload"] == {"k": "v"}
+
+
 def test_get_audit_log(client: TestClient, audit_log_factory):
     audit_log = audit_log_factory(action="DELETE")
 
@@ -51,3 +115,205 @@ def test_get_audit_log_not_found(client: TestClient):
     response = client.get("/api/v1/audit-logs/999")
     assert response.status_code == 404
     assert response.json()["detail"] == "Audit log not found"
+
+
+@pytest.fixture
+def buffered(engine, client):
+    """Active l'ingestion différée sur la base de test."""
+
+    def _buffered(**kwargs):
+        buffer = AuditLogBuffer(engine, **kwargs)
+        app.dependency_overrides[get_audit_buffer] = lambda: buffer
+        return buffer
+
+    return _buffered
+
+
+def test_create_audit_log_buffered(client: TestClient, buffered, user_factory):
+    user = user_factory()
+    buffer = buffered(flush_ms=10, batch_size=2)
+    buffer.start()
+
+    for action in ("CREATE", "UPDATE", "DELETE"):
+        response = client.post(
+            "/api/v1/audit-logs",
+            json={"action": action, "table_name": "billing", "record_id": user.id},
+        )
+        assert response.status_code == 202
+        assert response.json() == {"status": "queued"}
+
+    buffer.stop()
+
+    items = client.get("/api/v1/audit-logs", params={"table_name": "billing"}).json()["items"]
+    assert sorted(i["action"] for i in items) == ["CREATE", "DELETE", "UPDATE"]
+
+    stats = client.get("/api/v1/audit-logs/buffer/stats").json()
+    assert stats["enabled"] is True
+    assert stats["events"] == 3
+    assert stats["queued"] == 0
+    assert stats["batches"] >= 2
+
+
+def test_create_audit_log_buffer_full(client: TestClient, buffered):
+    # thread non démarré : la file ne se vide pas
+    buffered(max_queue=1, put_timeout=0.01)
+    payload = {"action": "CREATE", "table_name": "users", "record_id": 1}
+
+    assert client.post("/api/v1/audit-logs", json=payload).status_code == 202
+    response = client.post("/api/v1/audit-logs", json=payload)
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+    stats = client.get("/api/v1/audit-logs/buffer/stats").json()
+    assert stats["rejected"] == 1
+    assert stats["queued"] == 1
+
+
+def test_audit_buffer_isolates_bad_rows(client: TestClient, buffered, caplog):
+    # thread non démarré : écriture synchrone par flush
+    buffer = buffered(flush_ms=1, batch_size=8)
+    for i in range(7):
+        buffer.submit("CREATE", "isolated", i)
+    buffer.submit(None, "isolated", 99)  # action NOT NULL : tout le lot est refusé
+
+    with caplog.at_level("ERROR", logger="app.db.audit_buffer.dead_letter"):
+        assert buffer.flush() == 8
+
+    items = client.get("/api/v1/audit-logs", params={"table_name": "isolated"}).json()["items"]
+    assert sorted(i["record_id"] for i in items) == list(range(7))
+    [record] = [r for r in caplog.records if r.name == "app.db.audit_buffer.dead_letter"]
+    assert json.loads(record.getMessage())["record_id"] == 99
+
+    stats = client.get("/api/v1/audit-logs/buffer/stats").json()
+    assert stats["events"] == 7
+    assert stats["dropped"] == 1
+    # 3 essais du lot entier, puis une moitié refusée par niveau (8 -> 4 -> 2 -> 1)
+    assert stats["errors"] == 6
+
+
+def test_audit_buffer_stats_disabled(client: TestClient):
+    response = client.get("/api/v1/audit-logs/buffer/stats")
+    assert response.json() == {"enabled": False}
+
+
+def _trail(client: TestClient, table_name: str) -> list[dict]:
+    params = {"table_name": table_name}
+    items = client.get("/api/v1/audit-logs", params=params).json()["items"]
+    return sorted(items, key=lambda i: i["id"])
+
+
+def test_audit_trail_ticket_lifecycle(client: TestClient, project_factory):
+    project = project_factory()
+
+    created = client.post("/api/v1/tickets", json={"title": "T", "project_id": project.id}).json()
+    client.put(f"/api/v1/tickets/{created['id']}", json={"status": "done"})
+    client.delete(f"/api/v1/tickets/{created['id']}")
+
+    create, update, delete = _trail(client, "tickets")
+    assert [e["action"] for e in (create, update, delete)] == ["CREATE", "UPDATE", "DELETE"]
+    assert {e["record_id"] for e in (create, update, delete)} == {created["id"]}
+    assert create["payload"]["title"] == "T"
+    assert create["payload"]["status"] == "open"
+    # diff seul : les colonnes inchangées n'apparaissent pas
+    assert set(update["payload"]) == {"status", "updated_at"}
+    assert update["payload"]["status"] == {"old": "open", "new": "done"}
+    assert delete["payload"] is None
+
+
+def test_audit_trail_records_actor(client: TestClient, auth_headers):
+    headers, manager = auth_headers(role="manager")
+
+    response = client.post("/projects", json={"name": "Audited"}, headers=headers)
+    assert response.status_code == 201
+
+    [entry] = _trail(client, "projects")
+    assert entry["user_id"] == manager.id
+    assert entry["record_id"] == response.json()["id"]
+
+
+def test_audit_trail_redacts_password(client: TestClient, user_factory):
+    user_factory(email="secret@example.com")
+
+    [entry] = _trail(client, "users")
+    assert entry["payload"]["email"] == "secret@example.com"
+    assert entry["payload"]["password_hash"] == "***"
+
+
+def test_audit_trail_bulk(client: TestClient, ticket_factory, project_factory):
+    ticket = ticket_factory()
+    project = project_factory()
+    ops = [
+        {"op": "create", "data": {"title": "Bulk", "project_id": project.id}},
+        {"op": "update", "id": ticket.id, "data": {"priority": "high"}},
+    ]
+
+    results = client.post("/api/v1/tickets:bulk", json={"operations": ops}).json()["results"]
+
+    *_, create, update = _trail(client, "tickets")
+    assert (create["action"], create["record_id"]) == ("CREATE", results[0]["id"])
+    assert (update["action"], update["record_id"]) == ("UPDATE", ticket.id)
+    assert update["payload"]["priority"] == {"new": "high"}
+
+
+NOW = datetime(2026, 10, 18, 12, 0)
+
+
+@pytest.fixture
+def monthly_logs(engine, audit_log_factory):
+    """Ids d'un log par mois de juillet à octobre 2026, puis nettoyage des partitions."""
+    # ids seulement : les instances ORM disparaissent avec le transfert
+    yield [
+        audit_log_factory(action=f"M{month}", created_at=datetime(2026, month, 15)).id
+        for month in (7, 8, 9, 10)
+    ]
+    close_archives()
+    with engine.begin() as conn:
+        for name in inspect(conn).get_table_names():
+            if name.startswith("audit_logs_"):
+                partition_table(name).drop(conn)
+
+
+def test_rollover_moves_past_months(client: TestClient, engine, monthly_logs):
+    assert rollover(engine, now=NOW) == [
+        "audit_logs_202607",
+        "audit_logs_202608",
+        "audit_logs_202609",
+    ]
+    assert rollover(engine, now=NOW) == []
+
+    # les lectures traversent table chaude + partitions, dans l'ordre keyset
+    page1 = client.get("/api/v1/audit-logs", params={"limit": 3}).json()
+    assert [log["action"] for log in page1["items"]] == ["M10", "M9", "M8"]
+    page2 = client.get("/api/v1/audit-logs", params={"cursor": page1["next_cursor"]}).json()
+    assert [log["action"] for log in page2["items"]] == ["M7"]
+
+    params = {"created_after": "2026-08-01T00:00:00", "created_before": "2026-09-01T00:00:00"}
+    items = client.get("/api/v1/audit-logs", params=params).json()["items"]
+    assert [log["action"] for log in items] == ["M8"]
+
+    response = client.get(f"/api/v1/audit-logs/{monthly_logs[0]}")
+    assert response.json()["action"] == "M7"
+
+    export = client.get("/api/v1/audit-logs/export").text.splitlines()
+    assert [json.loads(line)["action"] for line in export] == ["M10", "M9", "M8", "M7"]
+
+
+def test_archive_expired_partitions(client: TestClient, engine, monthly_logs, tmp_path):
+    rollover(engine, now=NOW)
+
+    archived = archive_expired(engine, archive_dir=str(tmp_path), retention_months=2, now=NOW)
+    assert archived == ["audit_logs_202607"]
+    archive = tmp_path / "audit_logs_202607.db.gz"
+    assert archive.exists()
+    assert archive.stat().st_mode & 0o222 == 0  # lecture seule
+    assert "audit_logs_202607" not in inspect(engine).get_table_names()
+
+    items = client.get("/api/v1/audit-logs").json()["items"]
+    assert [log["action"] for log in items] == ["M10", "M9", "M8"]
+
+    # lecture à la demande de l'archive compressée
+    items = client.get("/api/v1/audit-logs", params={"include_archived": True}).json()["items"]
+    assert [log["action"] for log in items] == ["M10", "M9", "M8", "M7"]
+    response = client.get(f"/api/v1/audit-logs/{monthly_logs[0]}")
+    assert response.status_code == 200
+    assert response.json()["action"] == "M7"
@@ -1,5 +1,21 @@
 from http import HTTPStatus
 
+from fastapi import HTTPException
+import pytest
+from sqlalchemy import event
+
+from app.api.principal import principal_cache
+from app.core.hashing import password_pool
+from app.core.security import (
+    claims_cache,
+    create_access_token,
+    decode_token,
+    hash_password,
+    needs_rehash,
+    pbkdf2,
+    verify_password,
+    verify_token,
+)
 from app.db.models import UserRole
 
 
@@ -26,3 +42,135 @@ def test_protected_access(client, user_factory):
     # appel d’une route protégée (adapte l’URL à ta route protégée)
     r = client.get("/projects", headers={"Authorization": f"Bearer {tok}"})
     assert r.status_code == 200
+
+
+def test_principal_is_cached(client, db_session, user_factory):
+    user_factory(email="cache@example.com", role=UserRole.admin, password="pw")
+    tok = client.post("/auth/login", json={"email": "cache@example.com", "password": "pw"}).json()[
+        "access_token"
+    ]
+    headers = {"Authorization": f"Bearer {tok}"}
+
+    statements = []
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db_session.bind, "before_cursor_execute", listener)
+    try:
+        assert client.get("/projects", headers=headers).status_code == 200
+        first = len(statements)
+        assert client.get("/projects", headers=headers).status_code == 200
+        second = len(statements) - first
+    finally:
+        event.remove(db_session.bind, "before_cursor_execute", listener)
+
+    assert second == first - 1
+    stats = principal_cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_principal_cache_invalidated_on_role_change(client, user_factory):
+    user = user_factory(email="demote@example.com", role=UserRole.admin, password="pw")
+    tok = client.post("/auth/login", json={"email": "demote@example.com", "password": "pw"}).json()[
+        "access_token"
+    ]
+    headers = {"Authorization": f"Bearer {tok}"}
+    assert client.get("/projects", headers=headers).status_code == 200
+
+    r = client.put(f"/users/{user.id}", json={"role": "viewer"})
+    assert r.status_code == HTTPStatus.OK
+
+    assert client.get("/projects", headers=headers).status_code == HTTPStatus.FORBIDDEN
+
+
+def test_principal_cache_invalidated_on_delete(client, user_factory):
+    user = user_factory(email="gone@example.com", role=UserRole.admin, password="pw")
+    tok = client.post("/auth/login", json={"email": "gone@example.com", "password": "pw"}).json()[
+        "access_token"
+    ]
+    headers = {"Authorization": f"Bearer {tok}"}
+    assert client.get("/projects", headers=headers).status_code == 200
+
+    assert client.delete(f"/users/{user.id}").status_code == HTTPStatus.NO_CONTENT
+
+    assert client.get("/projects", headers=headers).status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_hash_password_uses_random_salt_and_cost():
+    first = hash_password("secret", iterations=1000)
+    second = hash_password("secret", iterations=1000)
+    assert first != second
+    assert first.startswith("pbkdf2_sha256$1000$")
+    assert verify_password("secret", first)
+    assert not verify_password("wrong", first)
+
+
+@pytest.mark.parametrize("iterations", ["0", "²", "-1", ""])
+def test_invalid_iteration_count_fails_verification(iterations):
+    assert not verify_password("secret", f"pbkdf2_sha256${iterations}$salt$00")
+
+
+def test_login_with_corrupt_hash_is_unauthorized(client, db_session, user_factory):
+    user = user_factory(email="corrupt@example.com", password="pw")
+    user.password_hash = "pbkdf2_sha256$0$salt$00"
+    db_session.commit()
+
+    r = client.post("/auth/login", json={"email": "corrupt@example.com", "password": "pw"})
+    assert r.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_login_upgrades_legacy_hash(client, db_session, user_factory):
+    user = user_factory(email="legacy@example.com")
+    salt = "opshub_salt_for_testing"
+    user.password_hash = f"pbkdf2_sha256${salt}${pbkdf2('old-pw', salt, 100000).hex()}"
+    db_session.commit()
+
+    r = client.post("/auth/login", json={"email": "legacy@example.com", "password": "old-pw"})
+    assert r.status_code == HTTPStatus.OK
+
+    db_session.refresh(user)
+    assert not needs_rehash(user.password_hash)
+    assert salt not in user.password_hash
+    assert verify_password("old-pw", user.password_hash)
+
+
+def test_login_fails_fast_when_hash_pool_saturated(client, user_factory, monkeypatch):
+    user_factory(email="busy@example.com", password="pw")
+    monkeypatch.setattr(password_pool, "max_pending", 0)
+
+    r = client.post("/auth/login", json={"email": "busy@example.com", "password": "pw"})
+    assert r.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert r.headers["retry-after"] == "1"
+
+
+def test_verified_claims_are_cached():
+    token = create_access_token(sub="claims@example.com")
+
+    first = decode_token(token)
+    second = verify_token(token)
+    assert first == second
+    assert first["sub"] == "claims@example.com"
+    assert claims_cache.stats()["hits"] == 1
+
+    # l'appelant reçoit une copie : le cache reste intact
+    first["sub"] = "tampered"
+    assert decode_token(token)["sub"] == "claims@example.com"
+
+
+def test_tampered_token_is_not_served_from_cache():
+    token = create_access_token(sub="claims@example.com")
+    decode_token(token)
+
+    header, payload, signature = token.split(".")
+    forged = f"{header}.{payload}.{signature[:-2]}AA"
+    with pytest.raises(HTTPException):
+        verify_token(forged)
+
+
+def test_expired_token_is_rejected():
+    token = create_access_token(sub="old@example.com", expires_minutes=-1)
+    with pytest.raises(HTTPException):
+        verify_token(token)
+    assert claims_cache.stats()["size"] == 0
@@ -0,0 +1,323 @@
+import asyncio
+from http import HTTPStatus
+import json
+from urllib.parse import urlencode
+
+import pytest
+from sqlalchemy import func, insert, select
+
+from app.api.deps import get_change_feed
+from app.db.change_feed import ChangeFeed, prune
+from app.db.enums import TicketStatus
+from app.db.models import Change, Project
+from app.db.seed import Dataset, seed_database
+from app.db.session import create_db_engine
+from app.main import app
+
+PATH = "/api/v1/changes/stream"
+
+
+class Stream:
+    """
+    Client SSE minimal branché directement sur l'application ASGI : le
+    TestClient (comme httpx.ASGITransport) attend la fin de la réponse.
+    """
+
+    def __init__(self, params: dict | None = None, headers: dict | None = None):
+        self.scope = {
+            "type": "http",
+            "asgi": {"version": "3.0", "spec_version": "2.3"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": PATH,
+            "raw_path": PATH.encode(),
+            "root_path": "",
+            "query_string": urlencode(params or {}, doseq=True).encode(),
+            "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+            "client": ("testclient", 50000),
+            "server": ("testserver", 80),
+        }
+        self.messages: asyncio.Queue = asyncio.Queue()
+        self.disconnected = asyncio.Event()
+        self.buffer = b""
+        self.frames: list[dict] = []
+
+    async def _receive(self):
+        await self.disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def __aenter__(self) -> "Stream":
+        self.task = asyncio.create_task(app(self.scope, self._receive, self.messages.put))
+        start = await asyncio.wait_for(self.messages.get(), 5)
+        self.status = start["status"]
+        self.headers = {k.decode(): v.decode() for k, v in start["headers"]}
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.disconnected.set()
+        await asyncio.wait_for(self.task, 5)
+
+    async def frame(self) -> dict:
+        while not self.frames:
+            message = await asyncio.wait_for(self.messages.get(), 5)
+            self.buffer += message.get("body", b"")
+            *done, self.buffer = self.buffer.split(b"\n\n")
+            self.frames += [_parse(frame) for frame in done]
+        return self.frames.pop(0)
+
+    async def events(self, count: int) -> list[dict]:
+        """Les `count` prochains événements (hors `retry` et battements de cœur)."""
+        events = []
+        while len(events) < count:
+            frame = await self.frame()
+            if "event" in frame:
+                events.append(frame)
+        return events
+
+
+def _parse(frame: bytes) -> dict:
+    fields = {}
+    for line in frame.decode().splitlines():
+        name, _, value = line.partition(": ")
+        fields[name or "comment"] = value
+    if "data" in fields:
+        fields["data"] = json.loads(fields["data"])
+    return fields
+
+
+@pytest.fixture
+def make_feed(engine):
+    def _make(**kwargs) -> ChangeFeed:
+        # lecture de la table très espacée par défaut : seuls les commits réveillent
+        kwargs = {"poll_ms": 60_000, "heartbeat": 60.0, **kwargs}
+        feed = ChangeFeed(engine, **kwargs)
+        app.dependency_overrides[get_change_feed] = lambda: feed
+        return feed
+
+    yield _make
+    app.dependency_overrides.pop(get_change_feed, None)
+
+
+def _last_seq(db_session) -> int:
+    return db_session.scalar(select(func.max(Change.id))) or 0
+
+
+def test_stream_pushes_changes_on_commit(db_session, make_feed, project_factory, ticket_factory):
+    feed = make_feed()
+
+    async def scenario():
+        async with Stream() as stream:
+            assert stream.status == HTTPStatus.OK
+            assert stream.headers["content-type"].startswith("text/event-stream")
+            assert await stream.frame() == {"retry": "3000"}
+
+            project = await asyncio.to_thread(project_factory, name="Feed")
+            ticket = await asyncio.to_thread(ticket_factory, project_id=project.id)
+            ticket.status = TicketStatus.done
+            await asyncio.to_thread(db_session.commit)
+            await asyncio.to_thread(db_session.delete, ticket)
+            await asyncio.to_thread(db_session.commit)
+
+            events = await stream.events(4)
+        await feed.stop()
+        return project, ticket, events
+
+    project, ticket, events = asyncio.run(scenario())
+    # l'assigné créé par la factory ne produit pas d'événement
+    assert [e["event"] for e in events] == [
+        "project.create",
+        "ticket.create",
+        "ticket.update",
+        "ticket.delete",
+    ]
+    seqs = [int(e["id"]) for e in events]
+    assert seqs == sorted(seqs) and [e["data"]["seq"] for e in events] == seqs
+    assert events[0]["data"]["data"]["name"] == "Feed"
+    created, updated, deleted = (e["data"] for e in events[1:])
+    assert created["id"] == ticket.id and created["project_id"] == project.id
+    assert created["data"]["status"] == "open"
+    assert updated["data"]["status"] == "done"
+    assert deleted["data"] is None
+
+
+def test_resume_from_last_event_id(db_session, make_feed, project_factory):
+    feed = make_feed()
+    first = project_factory(name="p0")
+    start = _last_seq(db_session)
+    for i in range(1, 4):
+        project_factory(name=f"p{i}")
+
+    async def scenario():
+        # anneau vide au démarrage : la reprise est relue dans la table
+        async with Stream(headers={"Last-Event-ID": str(start)}) as stream:
+            replayed = await stream.events(3)
+            catchups = feed.catchups
+            await asyncio.to_thread(project_factory, name="p4")
+            await asyncio.to_thread(project_factory, name="p5")
+            live = await stream.events(2)
+        # p4, p5 sont dans l'anneau : servis sans lecture en base
+        resume = int(live[0]["id"])
+        async with Stream(params={"last_event_id": resume}) as stream:
+            again = await stream.events(1)
+        await feed.stop()
+        return replayed, catchups, live, again
+
+    replayed, catchups, live, again = asyncio.run(scenario())
+    assert first.name == "p0"
+    assert [e["data"]["data"]["name"] for e in replayed] == ["p1", "p2", "p3"]
+    assert [e["data"]["data"]["name"] for e in live] == ["p4", "p5"]
+    assert [e["data"]["data"]["name"] for e in again] == ["p5"]
+    assert feed.catchups == catchups
+
+
+def test_project_filter(make_feed, project_factory, ticket_factory):
+    make_feed()
+    watched, other = project_factory(name="watched"), project_factory(name="other")
+
+    async def scenario():
+        async with Stream(params={"project_id": [watched.id]}) as stream:
+            await asyncio.to_thread(ticket_factory, project_id=other.id, title="hidden")
+            await asyncio.to_thread(ticket_factory, project_id=watched.id, title="shown")
+            return await stream.events(1)
+
+    (event,) = asyncio.run(scenario())
+    assert event["event"] == "ticket.create"
+    assert event["data"]["project_id"] == watched.id
+    assert event["data"]["data"]["title"] == "shown"
+
+
+def test_bulk_writes_are_streamed(client, make_feed, project_factory):
+    make_feed()
+    project = project_factory()
+    payload = {
+        "operations": [
+            {"op": "create", "data": {"title": f"bulk {i}", "project_id": project.id}}
+            for i in range(3)
+        ]
+    }
+
+    async def scenario():
+        async with Stream() as stream:
+            response = await asyncio.to_thread(client.post, "/api/v1/tickets:bulk", json=payload)
+            assert response.status_code == HTTPStatus.OK
+            return await stream.events(3)
+
+    events = asyncio.run(scenario())
+    assert [e["data"]["data"]["title"] for e in events] == ["bulk 0", "bulk 1", "bulk 2"]
+
+
+def test_pruned_or_unknown_history_sends_reset(engine, db_session, make_feed, project_factory):
+    make_feed()
+    project_factory()
+    start = _last_seq(db_session)
+    project_factory()
+    project_factory()
+    assert prune(engine, days=-1) >= 2
+    head = start + 2
+
+    async def scenario():
+        async with Stream(headers={"Last-Event-ID": str(start)}) as stream:
+            pruned = await stream.events(1)
+        async with Stream(headers={"Last-Event-ID": str(head + 100)}) as stream:
+            unknown = await stream.events(1)
+        return pruned + unknown
+
+    for event in asyncio.run(scenario()):
+        assert event["event"] == "reset"
+        assert event["id"] == str(head) and event["data"] == {"seq": head}
+
+
+def test_last_event_id_ahead_of_feed_is_replayed(engine, make_feed):
+    feed = make_feed()
+
+    async def scenario():
+        async with Stream() as stream:
+            await stream.frame()
+        # écrites par un « autre worker » : aucune notification, feed.head en retard
+        with engine.begin() as conn:
+            for name in ("elsewhere 1", "elsewhere 2"):
+                conn.execute(insert(Project).values(name=name))
+            seen = conn.scalar(select(func.max(Change.id))) - 1
+        assert seen > feed.head
+        async with Stream(headers={"Last-Event-ID": str(seen)}) as stream:
+            (event,) = await stream.events(1)
+        await feed.stop()
+        return event
+
+    event = asyncio.run(scenario())
+    assert event["event"] == "project.create"
+    assert event["data"]["data"]["name"] == "elsewhere 2"
+
+
+def test_subscribers_wait_for_failed_start(make_feed, project_factory):
+    feed = make_feed(poll_ms=10)
+    last_seq, failures = feed._last_seq, []
+
+    def flaky() -> int:
+        if not failures:
+            failures.append(1)
+            raise RuntimeError("database is locked")
+        return last_seq()
+
+    feed._last_seq = flaky
+
+    async def scenario():
+        async with Stream() as stream:
+            retry = await stream.frame()
+            await asyncio.to_thread(project_factory, name="after retry")
+            (event,) = await stream.events(1)
+        await feed.stop()
+        return retry, event
+
+    retry, event = asyncio.run(scenario())
+    assert failures and retry == {"retry": "3000"}
+    assert event["data"]["data"]["name"] == "after retry"
+
+
+def test_stop_releases_subscribers_waiting_for_start(make_feed):
+    feed = make_feed()
+    feed._last_seq = lambda: 1 / 0
+
+    async def scenario():
+        async with Stream() as stream:
+            assert feed.subscribers == 0
+            await feed.stop()
+            # flux terminé sans jamais avoir lu `head`
+            await asyncio.wait_for(stream.task, 5)
+
+    asyncio.run(scenario())
+    assert feed.subscribers == 0
+
+
+def test_heartbeat(make_feed):
+    make_feed(heartbeat=0.05)
+
+    async def scenario():
+        async with Stream() as stream:
+            return [await stream.frame() for _ in range(3)]
+
+    retry, *pings = asyncio.run(scenario())
+    assert retry == {"retry": "3000"}
+    assert pings == [{"comment": "ping"}] * 2
+
+
+def test_too_many_subscribers(client, make_feed):
+    make_feed(max_subscribers=0)
+    response = client.get(PATH)
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.headers["retry-after"] == "5"
+
+
+def test_seed_does_not_emit_changes(tmp_path):
+    url = f"sqlite:///{tmp_path / 'seed.db'}"
+    seed_database(url, Dataset(users=5, projects=2, tickets=20, audit_logs=0))
+    engine = create_db_engine(url)
+    try:
+        with engine.begin() as conn:
+            assert conn.scalar(select(func.count()).select_from(Change)) == 0
+            # triggers remis en place après le chargement
+            conn.execute(insert(Project).values(name="after seed"))
+            assert conn.scalar(select(func.count()).select_from(Change)) == 1
+    finally:
+        engine.dispose()
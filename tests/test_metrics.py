@@ -0,0 +1,114 @@
+from http import HTTPStatus
+import re
+import threading
+
+from sqlalchemy import text
+
+from app.core.metrics import COUNT_BUCKETS, Registry
+from app.db.session import create_db_engine
+
+
+def _sample(body: str, name: str, **labels) -> float:
+    """Valeur d'un échantillon dont les labels contiennent `labels`."""
+    for line in body.splitlines():
+        match = re.fullmatch(rf"{name}(?:\{{(.*)\}})? (\S+)", line)
+        if match:
+            found = dict(re.findall(r'(\w+)="([^"]*)"', match.group(1) or ""))
+            if labels.items() <= found.items():
+                return float(match.group(2))
+    return 0.0
+
+
+def test_metrics_endpoint_is_prometheus_text(client):
+    response = client.get("/metrics")
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE opshub_http_requests_total counter" in response.text
+    assert "# TYPE opshub_http_request_duration_seconds histogram" in response.text
+    assert "# TYPE opshub_threadpool_busy gauge" in response.text
+
+
+def test_requests_are_labelled_by_route_template(client, ticket_factory):
+    ticket = ticket_factory()
+    route = "/api/v1/tickets/{ticket_id}"
+    before = _sample(
+        client.get("/metrics").text,
+        "opshub_http_requests_total",
+        method="GET",
+        route=route,
+        status="200",
+    )
+    for _ in range(3):
+        client.get(f"/api/v1/tickets/{ticket.id}")
+    client.get("/nowhere")
+
+    body = client.get("/metrics").text
+    assert (
+        _sample(body, "opshub_http_requests_total", method="GET", route=route, status="200")
+        == before + 3
+    )
+    assert f'route="/api/v1/tickets/{ticket.id}"' not in body
+    assert _sample(body, "opshub_http_requests_total", route="unmatched", status="404") >= 1
+    assert (
+        _sample(body, "opshub_http_request_duration_seconds_count", method="GET", route=route) >= 3
+    )
+
+
+def test_db_queries_are_counted_per_request(client, ticket_factory):
+    ticket_factory()
+    route = "/api/v1/tickets"
+
+    def queries():
+        body = client.get("/metrics").text
+        return (
+            _sample(body, "opshub_http_db_queries_count", method="GET", route=route),
+            _sample(body, "opshub_http_db_queries_sum", method="GET", route=route),
+        )
+
+    count, total = queries()
+    assert client.get("/api/v1/tickets").status_code == HTTPStatus.OK
+    new_count, new_total = queries()
+    assert new_count == count + 1
+    assert new_total - total >= 1
+
+
+def test_pool_metrics_are_labelled_by_engine(tmp_path, client):
+    eng = create_db_engine(f"sqlite:///{tmp_path / 'pool.db'}", pool_logging_name="bench")
+    try:
+        with eng.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            body = client.get("/metrics").text
+            assert _sample(body, "opshub_db_pool_checked_out", pool="bench") == 1
+        body = client.get("/metrics").text
+        assert _sample(body, "opshub_db_pool_checked_out", pool="bench") == 0
+        assert _sample(body, "opshub_db_pool_checkouts_total", pool="bench") >= 1
+        assert _sample(body, "opshub_db_queries_total", engine="bench") >= 1
+    finally:
+        eng.dispose()
+
+
+def test_registry_merges_thread_shards():
+    registry = Registry()
+    registry.counter("hits_total", "hits")
+    registry.histogram("size", "size", COUNT_BUCKETS)
+
+    def work():
+        for value in range(10):
+            registry.inc("hits_total", (("kind", "a"),))
+            registry.observe("size", (), value)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    work()
+
+    # fragments des threads terminés fusionnés, puis collecte stable
+    for _ in range(2):
+        body = registry.render()
+        assert _sample(body, "hits_total", kind="a") == 50
+        assert _sample(body, "size_count") == 50
+        assert _sample(body, "size_sum") == 5 * sum(range(10))
+        assert _sample(body, "size_bucket", le="0") == 5
+        assert _sample(body, "size_bucket", le="+Inf") == 50
@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import inspect
+
+from app.db.audit_partitions import partition_table, rollover
+from app.db.base import Base, include_name
+
+
+def _diff(engine) -> list:
+    """Ce que `alembic revision --autogenerate` produirait sur cette base."""
+    with engine.connect() as conn:
+        context = MigrationContext.configure(conn, opts={"include_name": include_name})
+        return compare_metadata(context, Base.metadata)
+
+
+def test_autogenerate_ignores_fts_tables(engine):
+    with engine.connect() as conn:
+        tables = conn.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE 'tickets_fts%'"
+        ).scalars()
+        assert "tickets_fts_data" in set(tables)
+    assert _diff(engine) == []
+
+
+def test_autogenerate_ignores_audit_partitions(engine, audit_log_factory):
+    for month in (8, 9, 10):
+        audit_log_factory(action=f"M{month}", created_at=datetime(2026, month, 15))
+    try:
+        assert rollover(engine, now=datetime(2026, 10, 18, 12, 0)) == [
+            "audit_logs_202608",
+            "audit_logs_202609",
+        ]
+        assert _diff(engine) == []
+    finally:
+        with engine.begin() as conn:
+            for name in inspect(conn).get_table_names():
+                if name.startswith("audit_logs_"):
+                    partition_table(name).drop(conn)
@@ -0,0 +1,83 @@
+from http import HTTPStatus
+import logging
+
+import pytest
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db import profiler
+from app.db.metrics import RequestDB, request_db
+from app.db.models import Ticket
+
+
+@pytest.fixture
+def profiled(monkeypatch):
+    monkeypatch.setattr(settings, "DB_PROFILE", True)
+
+
+def test_profiler_headers(client, ticket_factory, profiled):
+    ticket = ticket_factory()
+    response = client.get(f"/api/v1/tickets/{ticket.id}")
+    assert response.status_code == HTTPStatus.OK
+    assert int(response.headers["x-db-query-count"]) >= 1
+    assert float(response.headers["x-db-time"]) > 0
+    assert "x-db-n-plus-one" not in response.headers
+
+
+def test_profiler_is_opt_in(client, ticket_factory):
+    ticket = ticket_factory()
+    response = client.get(f"/api/v1/tickets/{ticket.id}")
+    assert "x-db-query-count" not in response.headers
+
+
+def test_slow_queries_are_logged(client, ticket_factory, profiled, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "DB_SLOW_QUERY_MS", 0)
+    ticket = ticket_factory()
+    with caplog.at_level(logging.WARNING, logger=profiler.__name__):
+        client.get(f"/api/v1/tickets/{ticket.id}")
+
+    [record] = caplog.records
+    entry = record.db_profile
+    assert entry["method"] == "GET"
+    assert entry["path"] == f"/api/v1/tickets/{ticket.id}"
+    assert entry["queries"] == len(entry["slow"]) >= 1
+    assert any("FROM tickets" in query["sql"] for query in entry["slow"])
+    assert entry["n_plus_one"] == []
+
+
+def test_fast_requests_are_not_logged(client, ticket_factory, profiled, caplog):
+    ticket = ticket_factory()
+    with caplog.at_level(logging.WARNING, logger=profiler.__name__):
+        client.get(f"/api/v1/tickets/{ticket.id}")
+    assert caplog.records == []
+
+
+def test_n_plus_one_is_detected(db_session, ticket_factory, monkeypatch):
+    monkeypatch.setattr(settings, "DB_N_PLUS_ONE_THRESHOLD", 3)
+    ids = [ticket_factory().id for _ in range(5)]
+    db = RequestDB()
+    db.statements = []
+    token = request_db.set(db)
+    try:
+        # une requête par ticket : le motif N+1
+        for ticket_id in ids:
+            db_session.execute(select(Ticket.title).where(Ticket.id == ticket_id)).one()
+        db_session.execute(select(Ticket.title).where(Ticket.id.in_(ids))).all()
+        db_session.execute(select(Ticket.title).where(Ticket.id.in_(ids[:2]))).all()
+    finally:
+        request_db.reset(token)
+
+    [(statement, count)] = profiler.repeated(db, settings.DB_N_PLUS_ONE_THRESHOLD)
+    assert count == 5
+    assert statement.endswith("WHERE tickets.id = ?")
+    entry = profiler.report("GET", "/tickets", db)
+    assert entry["n_plus_one"] == [{"sql": statement, "count": 5}]
+
+
+def test_normalize_folds_literals_and_in_lists():
+    assert profiler.normalize("SELECT *\n  FROM t WHERE a = 'x' AND b IN (?, ?,?)") == (
+        "SELECT * FROM t WHERE a = ? AND b IN (?)"
+    )
+    assert profiler.normalize("SELECT * FROM t LIMIT 10 OFFSET 20") == (
+        "SELECT * FROM t LIMIT ? OFFSET ?"
+    )
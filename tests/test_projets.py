@@ -1,6 +1,9 @@
+from datetime import datetime
 from http import HTTPStatus
 
-from app.db.enums import UserRole
+from sqlalchemy import event
+
+from app.db.enums import TicketPriority, TicketStatus, UserRole
 
 
 def test_create_project_ok(client, auth_headers):
@@ -45,7 +48,7 @@ def test_list_projects(client, auth_headers):
     r = client.get("/projects", headers=headers)
     print(r)
     assert r.status_code == HTTPStatus.OK
-    data = r.json()
+    data = r.json()["items"]
     assert isinstance(data, list)
     assert len(data) >= 2
     names = [p["name"] for p in data]
@@ -62,6 +65,73 @@ def test_get_project_ok(client, user_factory, project_factory):
     assert r.json()["name"] == "Solo"
 
 
+def test_get_project_etag(client, project_factory):
+    project = project_factory()
+
+    etag = client.get(f"/projects/{project.id}").headers["etag"]
+    r = client.get(f"/projects/{project.id}", headers={"If-None-Match": etag})
+    assert r.status_code == HTTPStatus.NOT_MODIFIED
+    assert r.headers["etag"] == etag
+
+    client.put(f"/projects/{project.id}", json={"name": "Renamed"})
+    r = client.get(f"/projects/{project.id}", headers={"If-None-Match": etag})
+    assert r.status_code == HTTPStatus.OK
+    assert r.json()["name"] == "Renamed"
+
+
+def test_list_projects_etag(client, auth_headers, project_factory):
+    headers, _ = auth_headers(role=UserRole.manager)
+    project_factory()
+
+    etag = client.get("/projects", headers=headers).headers["etag"]
+    r = client.get("/projects", headers={**headers, "If-None-Match": etag})
+    assert r.status_code == HTTPStatus.NOT_MODIFIED
+
+    project_factory()
+    r = client.get("/projects", headers={**headers, "If-None-Match": etag})
+    assert r.status_code == HTTPStatus.OK
+    assert len(r.json()["items"]) == 2
+
+
+def test_project_sparse_fields(client, auth_headers, project_factory):
+    headers, _ = auth_headers(role=UserRole.admin)
+    projects = [project_factory(name=f"P{i}") for i in range(3)]
+
+    r = client.get("/projects", params={"fields": "name", "limit": 2}, headers=headers)
+    page = r.json()
+    assert page["items"] == [{"name": "P0"}, {"name": "P1"}]
+    r = client.get(
+        "/projects", params={"fields": "name", "cursor": page["next_cursor"]}, headers=headers
+    )
+    assert r.json()["items"] == [{"name": "P2"}]
+
+    r = client.get(f"/projects/{projects[0].id}", params={"fields": "id,status"})
+    assert r.json() == {"id": projects[0].id, "status": "active"}
+    assert r.headers["etag"] != client.get(f"/projects/{projects[0].id}").headers["etag"]
+
+
+def test_project_include_owner_and_tickets_count(
+    client, auth_headers, project_factory, ticket_factory
+):
+    headers, owner = auth_headers(role=UserRole.admin)
+    busy = project_factory(name="Busy", owner_id=owner.id)
+    idle = project_factory(name="Idle")
+    for _ in range(3):
+        ticket_factory(project_id=busy.id)
+
+    r = client.get("/projects", params={"include": "tickets_count,owner"}, headers=headers)
+    assert r.status_code == HTTPStatus.OK
+    by_name = {p["name"]: p for p in r.json()["items"]}
+    assert by_name["Busy"]["tickets_count"] == 3
+    assert by_name["Busy"]["owner"]["id"] == owner.id
+    assert by_name["Idle"] | {"tickets_count": 0, "owner": None} == by_name["Idle"]
+
+    r = client.get(f"/projects/{idle.id}", params={"include": "tickets_count", "fields": "id"})
+    assert r.json() == {"id": idle.id, "tickets_count": 0}
+    r = client.get(f"/projects/{idle.id}", params={"include": "tickets"})
+    assert r.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
 def test_get_project_not_found(client):
     r = client.get("/projects/999999")
     assert r.status_code == HTTPStatus.NOT_FOUND
@@ -104,3 +174,65 @@ def test_delete_project_not_found(client):
     r = client.delete("/projects/111111")
     assert r.status_code == HTTPStatus.NOT_FOUND
     assert r.json()["detail"] == "Project not found"
+
+
+def test_project_summary(client, user_factory, project_factory, ticket_factory):
+    alice = user_factory()
+    bob = user_factory()
+    project = project_factory(name="Dash")
+    ticket_factory(project_id=project.id, assignee_id=alice.id, priority=TicketPriority.high)
+    ticket_factory(project_id=project.id, assignee_id=alice.id, status=TicketStatus.in_progress)
+    ticket_factory(project_id=project.id, assignee_id=bob.id, created_at=datetime(2024, 1, 1))
+    ticket_factory(project_id=project.id, assignee_id=bob.id, status=TicketStatus.done)
+    ticket_factory(project_id=project.id, assignee_id=None, status=TicketStatus.open)
+
+    r = client.get(f"/projects/{project.id}/summary")
+    assert r.status_code == HTTPStatus.OK, r.text
+    body = r.json()
+    assert body["total"] == 5
+    assert body["by_status_priority"]["open"] == {"low": 0, "med": 2, "high": 1}
+    assert body["by_status_priority"]["in_progress"]["med"] == 1
+    assert body["by_status_priority"]["done"]["med"] == 1
+    assert body["open_by_assignee"][0] == {"assignee_id": alice.id, "open": 2}
+    assert {"assignee_id": bob.id, "open": 1} in body["open_by_assignee"]
+    assert {"assignee_id": None, "open": 1} in body["open_by_assignee"]
+    assert body["oldest_open_created_at"].startswith("2024-01-01")
+    assert body["oldest_open_age_seconds"] > 0
+
+
+def test_project_summary_empty_and_missing(client, project_factory):
+    project = project_factory()
+
+    r = client.get(f"/projects/{project.id}/summary")
+    assert r.status_code == HTTPStatus.OK
+    assert r.json()["total"] == 0
+    assert r.json()["oldest_open_created_at"] is None
+
+    r = client.get("/projects/999999/summary")
+    assert r.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_project_summaries_single_query(
+    client, auth_headers, db_session, project_factory, ticket_factory
+):
+    headers, _ = auth_headers(role=UserRole.manager)
+    p1 = project_factory(name="P1")
+    p2 = project_factory(name="P2")
+    for _ in range(3):
+        ticket_factory(project_id=p1.id)
+    ticket_factory(project_id=p2.id, status=TicketStatus.done)
+
+    statements = []
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db_session.bind, "before_cursor_execute", listener)
+    try:
+        r = client.get("/projects/summary", params={"project_id": [p1.id, p2.id]}, headers=headers)
+    finally:
+        event.remove(db_session.bind, "before_cursor_execute", listener)
+
+    assert r.status_code == HTTPStatus.OK, r.text
+    assert [(s["project_id"], s["total"]) for s in r.json()] == [(p1.id, 3), (p2.id, 1)]
+    assert sum("FROM tickets" in s for s in statements) == 1
@@ -0,0 +1,81 @@
+from collections import Counter
+import hashlib
+
+import pytest
+from sqlalchemy import func, select, text
+
+from app.db.models import AuditLog, Project, Ticket, User
+from app.db.seed import Dataset, seed_database
+from app.db.session import create_db_engine
+
+DATASET = Dataset(users=50, projects=10, tickets=3000, audit_logs=5000, seed=7)
+
+
+def _seeded(path, dataset=DATASET):
+    url = f"sqlite:///{path}"
+    seed_database(url, dataset)
+    return create_db_engine(url)
+
+
+def _digest(engine) -> str:
+    digest = hashlib.sha256()
+    with engine.connect() as conn:
+        for model in (User, Project, Ticket, AuditLog):
+            for row in conn.execute(select(model.__table__).order_by(model.id)):
+                digest.update(repr(tuple(row)).encode())
+    return digest.hexdigest()
+
+
+def test_seed_is_deterministic(tmp_path):
+    first = _seeded(tmp_path / "a.db")
+    second = _seeded(tmp_path / "b.db")
+    other = _seeded(tmp_path / "c.db", Dataset(**{**DATASET.as_dict(), "seed": 8}))
+    try:
+        assert _digest(first) == _digest(second)
+        assert _digest(first) != _digest(other)
+    finally:
+        for engine in (first, second, other):
+            engine.dispose()
+
+
+def test_seed_counts_distributions_and_indexes(tmp_path):
+    engine = _seeded(tmp_path / "seed.db")
+    try:
+        with engine.connect() as conn:
+            assert conn.execute(select(func.count()).select_from(Ticket)).scalar() == 3000
+            assert conn.execute(select(func.count()).select_from(AuditLog)).scalar() == 5000
+
+            # charge des assignés en Zipf : le plus chargé dépasse largement la moyenne
+            load = Counter(conn.execute(select(Ticket.assignee_id)).scalars())
+            unassigned = load.pop(None)
+            assert 0.05 < unassigned / 3000 < 0.15
+            assert load.most_common(1)[0][1] > 5 * (3000 - unassigned) / 50
+            assert {
+                status.value for status in Counter(conn.execute(select(Ticket.status)).scalars())
+            } == {"open", "in_progress", "done"}
+
+            # logs d'audit en ordre chronologique
+            stamps = conn.execute(select(AuditLog.created_at).order_by(AuditLog.id)).scalars()
+            stamps = list(stamps)
+            assert stamps == sorted(stamps)
+
+            # index et trigger FTS recréés, index plein texte reconstruit
+            indexes = {row.name for row in conn.execute(text("PRAGMA index_list(tickets)"))}
+            assert {index.name for index in Ticket.__table__.indexes} <= indexes
+            hits = conn.execute(
+                text("SELECT count(*) FROM tickets_fts WHERE tickets_fts MATCH 'dashboard'")
+            ).scalar()
+            expected = conn.execute(
+                select(func.count()).where(Ticket.title.like("%dashboard%"))
+            ).scalar()
+            assert hits == expected > 0
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+    finally:
+        engine.dispose()
+
+
+def test_seed_refuses_populated_database(tmp_path):
+    engine = _seeded(tmp_path / "seed.db")
+    engine.dispose()
+    with pytest.raises(ValueError, match="not empty"):
+        seed_database(f"sqlite:///{tmp_path / 'seed.db'}", DATASET)
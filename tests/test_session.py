@@ -0,0 +1,95 @@
+from http import HTTPStatus
+import time
+
+from fastapi.testclient import TestClient
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeout
+from sqlalchemy.orm import sessionmaker
+
+from app.api import deps
+from app.core.config import settings
+from app.db.session import create_db_engine, create_read_engine
+from app.main import app
+
+
+def test_engine_applies_sqlite_pragmas(engine):
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        # NORMAL = 1
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1
+        busy_timeout = conn.execute(text("PRAGMA busy_timeout")).scalar()
+        assert busy_timeout == settings.SQLITE_BUSY_TIMEOUT_MS
+        assert conn.execute(text("PRAGMA cache_size")).scalar() == -settings.SQLITE_CACHE_SIZE_KIB
+        # MEMORY = 2
+        assert conn.execute(text("PRAGMA temp_store")).scalar() == 2
+
+
+def test_engine_profile_is_configurable(tmp_path):
+    eng = create_db_engine(
+        f"sqlite:///{tmp_path / 'custom.db'}",
+        pragmas={"journal_mode": "DELETE", "busy_timeout": 250},
+        pool_size=2,
+        max_overflow=1,
+    )
+    try:
+        with eng.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "delete"
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 250
+        assert eng.pool.size() == 2
+    finally:
+        eng.dispose()
+
+
+@pytest.fixture
+def read_engine(engine):
+    eng = create_read_engine(str(engine.url), pool_size=1, max_overflow=0, pool_timeout=0.2)
+    yield eng
+    eng.dispose()
+
+
+@pytest.fixture
+def routed_client(engine, read_engine, db_session, monkeypatch):
+    """Vraies dépendances get_db / get_read_db, branchées sur les moteurs de test."""
+    monkeypatch.setattr(deps, "SessionLocal", sessionmaker(bind=engine))
+    monkeypatch.setattr(deps, "ReadSessionLocal", sessionmaker(bind=read_engine))
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_read_engine_is_query_only(read_engine):
+    with read_engine.connect() as conn:
+        assert conn.execute(text("PRAGMA query_only")).scalar() == 1
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        with pytest.raises(OperationalError, match="readonly"):
+            conn.execute(text("DELETE FROM users"))
+
+
+def test_get_routed_to_read_engine(routed_client: TestClient, project_factory, monkeypatch):
+    project = project_factory()
+    r = routed_client.post("/api/v1/tickets", json={"title": "R", "project_id": project.id})
+    assert r.status_code == HTTPStatus.CREATED
+    assert r.headers["x-db-route"] == "write"
+
+    r = routed_client.get(f"/api/v1/tickets/{r.json()['id']}")
+    assert r.status_code == HTTPStatus.OK
+    assert r.headers["x-db-route"] == "read"
+    assert routed_client.get("/api/v1/tickets/export").headers["x-db-route"] == "read"
+
+    monkeypatch.setattr(settings, "DB_READ_ROUTING", False)
+    assert routed_client.get("/users").headers["x-db-route"] == "write"
+
+
+def test_long_read_does_not_delay_writes(routed_client: TestClient, read_engine, project_factory):
+    project = project_factory()
+    # un rapport occupe l'unique connexion du pool de lecture
+    with read_engine.connect() as report:
+        assert report.execute(text("SELECT count(*) FROM tickets")).scalar() == 0
+
+        start = time.perf_counter()
+        r = routed_client.post("/api/v1/tickets", json={"title": "W", "project_id": project.id})
+        assert r.status_code == HTTPStatus.CREATED
+        assert time.perf_counter() - start < 1
+        # le pool de lecture est épuisé : seules les lectures attendent
+        with pytest.raises(PoolTimeout):
+            routed_client.get("/api/v1/tickets")
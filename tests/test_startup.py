@@ -0,0 +1,100 @@
+from http import HTTPStatus
+import json
+import subprocess
+import sys
+
+from fastapi.testclient import TestClient
+import pytest
+
+from app.api import openapi
+from app.api.deps import get_db, get_read_db
+from app.api.lazy import LazyRouter
+from app.core.config import settings
+from app.main import ROUTERS, create_app
+
+
+@pytest.fixture
+def make_client(db_session, monkeypatch):
+    """Application neuve (réglages du test), branchée sur la session de test."""
+    clients = []
+
+    def _make(**overrides):
+        for name, value in overrides.items():
+            monkeypatch.setattr(settings, name, value)
+        app = create_app()
+        app.dependency_overrides[get_db] = lambda: db_session
+        app.dependency_overrides[get_read_db] = lambda: db_session
+        client = TestClient(app)
+        clients.append(client)
+        return app, client
+
+    yield _make
+    for client in clients:
+        client.close()
+
+
+def _lazy(app) -> list[str]:
+    return [route.prefix for route in app.router.routes if isinstance(route, LazyRouter)]
+
+
+def test_import_does_not_load_routers():
+    code = (
+        "import sys, app.main; "
+        "print([m for m in ('app.api.v1.tickets', 'app.db.models', 'jose') if m in sys.modules])"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
+
+
+def test_router_is_loaded_on_first_request(make_client, ticket_factory):
+    ticket = ticket_factory()
+    app, client = make_client(LAZY_ROUTERS=True)
+    assert "/api/v1/tickets" in _lazy(app)
+
+    response = client.get(f"/api/v1/tickets/{ticket.id}")
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["id"] == ticket.id
+    assert "/api/v1/tickets" not in _lazy(app)
+    assert "/projects" in _lazy(app)
+    # action collée au préfixe, une fois le routeur chargé
+    assert client.post("/api/v1/tickets:bulk", json={"operations": []}).status_code != 404
+    assert client.get("/nowhere").status_code == HTTPStatus.NOT_FOUND
+
+
+def test_openapi_is_complete_with_lazy_routers(make_client):
+    eager, _ = make_client(LAZY_ROUTERS=False)
+    assert _lazy(eager) == []
+    lazy, client = make_client(LAZY_ROUTERS=True)
+
+    paths = client.get("/openapi.json").json()["paths"]
+    assert set(paths) == set(eager.openapi()["paths"])
+    assert "/api/v1/tickets/{ticket_id}" in paths
+    assert _lazy(lazy) == []
+
+
+def test_openapi_served_from_file(make_client, tmp_path, monkeypatch):
+    schema = tmp_path / "openapi.json"
+    monkeypatch.setattr(sys, "argv", ["openapi", str(schema)])
+    openapi.main()
+    written = json.loads(schema.read_bytes())
+    assert "/api/v1/tickets" in written["paths"]
+
+    app, client = make_client(LAZY_ROUTERS=True, OPENAPI_FILE=str(schema))
+    assert client.get("/openapi.json").json() == written
+    # servi sans importer un seul routeur
+    assert len(_lazy(app)) == len(ROUTERS)
+
+
+def test_openapi_file_from_other_sources_is_ignored(make_client, tmp_path, monkeypatch):
+    schema = tmp_path / "openapi.json"
+    schema.write_text(json.dumps({"openapi": "3.1.0", "info": {"version": "1.0.0"}, "paths": {}}))
+
+    _, client = make_client(LAZY_ROUTERS=True, OPENAPI_FILE=str(schema))
+    assert "/api/v1/tickets" in client.get("/openapi.json").json()["paths"]
+
+    # fichier généré, puis code modifié : même version, autre empreinte
+    monkeypatch.setattr(sys, "argv", ["openapi", str(schema)])
+    openapi.main()
+    monkeypatch.setattr(openapi, "source_hash", lambda: "edited")
+    _, client = make_client(LAZY_ROUTERS=True, OPENAPI_FILE=str(schema))
+    assert openapi.HASH_KEY not in client.get("/openapi.json").json()["info"]
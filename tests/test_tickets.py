@@ -1,8 +1,19 @@
+import csv
+from datetime import datetime
+import io
+import json
+
 from fastapi.testclient import TestClient
+import pytest
+from sqlalchemy import event, text
 from sqlalchemy.orm import Session
 
+from app.api.filters import TicketFilters
+from app.core.config import settings
 from app.db.enums import TicketPriority, TicketStatus
 from app.db.models import Ticket
+from app.schemas.pagination import Page
+from app.schemas.ticket import TicketRead
 
 
 def test_create_ticket(client: TestClient, user_factory, project_factory):
@@ -36,12 +47,62 @@ def test_list_tickets(client: TestClient, ticket_factory):
     response = client.get("/api/v1/tickets")
     assert response.status_code == 200
 
-    data = response.json()
+    data = response.json()["items"]
     assert len(data) == 2
     assert data[0]["title"] == "Ticket 1"
     assert data[1]["title"] == "Ticket 2"
 
 
+def test_list_tickets_matches_response_model(client: TestClient, ticket_factory):
+    # le chemin rapide (tuples Core + orjson) produit le JSON de Page[TicketRead]
+    tickets = [
+        ticket_factory(title="Crème brûlée", description=None, assignee_id=None),
+        ticket_factory(created_at=datetime(2026, 1, 2, 3, 4, 5), priority=TicketPriority.high),
+        ticket_factory(updated_at=datetime(2026, 1, 2, 3, 4, 5, 678)),
+    ]
+
+    response = client.get("/api/v1/tickets", params={"limit": 2})
+    assert response.headers["content-type"] == "application/json"
+
+    expected = Page[TicketRead](
+        items=[TicketRead.model_validate(t) for t in tickets[:2]],
+        next_cursor=response.json()["next_cursor"],
+    )
+    assert response.json() == expected.model_dump(mode="json")
+    assert response.json()["next_cursor"] is not None
+
+
+def test_list_tickets_cursor(client: TestClient, ticket_factory):
+    tickets = [ticket_factory(title=f"Ticket {i}") for i in range(3)]
+
+    r1 = client.get("/api/v1/tickets", params={"limit": 2})
+    page1 = r1.json()
+    assert [t["id"] for t in page1["items"]] == [tickets[0].id, tickets[1].id]
+
+    r2 = client.get("/api/v1/tickets", params={"limit": 2, "cursor": page1["next_cursor"]})
+    page2 = r2.json()
+    assert [t["id"] for t in page2["items"]] == [tickets[2].id]
+    assert page2["next_cursor"] is None
+
+
+def test_list_tickets_limit_is_capped(client: TestClient, ticket_factory, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "PAGE_SIZE_MAX", 2)
+    for i in range(3):
+        ticket_factory(title=f"Ticket {i}")
+
+    response = client.get("/api/v1/tickets", params={"limit": 1000})
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 2
+
+
+def test_list_tickets_invalid_cursor(client: TestClient):
+    response = client.get("/api/v1/tickets", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
 def test_get_ticket(client: TestClient, ticket_factory):
     ticket = ticket_factory(title="Test Ticket")
 
@@ -53,6 +114,166 @@ def test_get_ticket(client: TestClient, ticket_factory):
     assert data["id"] == ticket.id
 
 
+def test_get_ticket_etag(client: TestClient, db_session: Session, ticket_factory):
+    ticket = ticket_factory()
+    url = f"/api/v1/tickets/{ticket.id}"
+
+    etag = client.get(url).headers["etag"]
+    statements = []
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db_session.bind, "before_cursor_execute", listener)
+    try:
+        response = client.get(url, headers={"If-None-Match": etag})
+    finally:
+        event.remove(db_session.bind, "before_cursor_execute", listener)
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+    # seule la version (id, updated_at) est lue, pas la ligne complète
+    [statement] = [s for s in statements if "FROM tickets" in s]
+    assert statement.startswith("SELECT tickets.id, tickets.updated_at \nFROM")
+
+    client.put(url, json={"title": "Changed"})
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert client.get("/api/v1/tickets/999", headers={"If-None-Match": "*"}).status_code == 404
+
+
+def test_ticket_sparse_fields(client: TestClient, db_session: Session, ticket_factory):
+    tickets = [ticket_factory(title=f"T{i}", description="long " * 100) for i in range(3)]
+    statements = []
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db_session.bind, "before_cursor_execute", listener)
+    try:
+        response = client.get(
+            "/api/v1/tickets",
+            params={"fields": "status,id,title", "limit": 2, "sort": "priority"},
+        )
+    finally:
+        event.remove(db_session.bind, "before_cursor_execute", listener)
+    assert response.status_code == 200
+    page = response.json()
+    assert [set(t) for t in page["items"]] == [{"id", "title", "status"}] * 2
+    # description n'est jamais lue ; priority (curseur) et updated_at (ETag) le sont
+    [statement] = [s for s in statements if "FROM tickets" in s]
+    assert "description" not in statement
+    assert "tickets.priority" in statement
+
+    page2 = client.get(
+        "/api/v1/tickets",
+        params={"fields": "id,title,status", "sort": "priority", "cursor": page["next_cursor"]},
+    ).json()
+    seen = [t["id"] for t in page["items"] + page2["items"]]
+    assert sorted(seen) == [t.id for t in tickets]
+
+    r = client.get(f"/api/v1/tickets/{tickets[0].id}", params={"fields": "title"})
+    assert r.json() == {"title": "T0"}
+
+
+def test_ticket_sparse_fields_etag_per_variant(client: TestClient, ticket_factory):
+    ticket = ticket_factory()
+    url = f"/api/v1/tickets/{ticket.id}"
+
+    full = client.get(url).headers["etag"]
+    partial = client.get(url, params={"fields": "id,title"}).headers["etag"]
+    assert full != partial
+    r = client.get(url, params={"fields": "title,id"}, headers={"If-None-Match": partial})
+    assert r.status_code == 304
+    assert client.get(url, headers={"If-None-Match": partial}).status_code == 200
+
+
+@pytest.mark.parametrize("fields", ["id,secret", "", ",", "password_hash"])
+def test_ticket_sparse_fields_rejects_unknown(client: TestClient, ticket_factory, fields):
+    ticket = ticket_factory()
+    for url in ("/api/v1/tickets", f"/api/v1/tickets/{ticket.id}"):
+        response = client.get(url, params={"fields": fields})
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["query", "fields"]
+
+
+def test_ticket_include_relations(
+    client: TestClient, db_session: Session, user_factory, project_factory, ticket_factory
+):
+    users = [user_factory(full_name=f"Agent {i}") for i in range(2)]
+    projects = [project_factory(name=f"P{i}") for i in range(2)]
+    for i in range(6):
+        ticket_factory(project_id=projects[i % 2].id, assignee_id=users[i % 2].id if i else None)
+    statements = []
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db_session.bind, "before_cursor_execute", listener)
+    try:
+        response = client.get(
+            "/api/v1/tickets", params={"include": "project,assignee", "fields": "id"}
+        )
+    finally:
+        event.remove(db_session.bind, "before_cursor_execute", listener)
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert items[0] == {
+        "id": items[0]["id"],
+        "assignee": None,
+        "project": {
+            "id": projects[0].id,
+            "name": "P0",
+            "description": "Test description",
+            "status": "active",
+            "owner_id": None,
+        },
+    }
+    names = [t["assignee"]["full_name"] for t in items[1:]]
+    assert names == ["Agent 1", "Agent 0", "Agent 1", "Agent 0", "Agent 1"]
+    assert {t["project"]["name"] for t in items} == {"P0", "P1"}
+    # une requête pour la page, une par relation, quel que soit le nombre de lignes
+    selects = [s for s in statements if s.startswith("SELECT")]
+    assert len(selects) == 3
+
+    r = client.get(f"/api/v1/tickets/{items[1]['id']}", params={"include": "assignee"})
+    assert r.json()["assignee"]["id"] == users[1].id
+    assert "project" not in r.json()
+    assert client.get("/api/v1/tickets", params={"include": "owner"}).status_code == 422
+
+
+def test_ticket_include_etag_tracks_related(client: TestClient, user_factory, ticket_factory):
+    user = user_factory(full_name="Before")
+    ticket = ticket_factory(assignee_id=user.id)
+    url = f"/api/v1/tickets/{ticket.id}"
+    params = {"include": "assignee"}
+
+    etag = client.get(url, params=params).headers["etag"]
+    assert client.get(url, params=params, headers={"If-None-Match": etag}).status_code == 304
+    # le ticket n'a pas changé, mais l'objet embarqué si
+    client.put(f"/users/{user.id}", json={"full_name": "After"})
+    r = client.get(url, params=params, headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.json()["assignee"]["full_name"] == "After"
+
+
+def test_list_tickets_etag(client: TestClient, ticket_factory):
+    first = ticket_factory()
+    ticket_factory()
+
+    etag = client.get("/api/v1/tickets").headers["etag"]
+    assert client.get("/api/v1/tickets", headers={"If-None-Match": etag}).status_code == 304
+    # même ETag en faible (W/) et parmi d'autres
+    weak = {"If-None-Match": f'"other", W/{etag}'}
+    assert client.get("/api/v1/tickets", headers=weak).status_code == 304
+
+    client.put(f"/api/v1/tickets/{first.id}", json={"status": "done"})
+    response = client.get("/api/v1/tickets", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 2
+
+
 def test_get_ticket_not_found(client: TestClient):
     response = client.get("/api/v1/tickets/999")
     assert response.status_code == 404
@@ -85,3 +306,290 @@ def test_delete_ticket(client: TestClient, ticket_factory, db_session: Session):
     # Vérifier que le ticket a été supprimé
     deleted_ticket = db_session.query(Ticket).filter(Ticket.id == ticket_id).first()
     assert deleted_ticket is None
+
+
+def test_list_tickets_filters(client: TestClient, user_factory, project_factory, ticket_factory):
+    user = user_factory()
+    p1 = project_factory(name="P1")
+    p2 = project_factory(name="P2")
+    t1 = ticket_factory(project_id=p1.id, assignee_id=user.id, status=TicketStatus.open)
+    ticket_factory(project_id=p1.id, assignee_id=user.id, status=TicketStatus.done)
+    ticket_factory(project_id=p2.id, assignee_id=user.id, status=TicketStatus.open)
+
+    response = client.get(
+        "/api/v1/tickets", params={"project_id": p1.id, "assignee_id": user.id, "status": "open"}
+    )
+    assert response.status_code == 200
+    assert [t["id"] for t in response.json()["items"]] == [t1.id]
+
+    response = client.get("/api/v1/tickets", params={"status": ["open", "done"]})
+    assert len(response.json()["items"]) == 3
+
+
+def test_list_tickets_sort_by_priority(client: TestClient, project_factory, ticket_factory):
+    project = project_factory()
+    high = ticket_factory(project_id=project.id, priority=TicketPriority.high)
+    low = ticket_factory(project_id=project.id, priority=TicketPriority.low)
+    med = ticket_factory(project_id=project.id, priority=TicketPriority.med)
+
+    params = {"sort": "priority", "order": "desc", "limit": 2}
+    page1 = client.get("/api/v1/tickets", params=params).json()
+    assert [t["id"] for t in page1["items"]] == [high.id, med.id]
+
+    params["cursor"] = page1["next_cursor"]
+    page2 = client.get("/api/v1/tickets", params=params).json()
+    assert [t["id"] for t in page2["items"]] == [low.id]
+
+
+def test_list_tickets_updated_range(client: TestClient, ticket_factory):
+    old = ticket_factory(updated_at=datetime(2024, 1, 1))
+    recent = ticket_factory(updated_at=datetime(2025, 6, 1))
+
+    response = client.get("/api/v1/tickets", params={"updated_after": "2025-01-01T00:00:00"})
+    assert [t["id"] for t in response.json()["items"]] == [recent.id]
+
+    response = client.get("/api/v1/tickets", params={"updated_before": "2025-01-01T00:00:00"})
+    assert [t["id"] for t in response.json()["items"]] == [old.id]
+
+
+def _query_plan(db_session: Session, filters: TicketFilters) -> list[str]:
+    query = filters.apply(db_session.query(Ticket)).order_by(*filters.keys)
+    sql = str(
+        query.statement.compile(
+            dialect=db_session.bind.dialect, compile_kwargs={"literal_binds": True}
+        )
+    )
+    rows = db_session.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+    return [row[-1] for row in rows]
+
+
+@pytest.mark.parametrize(
+    ("params", "index"),
+    [
+        ({"project_id": 1}, "ix_tickets_project_status_priority"),
+        ({"project_id": 1, "status": [TicketStatus.open]}, "ix_tickets_project_status_priority"),
+        ({"assignee_id": 1, "status": [TicketStatus.open]}, "ix_tickets_assignee_status"),
+        ({"sort": "updated_at"}, "ix_tickets_updated_at_id"),
+        ({"sort": "created_at"}, "ix_tickets_created_at_id"),
+    ],
+)
+def test_ticket_filters_use_index(db_session: Session, params, index):
+    defaults = {
+        "project_id": None,
+        "assignee_id": None,
+        "status": None,
+        "priority": None,
+        "created_after": None,
+        "created_before": None,
+        "updated_after": None,
+        "updated_before": None,
+    }
+    plan = _query_plan(db_session, TicketFilters(**{**defaults, **params}))
+    assert any(index in step for step in plan), plan
+    # un "SCAN tickets" sans index = parcours complet de la table
+    assert "SCAN tickets" not in plan, plan
+
+
+def test_export_tickets_ndjson(client: TestClient, project_factory, ticket_factory):
+    project = project_factory()
+    t1 = ticket_factory(project_id=project.id, title="Un")
+    t2 = ticket_factory(project_id=project.id, title="Deux")
+    ticket_factory(title="Autre projet")
+
+    response = client.get("/api/v1/tickets/export", params={"project_id": project.id})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["id"] for r in rows] == [t1.id, t2.id]
+    assert rows[0]["title"] == "Un"
+    assert rows[0]["priority"] == TicketPriority.med.value
+
+
+def test_export_tickets_csv_gzip(client: TestClient, ticket_factory):
+    ticket = ticket_factory(title="Compressé")
+
+    response = client.get("/api/v1/tickets/export", params={"format": "csv", "gzip": True})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+
+    # httpx décompresse le flux gzip de manière transparente
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 1
+    assert rows[0]["id"] == str(ticket.id)
+    assert rows[0]["title"] == "Compressé"
+    assert rows[0]["status"] == "open"
+
+
+def test_bulk_tickets(client: TestClient, db_session: Session, user_factory, ticket_factory):
+    user = user_factory()
+    to_update = ticket_factory(title="Avant")
+    to_delete_id = ticket_factory(title="Supprimé").id
+
+    payload = {
+        "operations": [
+            {"op": "create", "data": {"title": "Alerte 1", "project_id": to_update.project_id}},
+            {
+                "op": "create",
+                "data": {
+                    "title": "Alerte 2",
+                    "project_id": to_update.project_id,
+                    "priority": "high",
+                },
+            },
+            {
+                "op": "update",
+                "id": to_update.id,
+                "data": {"title": "Après", "assignee_id": user.id},
+            },
+            {"op": "delete", "id": to_delete_id},
+            {"op": "delete", "id": 999999},
+            {"op": "create", "data": {"title": "Orphelin", "project_id": 999999}},
+        ]
+    }
+    response = client.post("/api/v1/tickets:bulk", json=payload)
+    assert response.status_code == 200, response.text
+
+    body = response.json()
+    assert body["succeeded"] == 4
+    assert body["failed"] == 2
+    statuses = [res["status"] for res in body["results"]]
+    assert statuses == [201, 201, 200, 204, 404, 422]
+    assert body["results"][5]["error"] == "Project not found"
+
+    db_session.expire_all()
+    created = db_session.get(Ticket, body["results"][1]["id"])
+    assert created.title == "Alerte 2"
+    assert created.priority == TicketPriority.high
+    updated = db_session.get(Ticket, to_update.id)
+    assert updated.title == "Après"
+    assert updated.assignee_id == user.id
+    assert db_session.get(Ticket, to_delete_id) is None
+
+
+def test_bulk_tickets_atomic(client: TestClient, db_session: Session, ticket_factory):
+    ticket_id = ticket_factory().id
+
+    payload = {
+        "atomic": True,
+        "operations": [
+            {"op": "delete", "id": ticket_id},
+            {"op": "update", "id": ticket_id, "data": {"title": "Conflit"}},
+        ],
+    }
+    response = client.post("/api/v1/tickets:bulk", json=payload)
+    assert response.status_code == 200
+
+    body = response.json()
+    assert body["succeeded"] == 0
+    assert [res["status"] for res in body["results"]] == [424, 409]
+
+    db_session.expire_all()
+    assert db_session.get(Ticket, ticket_id) is not None
+
+
+def test_bulk_tickets_rejects_null_required_field(
+    client: TestClient, db_session: Session, ticket_factory
+):
+    ticket = ticket_factory(title="Intact")
+    payload = {
+        "operations": [
+            {"op": "create", "data": {"title": "Valide", "project_id": ticket.project_id}},
+            {"op": "update", "id": ticket.id, "data": {"title": None, "status": None}},
+            {"op": "update", "id": ticket.id, "data": {"description": None}},
+        ]
+    }
+    response = client.post("/api/v1/tickets:bulk", json=payload)
+    assert response.status_code == 200, response.text
+
+    body = response.json()
+    assert [res["status"] for res in body["results"]] == [201, 422, 200]
+    assert body["results"][1]["error"] == "Field cannot be null: title, status"
+
+    db_session.expire_all()
+    assert db_session.get(Ticket, body["results"][0]["id"]).title == "Valide"
+    assert db_session.get(Ticket, ticket.id).title == "Intact"
+
+
+def test_bulk_tickets_validates_payload(client: TestClient):
+    payload = {"operations": [{"op": "create", "data": {"title": "Sans projet"}}]}
+    response = client.post("/api/v1/tickets:bulk", json=payload)
+    assert response.status_code == 422
+
+    delete = {"op": "delete", "id": 1}
+    payload = {"operations": [delete] * (settings.BULK_MAX_OPERATIONS + 1)}
+    response = client.post("/api/v1/tickets:bulk", json=payload)
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "too_long"
+
+
+def test_search_tickets(client: TestClient, project_factory, ticket_factory):
+    project = project_factory()
+    other = project_factory()
+    login = ticket_factory(
+        project_id=project.id, title="Login page broken", description="Erreur à la connexion"
+    )
+    body = ticket_factory(
+        project_id=project.id, title="Crash", description="the login button crashes the page"
+    )
+    ticket_factory(project_id=other.id, title="Login timeout", status=TicketStatus.done)
+    ticket_factory(project_id=project.id, title="Unrelated", description="nothing here")
+
+    response = client.get("/api/v1/tickets/search", params={"q": "login", "project_id": project.id})
+    assert response.status_code == 200
+    items = response.json()["items"]
+    # un terme du titre pèse plus lourd que la description
+    assert [t["id"] for t in items] == [login.id, body.id]
+    assert items[0]["rank"] < items[1]["rank"]
+    assert "<mark>Login</mark>" in items[0]["snippet"]
+
+    # diacritiques ignorés, préfixe, filtre de statut
+    assert [
+        t["id"]
+        for t in client.get("/api/v1/tickets/search", params={"q": "erreur connex*"}).json()[
+            "items"
+        ]
+    ] == [login.id]
+    r = client.get("/api/v1/tickets/search", params={"q": "login", "status": "done"})
+    assert [t["title"] for t in r.json()["items"]] == ["Login timeout"]
+
+
+def test_search_snippet_escapes_ticket_text(client: TestClient, ticket_factory):
+    ticket_factory(title='<img src=x onerror="alert(1)"> login & co')
+
+    [hit] = client.get("/api/v1/tickets/search", params={"q": "login"}).json()["items"]
+    assert hit["snippet"] == (
+        "&lt;img src=x onerror=&quot;alert(1)&quot;&gt; <mark>login</mark> &amp; co"
+    )
+
+
+def test_search_tickets_tracks_changes_and_paginates(client: TestClient, ticket_factory):
+    tickets = [ticket_factory(title=f"Printer jam {i}") for i in range(3)]
+
+    client.put(f"/api/v1/tickets/{tickets[0].id}", json={"title": "Scanner offline"})
+    client.delete(f"/api/v1/tickets/{tickets[1].id}")
+
+    page1 = client.get("/api/v1/tickets/search", params={"q": "printer", "limit": 1}).json()
+    assert [t["id"] for t in page1["items"]] == [tickets[2].id]
+    assert page1["next_cursor"] is None
+    scanner = client.get("/api/v1/tickets/search", params={"q": "scanner"}).json()["items"]
+    assert [t["id"] for t in scanner] == [tickets[0].id]
+
+
+def test_search_tickets_cursor(client: TestClient, ticket_factory):
+    ids = {ticket_factory(title=f"Disk full {i}").id for i in range(5)}
+
+    seen, cursor = [], None
+    while True:
+        params = {"q": "disk", "limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/api/v1/tickets/search", params=params).json()
+        seen += [t["id"] for t in page["items"]]
+        if not (cursor := page["next_cursor"]):
+            break
+    assert sorted(seen) == sorted(ids)
+
+
+@pytest.mark.parametrize("q", ['"', "*", 'a" OR "b', "NEAR(", "title:x"])
+def test_search_tickets_query_syntax_is_escaped(client: TestClient, q):
+    response = client.get("/api/v1/tickets/search", params={"q": q})
+    assert response.status_code in (200, 400)
@@ -30,6 +30,15 @@ def test_get_user_ok(client, user_factory):
     assert body["full_name"] == "Get One"
 
 
+def test_user_sparse_fields(client, user_factory):
+    u = user_factory(email="sparse@example.com")
+    r = client.get("/users", params={"fields": "email"})
+    assert r.json()["items"] == [{"email": "sparse@example.com"}]
+    r = client.get(f"/users/{u.id}", params={"fields": "id,role"})
+    assert r.json() == {"id": u.id, "role": u.role.value}
+    assert client.get("/users", params={"fields": "password_hash"}).status_code == 422
+
+
 def test_get_user_not_found(client):
     r = client.get("/users/999999")
     assert r.status_code == HTTPStatus.NOT_FOUND